@@ -10,6 +10,8 @@ from custom_components.peaqhvac.service.hub.hub import Hub
 
 from .const import DOMAIN, HVACBRAND_NIBE, LISTENER_FN_CLOSE, PLATFORMS
 from .service.models.config_model import ConfigModel
+from .service.models.enums.offset_planning_mode import OffsetPlanningMode
+from .service.models.enums.water_boost_planning_mode import WaterBoostPlanningMode
 from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
@@ -33,6 +35,13 @@ async def async_setup_entry(hass: HomeAssistant, config: ConfigEntry) -> bool:
     huboptions.heating.non_hours_water_boost = await async_get_existing_param(config, "non_hours_water_boost", [])
     huboptions.heating.demand_hours_water_boost = await async_get_existing_param(config, "demand_hours_water_boost", [])
     huboptions.weather_entity = await async_get_existing_param(config, "weather_entity", None)
+    huboptions.offset_planning_mode = OffsetPlanningMode(
+        await async_get_existing_param(config, "offset_planning_mode", OffsetPlanningMode.Heuristic.value)
+    )
+    huboptions.water_boost_planning_mode = WaterBoostPlanningMode(
+        await async_get_existing_param(config, "water_boost_planning_mode", WaterBoostPlanningMode.Greedy.value)
+    )
+    huboptions.concurrent_observer = await async_get_existing_param(config, "concurrent_observer", False)
 
     huboptions.heating.low_dm = int((await async_get_existing_param(config, "low_degree_minutes", "-600")).replace(" ", ""))
     huboptions.heating.very_cold_temp = int((await async_get_existing_param(config, "very_cold_temp", "-12")).replace(" ", ""))
@@ -68,6 +77,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
+        hub = hass.data[DOMAIN].get("hub")
+        if hub is not None:
+            await hub.async_shutdown()
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
 
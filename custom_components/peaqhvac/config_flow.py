@@ -10,6 +10,8 @@ from homeassistant.core import callback
 
 from custom_components.peaqhvac.configflow.config_flow_schemas import USER_SCHEMA, OPTIONAL_SCHEMA
 from custom_components.peaqhvac.configflow.config_flow_validation import ConfigFlowValidation
+from custom_components.peaqhvac.service.models.enums.offset_planning_mode import OffsetPlanningMode
+from custom_components.peaqhvac.service.models.enums.water_boost_planning_mode import WaterBoostPlanningMode
 from .const import DOMAIN  # pylint:disable=unused-import
 
 _LOGGER = logging.getLogger(__name__)
@@ -76,6 +78,9 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         _lowdm = await self._get_existing_param("low_degree_minutes", "-600")
         _verycoldtemp = await self._get_existing_param("very_cold_temp", "-12")
         _weather_entity = await self._get_existing_param("weather_entity", None)
+        _planning_mode = await self._get_existing_param("offset_planning_mode", OffsetPlanningMode.Heuristic.value)
+        _water_planning_mode = await self._get_existing_param("water_boost_planning_mode", WaterBoostPlanningMode.Greedy.value)
+        _concurrent_observer = await self._get_existing_param("concurrent_observer", False)
 
         return self.async_show_form(
             step_id="init",
@@ -90,5 +95,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional("low_degree_minutes", default=_lowdm): cv.string,
                 vol.Optional("very_cold_temp", default=_verycoldtemp): cv.string,
                 vol.Optional("weather_entity", default=_weather_entity): cv.string,
+                vol.Optional("offset_planning_mode", default=_planning_mode): vol.In(
+                    [m.value for m in OffsetPlanningMode]),
+                vol.Optional("water_boost_planning_mode", default=_water_planning_mode): vol.In(
+                    [m.value for m in WaterBoostPlanningMode]),
+                vol.Optional("concurrent_observer", default=_concurrent_observer): cv.boolean,
                 })
         )
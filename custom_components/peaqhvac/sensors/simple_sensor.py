@@ -25,6 +25,20 @@ class PeaqSimpleSensor(SensorBase, RestoreEntity):
     def icon(self) -> str:
         return self._icon
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        if self._internal_entity == NEXT_WATER_START:
+            return {
+                "Plan cache hits":   self._hub.hvac.water_heater.plan_cache_hits,
+                "Plan cache misses": self._hub.hvac.water_heater.plan_cache_misses,
+                "Suppressed warnings": self._hub.hvac.water_heater.model.suppressed_events,
+                "Planned boosts": [
+                    {"start": b.next_start.strftime("%Y-%m-%d %H:%M"), "target": b.target_temp}
+                    for b in self._hub.hvac.water_heater.boost_schedule
+                ],
+            }
+        return {}
+
     async def async_update(self) -> None:
         ret = await self._hub.async_get_internal_sensor(self._internal_entity)
         if ret is not None:
@@ -34,7 +34,7 @@ class Hub:
         self._is_initialized = False
         self.state_machine = hass
         self.trackerentities = []
-        self.observer = Observer(hass) #todo: move to creation factory
+        self.observer = Observer(hass, concurrent=hub_options.concurrent_observer) #todo: move to creation factory
         self.options = hub_options
         self.peaqev_discovered: bool = self.get_peaqev()
         self.sensors = HubSensors(self, hub_options, hass, self.peaqev_discovered)
@@ -54,6 +54,7 @@ class Hub:
         self.options.hub = self
 
     async def async_setup(self) -> None:
+        await self.hvac.water_heater.async_load_state()
         await self.async_setup_trackers()
         if self.prognosis.entity is not None:
             _LOGGER.debug("Weather-prognosis is enabled, will update weather.")
@@ -68,6 +69,13 @@ class Hub:
             self.state_machine, self.trackerentities, self._async_on_change
         )
 
+    async def async_shutdown(self) -> None:
+        self.offset.cancel_wakeup()
+        self.offset.cancel_plan()
+        await self.update_system.async_shutdown()
+        await self.hvac.water_heater.async_shutdown()
+        await self.observer.async_shutdown()
+
     @property
     def is_initialized(self) -> bool:
         if self._is_initialized:
@@ -132,7 +140,7 @@ class Hub:
 
     async def async_offset_export_model(self) -> OffsetsExportModel:
         ret = OffsetsExportModel(
-        (self.offset.model.peaks_today, self.offset.model.peaks_tomorrow))
+        (self.offset.model.peaks_today, self.offset.model.peaks_tomorrow), self.offset.model.resolution)
         ret.raw_offsets = self.offset.model.raw_offsets
         ret.current_offset = self.offset.model.current_offset_dict
         ret.current_offset_tomorrow = self.offset.model.current_offset_dict_tomorrow
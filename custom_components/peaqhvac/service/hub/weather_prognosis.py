@@ -80,10 +80,7 @@ class WeatherPrognosis:
             _LOGGER.error("could not get weather-prognosis.")
 
     def get_weatherprognosis_adjustment(self, offsets:dict[datetime, int]) -> dict:
-        ret = {k:v for k,v in offsets.items() if k.date == datetime.now().date()+timedelta(days=1)}
-        rr = {k:self._get_weatherprognosis_hourly_adjustment(k.hour, v) for k,v in offsets.items() if k.date == datetime.now().date()}
-        ret.update(rr)
-        return ret
+        return weatherprognosis_adjustment(self.prognosis, offsets, datetime.now())
 
     def get_hvac_prognosis(self, current_temperature: float) -> list:
         ret = []
@@ -129,28 +126,6 @@ class WeatherPrognosis:
             return round(t3, 1)
         return p.Temperature
 
-    def _get_weatherprognosis_hourly_adjustment(self, hour, offset) -> int:
-        _LOGGER.debug(f"Getting weatherprognosis adjustment for hour {hour} with offset {offset}")
-        try:
-            now = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
-            proghour = now
-            if now.minute > 30:
-                proghour = now + timedelta(hours=1)
-            proghour = proghour.astimezone(timezone.utc)
-            _next_prognosis = self._get_two_hour_prog(proghour)
-            ret = offset
-            if _next_prognosis is not None and int(hour) >= now.hour:
-                divisor = max((11 - _next_prognosis.TimeDelta) / 10, 0)
-                adjustment_divisor = 2.5 if _next_prognosis.windchill_temp > -2 else 2
-                adj = (int(round((_next_prognosis.delta_temp_from_now / adjustment_divisor) * divisor, 0)) * -1)
-                ret = offset + adj
-            else:
-                _LOGGER.debug(f"Could not find next prognosis for hour {hour}")
-            return ret
-        except Exception as e:
-            _LOGGER.error(f"Could not get weatherprognosis adjustment: {e}")
-            return offset
-
     async def async_set_prognosis(self, import_list: list):
         try:
             ret = []
@@ -183,9 +158,41 @@ class WeatherPrognosis:
         ret += 0.3965 * temp * windspeed_corrected**0.16
         return round(ret, 1)
 
-    def _get_two_hour_prog(self, thishour: datetime) -> PrognosisExportModel | None:
-        for p in self.prognosis:
-            c = timedelta.total_seconds(p.DT - thishour)
-            if c == 10800:
-                return p
-        return None
+
+def weatherprognosis_adjustment(prognosis: list[PrognosisExportModel], offsets: dict[datetime, int], now: datetime) -> dict:
+    """Adjusts today's offsets by the prognosis. Pure, so it can run in the executor on a snapshot of the prognosis and the time it was taken."""
+    ret = {k:v for k,v in offsets.items() if k.date() == now.date()+timedelta(days=1)}
+    rr = {k:_get_weatherprognosis_hourly_adjustment(prognosis, k.hour, v, now) for k,v in offsets.items() if k.date() == now.date()}
+    ret.update(rr)
+    return ret
+
+
+def _get_weatherprognosis_hourly_adjustment(prognosis: list[PrognosisExportModel], hour, offset, now: datetime) -> int:
+    _LOGGER.debug(f"Getting weatherprognosis adjustment for hour {hour} with offset {offset}")
+    try:
+        now = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        proghour = now
+        if now.minute > 30:
+            proghour = now + timedelta(hours=1)
+        proghour = proghour.astimezone(timezone.utc)
+        _next_prognosis = _get_two_hour_prog(prognosis, proghour)
+        ret = offset
+        if _next_prognosis is not None and int(hour) >= now.hour:
+            divisor = max((11 - _next_prognosis.TimeDelta) / 10, 0)
+            adjustment_divisor = 2.5 if _next_prognosis.windchill_temp > -2 else 2
+            adj = (int(round((_next_prognosis.delta_temp_from_now / adjustment_divisor) * divisor, 0)) * -1)
+            ret = offset + adj
+        else:
+            _LOGGER.debug(f"Could not find next prognosis for hour {hour}")
+        return ret
+    except Exception as e:
+        _LOGGER.error(f"Could not get weatherprognosis adjustment: {e}")
+        return offset
+
+
+def _get_two_hour_prog(prognosis: list[PrognosisExportModel], thishour: datetime) -> PrognosisExportModel | None:
+    for p in prognosis:
+        c = timedelta.total_seconds(p.DT - thishour)
+        if c == 10800:
+            return p
+    return None
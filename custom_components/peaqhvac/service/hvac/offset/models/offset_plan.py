@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
+
+
+@dataclass
+class OffsetPlan:
+    resolution: SlotResolution = field(default_factory=SlotResolution)
+    peaks_today: list[int] = field(default_factory=list)
+    peaks_tomorrow: list[int] = field(default_factory=list)
+    raw_offsets: dict = field(default_factory=dict)
+    calculated_offsets: dict = field(default_factory=dict)
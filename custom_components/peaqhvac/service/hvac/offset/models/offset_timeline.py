@@ -0,0 +1,45 @@
+from bisect import bisect_right
+from datetime import datetime
+
+
+class OffsetTimeline:
+    """Sorted view of an offset plan that finds the current slot and the next change with bisect."""
+    def __init__(self, offsets: dict[datetime, int] | None = None):
+        self._keys: list[datetime] = []
+        self._values: list[int] = []
+        self._next_change: list[int] = []
+        if offsets:
+            self.update(offsets)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, offsets: dict[datetime, int]) -> None:
+        self._keys = sorted(offsets)
+        self._values = [offsets[k] for k in self._keys]
+        _len = len(self._keys)
+        self._next_change = [_len] * _len
+        for idx in range(_len - 2, -1, -1):
+            if self._values[idx + 1] != self._values[idx]:
+                self._next_change[idx] = idx + 1
+            else:
+                self._next_change[idx] = self._next_change[idx + 1]
+
+    def _index_at(self, dt: datetime) -> int:
+        return bisect_right(self._keys, dt) - 1
+
+    def value_at(self, dt: datetime) -> int | None:
+        idx = self._index_at(dt)
+        if idx < 0:
+            return None
+        return self._values[idx]
+
+    def next_change(self, dt: datetime) -> datetime | None:
+        """Returns the start of the next slot with a different value than the one at dt."""
+        if not self._keys:
+            return None
+        idx = self._index_at(dt)
+        if idx < 0:
+            return self._keys[0]
+        nxt = self._next_change[idx]
+        return self._keys[nxt] if nxt < len(self._keys) else None
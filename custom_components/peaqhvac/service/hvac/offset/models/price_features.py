@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PriceFeatures:
+    peaks: list[int] = field(default_factory=list)
+    valleys: list[int] = field(default_factory=list)
+    single_valleys: list[int] = field(default_factory=list)
+    prominence: list[float] = field(default_factory=list)
+    mean: float = 0
+    max: float = 0
+    min: float = 0
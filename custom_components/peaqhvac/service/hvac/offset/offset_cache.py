@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from datetime import datetime
+
+from custom_components.peaqhvac.service.hvac.offset.offset_utils import SPLIT_HOUR
+from custom_components.peaqhvac.service.models.enums.hvac_presets import HvacPresets
+from custom_components.peaqhvac.service.models.enums.offset_planning_mode import OffsetPlanningMode
+
+CACHE_SIZE = 16
+
+
+class OffsetCache:
+    """Bounded LRU of offset plans, keyed by a fingerprint of everything the plan is calculated from."""
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self._maxsize = maxsize
+        self._plans: OrderedDict[tuple, dict] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    @staticmethod
+    def fingerprint(
+            prices: list[float],
+            min_price: float,
+            tolerance: int | None,
+            preset: HvacPresets,
+            weather_adjusted: dict | None,
+            dt: datetime,
+            mode: OffsetPlanningMode = OffsetPlanningMode.Heuristic,
+    ) -> tuple:
+        weather = tuple(sorted(weather_adjusted.items())) if weather_adjusted is not None else None
+        return tuple(prices), min_price, tolerance, preset, weather, dt.date(), dt.hour >= SPLIT_HOUR, mode
+
+    def get(self, key: tuple) -> dict | None:
+        plan = self._plans.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._plans.move_to_end(key)
+        return dict(plan)
+
+    def put(self, key: tuple, plan: dict) -> None:
+        self._plans[key] = dict(plan)
+        self._plans.move_to_end(key)
+        while len(self._plans) > self._maxsize:
+            self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        self._plans.clear()
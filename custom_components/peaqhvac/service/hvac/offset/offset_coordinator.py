@@ -1,15 +1,18 @@
+import asyncio
 import logging
 from abc import abstractmethod
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import partial
 from peaqevcore.common.models.observer_types import ObserverTypes
 from peaqevcore.services.hourselection.hoursselection import Hoursselection
-from custom_components.peaqhvac.service.hvac.offset.offset_utils import (
-    max_price_lower_internal, offset_per_day, set_offset_dict)
-from custom_components.peaqhvac.service.hvac.offset.peakfinder import (
-    identify_peaks, smooth_transitions)
+from custom_components.peaqhvac.service.hub.weather_prognosis import weatherprognosis_adjustment
+from custom_components.peaqhvac.service.hvac.offset.offset_utils import max_price_lower_internal
+from custom_components.peaqhvac.service.hvac.offset.models.offset_timeline import OffsetTimeline
+from custom_components.peaqhvac.service.hvac.offset.offset_cache import OffsetCache
+from custom_components.peaqhvac.service.hvac.offset.offset_pipeline import build_offset_plan
 from custom_components.peaqhvac.service.models.offset_model import OffsetModel
 from custom_components.peaqhvac.service.observer.iobserver_coordinator import IObserver
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_track_point_in_time
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,11 +25,12 @@ class OffsetCoordinator:
         self.hours = hours_type
         self._current_raw_offset: int|None = None
         self.latest_raw_offset_update_hour: int = -1
+        self._timeline = OffsetTimeline()
+        self.cache = OffsetCache()
+        self._plan_task: asyncio.Task | None = None
+        self._replan_requested: bool = False
+        self._cancel_wakeup = None
         self._initialize_observers()
-        async_track_time_interval(
-            self._hub.state_machine, self.async_create_current_raw_offset, timedelta(seconds=20)
-        )
-        #self.async_create_current_raw_offset()
 
     def _initialize_observers(self):
         self.observer.add(ObserverTypes.PrognosisChanged, self.async_update_prognosis)
@@ -60,84 +64,104 @@ class OffsetCoordinator:
             await self.observer.async_broadcast(ObserverTypes.OffsetRecalculation, val)
 
     async def async_create_current_raw_offset(self, *args) -> None:
-        ret = 0
-        initialized = False
-        try:
-            if self.model.raw_offsets:
-                latest_key = max((key for key in self.model.raw_offsets if key <= datetime.now()), default=None)
-                if latest_key is not None:
-                    ret = self.model.raw_offsets[latest_key]
-                    initialized = True
-        except KeyError as e:
-            _LOGGER.error(f"Unable to get current offset: {e}. raw_offsets: {self.model.raw_offsets}")
-        finally:
-            if self.current_offset is not None or initialized:
-                if self.current_offset != ret:
-                   await self.async_set_offset()
-                await self.async_update_raw_offset(ret)
+        self._cancel_wakeup = None
+        current = self._timeline.value_at(datetime.now())
+        if self.current_offset is not None or current is not None:
+            ret = current if current is not None else 0
+            if self.current_offset != ret:
+                await self.async_set_offset()
+            await self.async_update_raw_offset(ret)
+        self._schedule_wakeup()
+
+    async def async_update_timeline(self) -> None:
+        self._timeline.update(self.model.raw_offsets)
+        current = self._timeline.value_at(datetime.now())
+        if current is not None:
+            await self.async_update_raw_offset(current)
+        self._schedule_wakeup()
+
+    def _schedule_wakeup(self) -> None:
+        """Arms a single callback at the next slot where the raw offset actually changes"""
+        self.cancel_wakeup()
+        next_change = self._timeline.next_change(datetime.now())
+        if next_change is not None:
+            self._cancel_wakeup = async_track_point_in_time(
+                self._hub.state_machine, self.async_create_current_raw_offset, next_change
+            )
+
+    def cancel_wakeup(self) -> None:
+        if self._cancel_wakeup is not None:
+            self._cancel_wakeup()
+            self._cancel_wakeup = None
 
     async def async_update_prognosis(self) -> None:
         self.model.prognosis = self._hub.prognosis.prognosis
         await self.async_set_offset()
 
     def max_price_lower(self, tempdiff: float) -> bool:
-        return max_price_lower_internal(tempdiff, self.model.peaks_today)
-
-    async def async_update_offset(self, weather_adjusted_today: dict | None = None) -> dict:
-        try:
-            all_values = await set_offset_dict(self.prices + self.prices_tomorrow, datetime.now(), self.min_price, {})
-            offsets_per_day = await self.async_calculate_offset_per_day(all_values, weather_adjusted_today)
-            tolerance = self.model.tolerance if self.model.tolerance is not None else 3
-            for k, v in offsets_per_day.items():
-                if v > tolerance:
-                    offsets_per_day[k] = tolerance
-                elif v < -tolerance:
-                    offsets_per_day[k] = -tolerance
-            return smooth_transitions(vals=offsets_per_day, tolerance=tolerance)
-        except Exception as e:
-            _LOGGER.exception(f"Exception while trying to calculate offset: {e}")
-            return {}
-
-    async def async_calculate_offset_per_day(self, day_values: dict, weather_adjusted_today: dict | None = None) -> dict:
-        if weather_adjusted_today is None:
-            indoors_preset = self._hub.sensors.set_temp_indoors.preset
-            return offset_per_day(
-                all_prices=self.prices + self.prices_tomorrow,
-                day_values=day_values,
-                tolerance=self.model.tolerance,
-                indoors_preset=indoors_preset,
-            )
+        return max_price_lower_internal(tempdiff, self.model.peaks_today, self.model.resolution)
+
+    def _plan_arguments(self) -> dict:
+        """Snapshots the plan inputs on the event loop so the executor never reads state that is being changed"""
+        weather_adjustment = None
+        now = datetime.now()
+        prognosis = list(self._hub.prognosis.prognosis)
+        if prognosis:
+            weather_adjustment = partial(_weather_adjustment, prognosis, now)
         else:
-            return weather_adjusted_today
+            _LOGGER.debug("No prognosis available, setting normal calculation.")
+        return {
+            "prices": list(self.prices),
+            "prices_tomorrow": list(self.prices_tomorrow or []),
+            "min_price": self.min_price,
+            "tolerance": self.model.tolerance,
+            "preset": self._hub.sensors.set_temp_indoors.preset,
+            "dt": now,
+            "weather_adjustment": weather_adjustment,
+            "cache": self.cache,
+            "mode": self._hub.options.offset_planning_mode,
+        }
 
     async def async_set_offset(self) -> None:
         if not self.prices:
             if self._hub.is_initialized:
                 _LOGGER.warning(f"Hub is ready but I'm unable to set offset. Prices num: {len(self.prices) if self.prices else 0}")
             return
-        self.model.raw_offsets = await self.async_update_offset()
-        self.model.calculated_offsets = self.model.raw_offsets
-        if self._hub.prognosis.prognosis:
-            await self.async_set_offset_weather()
-        else:
-            _LOGGER.debug("No prognosis available, setting normal calculation.")
-
-    async def async_set_offset_weather(self) -> None:
-        try:
-            _weather_dict = self._hub.prognosis.get_weatherprognosis_adjustment(self.model.raw_offsets)
-            if _weather_dict:
-                self.model.calculated_offsets = await self.async_update_offset(_weather_dict)
-        except Exception as e:
-            _LOGGER.warning(f"Unable to calculate prognosis-offsets. Setting normal calculation: {e}")
-
-    async def async_update_model(self) -> None:
-        self.model.peaks_today = identify_peaks(self.prices)
-        self.model.peaks_tomorrow = identify_peaks(self.prices_tomorrow)
-        self.model.raw_offsets = await self.async_update_offset()
-
-
-
-
-
-
-
+        self._replan_requested = True
+        if self._plan_task is None or self._plan_task.done():
+            self._plan_task = self._hub.state_machine.async_create_task(self._async_replan(), eager_start=False)
+
+    async def _async_replan(self) -> None:
+        """
+        Calculates the offset plan in the executor. Requests arriving while a calculation is running
+        supersede it: the stale result is dropped and one new calculation is made with the latest inputs.
+        """
+        while self._replan_requested:
+            self._replan_requested = False
+            try:
+                plan = await self._hub.state_machine.async_add_executor_job(
+                    partial(build_offset_plan, **self._plan_arguments())
+                )
+            except Exception as e:
+                _LOGGER.exception(f"Exception while trying to calculate offset: {e}")
+                continue
+            if self._replan_requested:
+                _LOGGER.debug("Offset plan was superseded while calculating. Recalculating with latest inputs.")
+                continue
+            self.model.apply_plan(plan)
+            _LOGGER.debug(f"Offset plan updated. Cache hits: {self.cache.hits}, misses: {self.cache.misses}")
+            await self.async_update_timeline()
+
+    def cancel_plan(self) -> None:
+        self._replan_requested = False
+        if self._plan_task is not None and not self._plan_task.done():
+            self._plan_task.cancel()
+        self._plan_task = None
+
+
+def _weather_adjustment(prognosis: list, now: datetime, raw_offsets: dict) -> dict | None:
+    try:
+        return weatherprognosis_adjustment(prognosis, raw_offsets, now)
+    except Exception as e:
+        _LOGGER.warning(f"Unable to calculate prognosis-offsets. Setting normal calculation: {e}")
+        return None
@@ -46,4 +46,3 @@ class OffsetCoordinatorPeaqEv(OffsetCoordinator):
         if self._prices_tomorrow != prices[1]:
             self._prices_tomorrow = prices[1]
         await self.async_set_offset()
-        await self.async_update_model()
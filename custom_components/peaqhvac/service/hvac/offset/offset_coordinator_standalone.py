@@ -36,4 +36,3 @@ class OffsetCoordinatorStandAlone(OffsetCoordinator):
         await self.hours.async_update_prices(prices[0], prices[1])
         _LOGGER.debug(f"Updated prices to {self.hours.prices, self.hours.prices_tomorrow}")
         await self.async_set_offset()
-        await self.async_update_model()
@@ -0,0 +1,110 @@
+import time
+from datetime import datetime, timedelta
+from itertools import product
+from math import inf
+
+from custom_components.peaqhvac.service.hvac.offset.offset_utils import standardize
+from custom_components.peaqhvac.service.models.enums.hvac_presets import HvacPresets
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
+
+LATENCY_BUDGET = 0.05
+COMFORT_WEIGHT = 0.5
+CHANGE_PENALTY = 0.05
+PEAK_PENALTY = 0.5
+DEFAULT_RAMP_LIMIT = 2
+
+
+class OptimizerTimeout(Exception):
+    """Raised when the optimizer cannot finish within its latency budget."""
+
+
+def _comfort_cost(level: int, tolerance: int, cold_tolerance: float, warm_tolerance: float) -> float | None:
+    """Comfort cost per slot for holding an offset level. None if the preset does not allow the level at all."""
+    side = warm_tolerance if level > 0 else cold_tolerance
+    if level == 0:
+        return 0
+    if side <= 0:
+        return None
+    return COMFORT_WEIGHT * level * level / (side * tolerance)
+
+
+def optimize_offsets(
+        prices: list[float],
+        dt: datetime,
+        tolerance: int,
+        preset: HvacPresets = HvacPresets.Normal,
+        peaks: list[int] | None = None,
+        ramp_limit: int = DEFAULT_RAMP_LIMIT,
+        budget: float = LATENCY_BUDGET,
+) -> dict[datetime, int]:
+    """
+    Plans the whole price horizon as one cost minimization over discrete offset levels.
+    Each slot costs its standardized price times the offset, a comfort penalty weighted by the preset's
+    cold/warm tolerances and a penalty for heating in peak slots. The offset moves at most ramp_limit
+    steps in total within any rolling hour, whatever the slot length.
+    Raises OptimizerTimeout if the budget (seconds) is exceeded.
+    """
+    if not len(prices):
+        return {}
+    resolution = SlotResolution.from_prices(prices)
+    start = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    slot_times = [start + timedelta(minutes=resolution.minutes * i) for i in range(len(prices))]
+    if tolerance <= 0:
+        return {t: 0 for t in slot_times}
+    deadline = time.perf_counter() + budget
+    cold_tolerance, warm_tolerance = HvacPresets.get_tolerances(preset)
+    peak_slots = set(peaks or [])
+
+    levels = [lvl for lvl in range(-tolerance, tolerance + 1)
+              if _comfort_cost(lvl, tolerance, cold_tolerance, warm_tolerance) is not None]
+    comfort = [_comfort_cost(lvl, tolerance, cold_tolerance, warm_tolerance) for lvl in levels]
+    standardized = standardize(prices) if max(prices) > min(prices) else [0.0] * len(prices)
+
+    # a state is (level index, the moves made in the slots before it that are still within the hour)
+    transitions = _transitions(levels, ramp_limit, resolution.slots_per_hour)
+    cost: dict[tuple, float] = {}
+    back: list[dict[tuple, tuple]] = []
+    for i, z in enumerate(standardized):
+        peak = PEAK_PENALTY if i in peak_slots else 0
+        slot_cost = [z * lvl + comfort[j] + peak * (lvl + tolerance) for j, lvl in enumerate(levels)]
+        if i == 0:
+            history = (0,) * (resolution.slots_per_hour - 1)
+            cost = {(j, history): c for j, c in enumerate(slot_cost)}
+            continue
+        new_cost: dict[tuple, float] = {}
+        choice: dict[tuple, tuple] = {}
+        for state, c in cost.items():
+            for target, change in transitions[state]:
+                total = c + change
+                if total < new_cost.get(target, inf):
+                    new_cost[target] = total
+                    choice[target] = state
+        cost = {state: c + slot_cost[state[0]] for state, c in new_cost.items()}
+        back.append(choice)
+        if time.perf_counter() > deadline:
+            raise OptimizerTimeout(f"Offset optimizer exceeded {budget * 1000:.0f} ms at slot {i}/{len(prices)}")
+
+    state = min(cost, key=cost.get)
+    path = [state[0]]
+    for choice in reversed(back):
+        state = choice[state]
+        path.append(state[0])
+    path.reverse()
+    return {slot_times[i]: levels[j] for i, j in enumerate(path)}
+
+
+def _transitions(levels: list[int], ramp_limit: int, slots_per_hour: int) -> dict[tuple, list[tuple]]:
+    """
+    For every state (level index, recent moves) lists the reachable next states with their change penalty.
+    A move is allowed when it and the recent moves together stay within ramp_limit.
+    """
+    histories = [h for h in product(range(ramp_limit + 1), repeat=slots_per_hour - 1) if sum(h) <= ramp_limit]
+    ret = {}
+    for j, lvl in enumerate(levels):
+        for history in histories:
+            room = ramp_limit - sum(history)
+            ret[(j, history)] = [
+                ((k, (history + (abs(other - lvl),))[1:]), CHANGE_PENALTY * abs(other - lvl))
+                for k, other in enumerate(levels) if abs(other - lvl) <= room
+            ]
+    return ret
@@ -0,0 +1,101 @@
+import logging
+from datetime import datetime
+from typing import Callable
+
+from custom_components.peaqhvac.service.hvac.offset.models.offset_plan import OffsetPlan
+from custom_components.peaqhvac.service.hvac.offset.offset_cache import OffsetCache
+from custom_components.peaqhvac.service.hvac.offset.offset_optimizer import OptimizerTimeout, optimize_offsets
+from custom_components.peaqhvac.service.hvac.offset.offset_utils import (deviation_dict, flat_day_lower_tolerance,
+                                                                         offset_per_day)
+from custom_components.peaqhvac.service.hvac.offset.peakfinder import extract_price_features, smooth_transitions
+from custom_components.peaqhvac.service.models.enums.hvac_presets import HvacPresets
+from custom_components.peaqhvac.service.models.enums.offset_planning_mode import OffsetPlanningMode
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TOLERANCE = 3
+
+
+def finalize_offsets(offsets: dict, tolerance: int | None) -> dict:
+    """Clamps an offset plan to the tolerance and smooths its transitions."""
+    tolerance = tolerance if tolerance is not None else DEFAULT_TOLERANCE
+    clamped = {k: max(-tolerance, min(tolerance, v)) for k, v in offsets.items()}
+    return smooth_transitions(vals=clamped, tolerance=tolerance)
+
+
+def build_offset_plan(
+        prices: list[float],
+        prices_tomorrow: list[float],
+        min_price: float,
+        tolerance: int | None,
+        preset: HvacPresets,
+        dt: datetime,
+        weather_adjustment: Callable[[dict], dict | None] | None = None,
+        cache: OffsetCache | None = None,
+        mode: OffsetPlanningMode = OffsetPlanningMode.Heuristic,
+) -> OffsetPlan:
+    """
+    Runs every stage of the offset calculation once and returns peaks, raw and calculated offsets together.
+    Price statistics and peaks are extracted a single time and shared by the later stages.
+    """
+    all_prices = prices + prices_tomorrow
+    plan = OffsetPlan(resolution=SlotResolution.from_prices(prices))
+    plan.peaks_today = extract_price_features(prices).peaks
+    plan.peaks_tomorrow = extract_price_features(prices_tomorrow).peaks
+
+    all_features = extract_price_features(all_prices)
+
+    def _heuristic() -> dict:
+        return finalize_offsets(
+            offset_per_day(
+                day_values=deviation_dict(all_prices, dt, min_price),
+                all_prices=all_prices,
+                tolerance=tolerance,
+                indoors_preset=preset,
+                features=all_features,
+            ),
+            tolerance,
+        )
+
+    def _optimized() -> dict:
+        _tolerance = tolerance if tolerance is not None else DEFAULT_TOLERANCE
+        return optimize_offsets(
+            prices=all_prices,
+            dt=dt,
+            tolerance=_tolerance - flat_day_lower_tolerance(all_prices, all_features),
+            preset=preset,
+            peaks=plan.peaks_today + [p + len(prices) for p in plan.peaks_tomorrow],
+        )
+
+    def _heuristic_key() -> tuple:
+        return OffsetCache.fingerprint(all_prices, min_price, tolerance, preset, None, dt, OffsetPlanningMode.Heuristic)
+
+    if mode is OffsetPlanningMode.Optimized:
+        try:
+            raw_key = OffsetCache.fingerprint(all_prices, min_price, tolerance, preset, None, dt, mode)
+            plan.raw_offsets = _cached(cache, raw_key, _optimized)
+        except OptimizerTimeout as e:
+            # the fallback is cached as a heuristic plan so the optimizer is tried again on the next calculation
+            _LOGGER.warning(f"{e}. Falling back to heuristic offsets.")
+            plan.raw_offsets = _cached(cache, _heuristic_key(), _heuristic)
+    else:
+        plan.raw_offsets = _cached(cache, _heuristic_key(), _heuristic)
+
+    plan.calculated_offsets = plan.raw_offsets
+    if weather_adjustment is not None:
+        weather_dict = weather_adjustment(plan.raw_offsets)
+        if weather_dict:
+            weather_key = OffsetCache.fingerprint(all_prices, min_price, tolerance, preset, weather_dict, dt, mode)
+            plan.calculated_offsets = _cached(cache, weather_key, lambda: finalize_offsets(weather_dict, tolerance))
+    return plan
+
+
+def _cached(cache: OffsetCache | None, key: tuple, calculate: Callable[[], dict]) -> dict:
+    if cache is None:
+        return calculate()
+    ret = cache.get(key)
+    if ret is None:
+        ret = calculate()
+        cache.put(key, ret)
+    return ret
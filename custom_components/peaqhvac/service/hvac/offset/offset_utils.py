@@ -1,21 +1,28 @@
 import logging
 from datetime import datetime, timedelta
-from statistics import mean, stdev
+from math import fsum, sqrt
+from statistics import mean
 
 from custom_components.peaqhvac.service.hvac.house_heater.models.calculated_offset import CalculatedOffsetModel
+from custom_components.peaqhvac.service.hvac.offset.models.price_features import PriceFeatures
 from custom_components.peaqhvac.service.models.enums.hvac_presets import \
     HvacPresets
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
 
 _LOGGER = logging.getLogger(__name__)
 
 TODAY = "today"
 TOMORROW = "tomorrow"
+SPLIT_HOUR = 13
+PEAK_LOOKAHEAD = timedelta(minutes=9)
 
-def flat_day_lower_tolerance(prices):
+def flat_day_lower_tolerance(prices, features: PriceFeatures | None = None):
     if not len(prices):
         return 0
     try:
-        deviator = (max(prices) - min(prices)) / mean(prices)
+        if features is None:
+            features = PriceFeatures(mean=mean(prices), max=max(prices), min=min(prices))
+        deviator = (features.max - features.min) / features.mean
         if deviator > 0.95:
             return 0
         if deviator > 0.8:
@@ -32,11 +39,11 @@ def offset_per_day(
         all_prices: list[float],
         tolerance: int | None,
         indoors_preset: HvacPresets = HvacPresets.Normal,
+        features: PriceFeatures | None = None,
 ) -> dict:
     ret = {}
     if tolerance is not None:
-        tolerance -= flat_day_lower_tolerance(all_prices)
-        print(f"Flat day lower tolerance: {flat_day_lower_tolerance(all_prices)}")
+        tolerance -= flat_day_lower_tolerance(all_prices, features)
         for k, v in day_values.items():
             ret[k] = int(round((day_values[k] * tolerance) * -1, 0))
             if indoors_preset is HvacPresets.Away:
@@ -54,42 +61,46 @@ def get_offset_dict(offset_dict, dt_now) -> dict:
 
 
 async def set_offset_dict(prices: list[float], dt: datetime, min_price: float, existing: dict) -> dict:
+    return deviation_dict(prices, dt, min_price)
+
+
+def deviation_dict(prices: list[float], dt: datetime, min_price: float) -> dict:
     dt = dt.replace(minute=0, second=0, microsecond=0)
-    all_offsets = _deviation_from_mean(prices, min_price, dt)
-    return all_offsets
+    return _deviation_from_mean(prices, min_price, dt)
+
 
+def _mean_stdev(values: list[float]) -> tuple[float, float]:
+    """Float mean and sample standard deviation, computed in linear time."""
+    _len = len(values)
+    avg = fsum(values) / _len
+    if _len < 2:
+        return avg, 0
+    return avg, sqrt(fsum((v - avg) ** 2 for v in values) / (_len - 1))
 
-def _get_timedelta(prices: list[float]) -> int:
-    _len = len(prices)
-    match _len:
-        case 23 | 24 | 25 | 47 | 48 | 49:
-            return 60
-        case 92 | 96 | 100 | 188 | 192 | 196:
-            return 15
+
+def standardize(prices: list[float]) -> list[float]:
+    # standardizing is shift-invariant, so prices are not moved above zero first.
+    avg, devi = _mean_stdev(prices)
+    return [(p - avg) / devi for p in prices]
 
 
 def _deviation_from_mean(prices: list[float], min_price: float, dt: datetime) -> dict[datetime, float]:
     if not len(prices):
         return {}
-    delta = _get_timedelta(prices)
+    resolution = SlotResolution.from_prices(prices)
+    split = resolution.slot_of_hour(SPLIT_HOUR)
     dt_lister = dt.replace(hour=0)
-    min_list_price = min(min(prices),0)
-    shifted_prices = [p - min_list_price for p in prices]
-    standardized_prices = [(p - mean(shifted_prices)) / stdev(shifted_prices) for p in shifted_prices]
-    avg = mean(standardized_prices)
-    devi = stdev(standardized_prices)
-    avg2 = avg
-    devi2 = devi
-
-    if dt.hour >= 13:
-        avg2 = mean(standardized_prices[13:])
-        devi2 = stdev(standardized_prices[13:])
+    standardized_prices = standardize(prices)
+    # a standardized list has mean 0 and deviation 1 by construction.
+    avg, devi = 0, 1
+    avg2, devi2 = avg, devi
+    if dt.hour >= SPLIT_HOUR:
+        avg2, devi2 = _mean_stdev(standardized_prices[split:])
 
     deviation_dict = {}
-
     for i, num in enumerate(standardized_prices):
-        _devi = devi if i < 13 else devi2
-        _avg = avg if i < 13 else avg2
+        _devi = devi if i < split else devi2
+        _avg = avg if i < split else avg2
         deviation = (num - _avg) / _devi
         if _devi < 1:
             deviation *= 0.5
@@ -101,17 +112,22 @@ def _deviation_from_mean(prices: list[float], min_price: float, dt: datetime) ->
             setval = round(setval, 2)
         else:
             setval = round(deviation, 2)
-        deviation_dict[dt_lister + timedelta(minutes=delta * i)] = setval
+        deviation_dict[dt_lister + timedelta(minutes=resolution.minutes * i)] = setval
     return deviation_dict
 
 
-def max_price_lower_internal(tempdiff: float, peaks_today: list) -> bool:
-    """Temporarily lower to -10 if this hour is a peak for today and temp > set-temp + 0.5C"""
+def max_price_lower_internal(
+        tempdiff: float, peaks_today: list, resolution: SlotResolution = SlotResolution(), now: datetime | None = None
+) -> bool:
+    """Temporarily lower to -10 if this slot is a peak for today and temp > set-temp + 0.5C"""
     if tempdiff >= 0.5:
-        if datetime.now().hour in peaks_today:
+        now = now or datetime.now()
+        current = resolution.index_of(now)
+        if current in peaks_today:
             return True
-        elif datetime.now().hour < 23 and datetime.now().minute > 50:
-            if datetime.now().hour + 1 in peaks_today:
+        upcoming = now + PEAK_LOOKAHEAD
+        if upcoming.date() == now.date() and resolution.index_of(upcoming) != current:
+            if resolution.index_of(upcoming) in peaks_today:
                 return True
     return False
 
@@ -1,50 +1,56 @@
-import statistics
-from datetime import timedelta
 import logging
+from datetime import datetime
+from math import fsum
+
+from custom_components.peaqhvac.service.hvac.offset.models.price_features import PriceFeatures
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def identify_peaks(prices: list) -> list[int]:
-    ret = []
+def extract_price_features(prices: list) -> PriceFeatures:
+    """Finds peaks, valleys, single valleys and a prominence score per slot in one pass over the prices."""
+    ret = PriceFeatures()
+    _len = len(prices)
+    if not _len:
+        return ret
+    ret.mean = fsum(prices) / _len
+    ret.max = max(prices)
+    ret.min = min(prices)
+    _range = ret.max - ret.min
+    last = _len - 1
     for idx, p in enumerate(prices):
-        if p < statistics.mean(prices):
-            continue
-        if idx == 0 or idx == len(prices) - 1:
-            if p == max(prices):
-                ret.append(idx)
+        prev = prices[idx - 1] if idx > 0 else None
+        nxt = prices[idx + 1] if idx < last else None
+        if idx == 0 or idx == last:
+            if p >= ret.mean and p == ret.max:
+                ret.peaks.append(idx)
+            if p <= ret.mean and p == ret.min:
+                ret.valleys.append(idx)
         else:
-            if all(
-                    [
-                        _check_deviation_peaks(p, prices[idx - 1]),
-                        _check_deviation_peaks(p, prices[idx + 1]),
-                    ]
-            ):
-                ret.append(idx)
+            if p >= ret.mean and _check_deviation_peaks(p, prev) and _check_deviation_peaks(p, nxt):
+                ret.peaks.append(idx)
+            if p <= ret.mean and _check_deviation_valleys(p, prev) and _check_deviation_valleys(p, nxt):
+                ret.valleys.append(idx)
+            if 1 < idx < _len - 2 and _is_single_valley(p, prev, nxt):
+                ret.single_valleys.append(idx)
+        ret.prominence.append(_prominence(p, prev, nxt, _range))
     return ret
 
 
+def identify_peaks(prices: list) -> list[int]:
+    return extract_price_features(prices).peaks
+
+
 def identify_valleys(prices: list) -> list[int]:
-    ret = []
-    for idx, p in enumerate(prices):
-        if p > statistics.mean(prices):
-            continue
-        if idx == 0 or idx == len(prices) - 1:
-            if p == min(prices):
-                ret.append(idx)
-        else:
-            if all(
-                    [
-                        _check_deviation_valleys(p, prices[idx - 1]),
-                        _check_deviation_valleys(p, prices[idx + 1]),
-                    ]
-            ):
-                ret.append(idx)
-    return ret
+    return extract_price_features(prices).valleys
+
+
+def find_single_valleys(prices: list) -> list[int]:
+    return extract_price_features(prices).single_valleys
 
 
 def _check_deviation_peaks(p: float, neighbor: float) -> bool:
-    if any([neighbor == 0, p == 0]):
+    if neighbor == 0 or p == 0:
         neighbor += 0.01
         p += 0.01
     if p > neighbor:
@@ -53,7 +59,7 @@ def _check_deviation_peaks(p: float, neighbor: float) -> bool:
 
 
 def _check_deviation_valleys(p: float, neighbor: float) -> bool:
-    if any([neighbor == 0, p == 0]):
+    if neighbor == 0 or p == 0:
         neighbor += 0.01
         p += 0.01
     if p < neighbor:
@@ -61,64 +67,66 @@ def _check_deviation_valleys(p: float, neighbor: float) -> bool:
     return False
 
 
-def find_single_valleys(prices: list) -> list[int]:
-    ret = []
-    for idx, p in enumerate(prices):
-        if idx <= 1 or idx >= len(prices) - 2:
-            pass
-        else:
-            if all(
-                    [
-                        prices[idx] < prices[idx - 1],
-                        prices[idx] < prices[idx + 1],
-                        min(prices[idx - 1], prices[idx + 1])
-                        / max(prices[idx - 1], prices[idx + 1])
-                        > 0.8,
-                    ]
-            ):
-                ret.append(idx)
+def _is_single_valley(p: float, prev: float, nxt: float) -> bool:
+    if not (p < prev and p < nxt):
+        return False
+    _max = max(prev, nxt)
+    return _max != 0 and min(prev, nxt) / _max > 0.8
+
+
+def _prominence(p: float, prev: float | None, nxt: float | None, price_range: float) -> float:
+    """How far a slot stands above (positive) or below (negative) its neighbors, relative to the day's range."""
+    if not price_range:
+        return 0
+    neighbors = [n for n in (prev, nxt) if n is not None]
+    if not neighbors:
+        return 0
+    return round((p - sum(neighbors) / len(neighbors)) / price_range, 3)
+
+
+def _find_single_anomalies(values: list[int]) -> list[int]:
+    """Pulls a single slot that differs from two equal neighbors halfway back towards them."""
+    ret = values.copy()
+    for idx in range(1, len(values) - 1):
+        _prev = values[idx - 1]
+        _curr = values[idx]
+        if _prev == values[idx + 1] and _prev != _curr:
+            half = int(abs(_prev - _curr) / 2)
+            ret[idx] += half if _prev > _curr else -half
     return ret
 
 
-# def _find_single_anomalies(adj: list) -> list[int]:
-#     for idx, p in enumerate(adj):
-#         if idx <= 1 or idx >= len(adj) - 1:
-#             pass
-#         else:
-#             if all([adj[idx - 1] == adj[idx + 1], adj[idx - 1] != adj[idx]]):
-#                 _prev = adj[idx - 1]
-#                 _curr = adj[idx]
-#                 diff = max(_prev, _curr) - min(_prev, _curr)
-#                 if int(diff / 2) > 0:
-#                     if _prev > _curr:
-#                         adj[idx] += int(diff / 2)
-#                     else:
-#                         adj[idx] -= int(diff / 2)
-#     return adj
-
-def _find_single_anomalies(adj: dict) -> dict:
-    return adj
-    # for k, v in adj.items():
-    #     if all([k+timedelta(hours=-1) in adj.items, k+timedelta(hours=+1) in adj.items]):
-
-
-def _smooth_upwards_transitions(start_list: dict, tolerance):
-    for k, v in start_list.items():
-        if k + timedelta(hours=+1) in start_list.items():
-            if start_list[k + timedelta(hours=1)] >= start_list[k] + tolerance:
-                start_list[k] += 1
-    return start_list
-
-
-def smooth_transitions(vals: dict, tolerance: int) -> dict:
+def _smooth_upwards_transitions(values: list[int], ramp_limit: int, slots_per_hour: int) -> list[int]:
+    """Raises the slots ahead of a steep rise so that no hour climbs more than ramp_limit."""
+    ret = values.copy()
+    for idx in range(len(ret) - slots_per_hour - 1, -1, -1):
+        floor = ret[idx + slots_per_hour] - ramp_limit
+        if ret[idx] < floor:
+            ret[idx] = floor
+    return ret
+
+
+def _slots_per_hour(keys: list[datetime]) -> int:
+    if len(keys) < 2:
+        return 1
+    minutes = int((keys[1] - keys[0]).total_seconds() / 60)
+    return max(1, 60 // minutes) if minutes > 0 else 1
+
+
+def smooth_transitions(vals: dict, tolerance: int, ramp_limit: int | None = None) -> dict:
     if tolerance is not None:
         tolerance = min(tolerance, 3)
     else:
         tolerance = 3
+    if ramp_limit is None:
+        ramp_limit = max(tolerance - 1, 1)
 
-    ret = _find_single_anomalies(vals)
-    ret = _smooth_upwards_transitions(ret, tolerance)
+    keys = sorted(vals)
+    values = [vals[k] for k in keys]
+    values = _find_single_anomalies(values)
+    values = _smooth_upwards_transitions(values, ramp_limit, _slots_per_hour(keys))
+    ret = dict(zip(keys, values))
 
-    if any([h for h in ret.values() if abs(h) > 10]):
-        _LOGGER.warning("Offset values are out of range", ret, vals)
+    if any(abs(v) > 10 for v in values):
+        _LOGGER.warning("Offset values are out of range: %s, %s", ret, vals)
     return ret
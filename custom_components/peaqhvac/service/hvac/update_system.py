@@ -9,7 +9,7 @@ from homeassistant.helpers.event import async_track_time_interval
 from peaqevcore.common.models.observer_types import ObserverTypes
 
 from custom_components.peaqhvac.service.hvac.const import WATER_HEATER_NAME, HOUSE_HEATER_NAME
-from custom_components.peaqhvac.service.hvac.water_heater.cycle_waterboost import async_cycle_waterboost
+from custom_components.peaqhvac.service.hvac.water_heater.cycle_waterboost import WaterBoostCycle
 from custom_components.peaqhvac.service.observer.iobserver_coordinator import IObserver
 
 if TYPE_CHECKING:
@@ -41,6 +41,7 @@ class UpdateSystem:
         self._set_operation_call_parameters: callable = operation_params_func
         self.observer = observer
         self._hass = hass
+        self.water_boost_cycle = WaterBoostCycle(hass, hub, self.async_update_system)
         self.observer.add(ObserverTypes.UpdateOperation, self.async_receive_request)
         self.observer.add("water_boost_start", self.async_boost_water)
         self.observer.add("control_module_changed", self.async_control_module_changed)
@@ -66,9 +67,10 @@ class UpdateSystem:
     async def async_boost_water(self, target_temp: float) -> None:
         if self.control_modules.get(WATER_HEATER_NAME, False):
             _LOGGER.debug(f"init water boost process")
-            self._hass.async_create_task(
-                async_cycle_waterboost(target_temp, self.async_update_system, self.hub))
-            _LOGGER.debug(f"return from water boost process")
+            self.water_boost_cycle.start(target_temp)
+
+    async def async_shutdown(self) -> None:
+        await self.water_boost_cycle.async_shutdown()
 
     async def async_perform_periodic_updates(self, *args) -> None:
         remove_list = []
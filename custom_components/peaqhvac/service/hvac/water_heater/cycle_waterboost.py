@@ -1,28 +1,154 @@
-import time
-import logging
 import asyncio
-from datetime import datetime
+import logging
+from datetime import datetime, timedelta
+from typing import Callable
+
+from homeassistant.core import Event, EventStateChangedData, callback
+from homeassistant.helpers.event import async_track_point_in_time, async_track_state_change_event
 
 from custom_components.peaqhvac.service.models.enums.hvacoperations import HvacOperations
+from custom_components.peaqhvac.service.models.enums.sensortypes import SensorType
+from custom_components.peaqhvac.service.models.enums.water_boost_state import WaterBoostState
 
 _LOGGER = logging.getLogger(__name__)
 
+BOOST_TIMEOUT = 1800
+COOLDOWN = 180
+PEAK_WINDOW_START = 20
+PEAK_WINDOW_END = 55
+PEAQEV_THRESHOLD_ENTITY = "sensor.peaqev_threshold"
+
+
+class WaterBoostCycle:
+    """
+    Runs one water boost at a time. While boosting it listens to state changes of the water temperature
+    and the peaqev threshold and stops as soon as the target is reached or the peak is about to be breached.
+    Nothing is tracked while idle.
+    """
+    def __init__(self, hass, hub, async_update_system: Callable):
+        self._hass = hass
+        self._hub = hub
+        self._async_update_system = async_update_system
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._stop: asyncio.Event | None = None
+        self._listeners: list[Callable] = []
+        self._cancel_peak_check: Callable | None = None
+        self.state: WaterBoostState = WaterBoostState.Idle
+        self.target_temp: float | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked() or (self._task is not None and not self._task.done())
+
+    def start(self, target_temp: float) -> bool:
+        if self.is_running:
+            _LOGGER.debug(f"Water boost is already {self.state.value.lower()}. Ignoring new request for {target_temp}C")
+            return False
+        self._task = self._hass.async_create_task(self._async_run(target_temp), eager_start=False)
+        return True
+
+    async def async_shutdown(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _async_run(self, target_temp: float) -> None:
+        async with self._lock:
+            self.target_temp = target_temp
+            self._stop = asyncio.Event()
+            try:
+                self.state = WaterBoostState.Boosting
+                await self._async_update_system(operation=HvacOperations.WaterBoost, set_val=1)
+                self._listen()
+                self._check_temperature(self._hub.hvac.water_heater.current_temperature)
+                self._check_peak()
+                try:
+                    async with asyncio.timeout(BOOST_TIMEOUT):
+                        await self._stop.wait()
+                except TimeoutError:
+                    _LOGGER.debug(f"Water boost did not reach {target_temp}C within {BOOST_TIMEOUT / 60:.0f} minutes")
+                self._unlisten()
+                await self._async_update_system(operation=HvacOperations.WaterBoost, set_val=0)
+                self.state = WaterBoostState.CoolingDown
+                await asyncio.sleep(COOLDOWN)
+                await self._async_update_system(operation=HvacOperations.WaterBoost, set_val=0)
+                await self._hub.observer.async_broadcast("water boost done")
+                self._hass.bus.fire("peaqhvac.water_heater_warning", {"new": False})
+            except asyncio.CancelledError:
+                if self.state is WaterBoostState.Boosting:
+                    await self._async_turn_off_on_cancel()
+                raise
+            finally:
+                self._unlisten()
+                self.state = WaterBoostState.Idle
+                self.target_temp = None
+
+    async def _async_turn_off_on_cancel(self) -> None:
+        try:
+            await self._async_update_system(operation=HvacOperations.WaterBoost, set_val=0)
+        except Exception as e:
+            _LOGGER.warning(f"Could not turn off water boost while cancelling: {e}")
+
+    def _listen(self) -> None:
+        water_temp_entity = self._hub.hvac.get_sensor(SensorType.WaterTemp)
+        self._listeners.append(
+            async_track_state_change_event(self._hass, [water_temp_entity], self._async_on_water_temperature)
+        )
+        if self._hub.sensors.peaqev_installed:
+            self._listeners.append(
+                async_track_state_change_event(self._hass, [PEAQEV_THRESHOLD_ENTITY], self._async_on_threshold)
+            )
+
+    def _unlisten(self) -> None:
+        for unsub in self._listeners:
+            unsub()
+        self._listeners.clear()
+        if self._cancel_peak_check is not None:
+            self._cancel_peak_check()
+            self._cancel_peak_check = None
+
+    @callback
+    def _async_on_water_temperature(self, event: Event[EventStateChangedData]) -> None:
+        new_state = event.data["new_state"]
+        if new_state is None:
+            return
+        try:
+            self._check_temperature(float(new_state.state))
+        except ValueError:
+            _LOGGER.debug(f"Could not parse water temperature {new_state.state}")
+
+    @callback
+    def _async_on_threshold(self, event: Event[EventStateChangedData]) -> None:
+        self._check_peak()
+
+    @callback
+    def _async_on_peak_window(self, *args) -> None:
+        self._cancel_peak_check = None
+        self._check_peak()
+
+    def _check_temperature(self, temp: float | None) -> None:
+        if temp is not None and self.target_temp is not None and temp >= self.target_temp:
+            _LOGGER.debug(f"Water temperature {temp}C reached target {self.target_temp}C")
+            self._stop.set()
+
+    def _check_peak(self) -> None:
+        if not self._hub.sensors.peaqev_installed or not self._hub.sensors.peaqev_facade.above_stop_threshold:
+            return
+        now = datetime.now()
+        if PEAK_WINDOW_START <= now.minute < PEAK_WINDOW_END:
+            _LOGGER.debug("Peak is being breached. Turning off water heating")
+            self._stop.set()
+        elif self._cancel_peak_check is None:
+            self._cancel_peak_check = async_track_point_in_time(
+                self._hass, self._async_on_peak_window, self._next_peak_window(now)
+            )
 
-async def async_cycle_waterboost(target_temp: float, async_update_system: callable, hub) -> bool:
-    end_time = time.time() + 1800
-    await async_update_system(operation=HvacOperations.WaterBoost, set_val=1)
-    while all([
-        time.time() < end_time,
-        hub.hvac.water_heater.current_temperature < target_temp
-    ]):
-        if hub.sensors.peaqev_installed:
-            if all([hub.sensors.peaqev_facade.above_stop_threshold, 20 <= datetime.now().minute < 55]):
-                _LOGGER.debug("Peak is being breached. Turning off water heating")
-                break
-        await asyncio.sleep(5)
-    await async_update_system(operation=HvacOperations.WaterBoost, set_val=0)
-    await asyncio.sleep(180)
-    await async_update_system(operation=HvacOperations.WaterBoost, set_val=0)
-    await hub.observer.async_broadcast("water boost done")
-    hub.state_machine.bus.fire("peaqhvac.water_heater_warning", {"new": False})
-    return True
+    @staticmethod
+    def _next_peak_window(now: datetime) -> datetime:
+        ret = now.replace(minute=PEAK_WINDOW_START, second=0, microsecond=0)
+        return ret if ret > now else ret + timedelta(hours=1)
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+EVENT_LOG_SIZE = 32
+EVENT_LOG_TTL = timedelta(hours=12)
+
+
+class BusEventLog:
+    """
+    Remembers fired one-shot bus events by (event, key) for a limited time.
+    Keys that are datetimes expire ttl after that time, other keys ttl after they were fired.
+    Lookups are O(1); expired entries are dropped when the log is full or the key is seen again.
+    """
+    def __init__(self, maxsize: int = EVENT_LOG_SIZE, ttl: timedelta = EVENT_LOG_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.suppressed: int = 0
+        self._log: OrderedDict[tuple, datetime] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._log)
+
+    def __contains__(self, item: tuple) -> bool:
+        return self._is_alive(item, datetime.now())
+
+    def _is_alive(self, item: tuple, now: datetime) -> bool:
+        expires = self._log.get(item)
+        if expires is None:
+            return False
+        if expires <= now:
+            del self._log[item]
+            return False
+        return True
+
+    def _expiry(self, key, now: datetime) -> datetime:
+        base = key if isinstance(key, datetime) else now
+        return min(base, datetime.max - self.ttl) + self.ttl
+
+    def should_fire(self, event: str, key, now: datetime | None = None) -> bool:
+        """Returns True and records the event the first time (event, key) is seen within its lifetime."""
+        now = now or datetime.now()
+        item = (event, key)
+        if self._is_alive(item, now):
+            self.suppressed += 1
+            return False
+        if len(self._log) >= self.maxsize:
+            self._evict(now)
+        self._log[item] = self._expiry(key, now)
+        return True
+
+    def _evict(self, now: datetime) -> None:
+        for item in [k for k, expires in self._log.items() if expires <= now]:
+            del self._log[item]
+        while len(self._log) >= self.maxsize:
+            self._log.popitem(last=False)
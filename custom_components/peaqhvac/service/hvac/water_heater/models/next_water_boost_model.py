@@ -4,11 +4,13 @@ from statistics import mean
 from custom_components.peaqhvac.service.hvac.water_heater.models.water_boost_data import WaterBoostData
 from custom_components.peaqhvac.service.models.enums.demand import Demand
 from custom_components.peaqhvac.service.models.enums.hvac_presets import HvacPresets
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
 
 HOUR_LIMIT = 18
 DELAY_LIMIT = 48
 MIN_DEMAND = 26
 DEFAULT_TEMP_TREND = -0.5
+RECENT_BOOST = timedelta(hours=1)
 
 DEMAND_MINUTES = {
     HvacPresets.Normal: {
@@ -79,15 +81,24 @@ class NextWaterBoostModel:
     def now_dt(self) -> datetime:
         return self.data.now_dt.replace(second=0, microsecond=0) if self.data.now_dt else None
 
-    def _create_price_dict(self, prices) -> dict:
+    def _create_price_dict(self, prices, resolution: SlotResolution = SlotResolution()) -> dict:
         startofday = self.now_dt.replace(hour=0, minute=0)
-        return {startofday + timedelta(hours=i): prices[i] for i in range(0, len(prices))}
+        return {startofday + timedelta(minutes=resolution.minutes * i): prices[i] for i in range(0, len(prices))}
+
+    @staticmethod
+    def _boost_is_recent(dt: datetime, latest_boost: datetime | None) -> bool:
+        return latest_boost is not None and dt - latest_boost < RECENT_BOOST
 
     def update(self, temp, temp_trend, target_temp, prices_today: list, prices_tomorrow: list, preset: HvacPresets,
-               now_dt=None, latest_boost: datetime = None) -> None:
+               now_dt=None, latest_boost: datetime = None, min_price: float = None) -> None:
+        """
+        Takes the latest inputs of the water boost planner and sets should_update when any of them,
+        or the price slot of the current time, differs from the previous call.
+        """
         _old_dt = self.now_dt
         self.set_now_dt(now_dt)
-        new_price_dict = self._create_price_dict(prices_today + prices_tomorrow)
+        resolution = SlotResolution.from_prices(prices_today)
+        new_price_dict = self._create_price_dict(prices_today + prices_tomorrow, resolution)
         if new_price_dict != self.data.price_dict:
             if all([
                 any([k for k in new_price_dict.keys() if k.date() != self.now_dt.date()]),
@@ -98,11 +109,15 @@ class NextWaterBoostModel:
             self.data.should_update = True
         new_non_hours = self._set_hours(self.data.non_hours_raw, preset)
         new_demand_hours = self._set_hours(self.data.demand_hours_raw, preset)
-        new_temp_trend = DEFAULT_TEMP_TREND if temp_trend > DEFAULT_TEMP_TREND else temp_trend
+        new_temp_trend = DEFAULT_TEMP_TREND if DEFAULT_TEMP_TREND < temp_trend < 0.1 else temp_trend
+        new_min_price = -float('inf') if min_price is None else min_price
 
         if any([
-            _old_dt.hour != self.now_dt.hour,
+            _old_dt.date() != self.now_dt.date(),
+            resolution.index_of(_old_dt) != resolution.index_of(self.now_dt),
+            self._boost_is_recent(_old_dt, latest_boost) != self._boost_is_recent(self.now_dt, latest_boost),
             self.data.latest_boost != latest_boost,
+            self.data.min_price != new_min_price,
             self.data.non_hours != new_non_hours,
             self.data.demand_hours != new_demand_hours,
             self.data.preset != preset,
@@ -113,6 +128,7 @@ class NextWaterBoostModel:
             self.data.should_update = True
 
         self.data.latest_boost = latest_boost
+        self.data.min_price = new_min_price
         self.data.non_hours = new_non_hours
         self.data.demand_hours = new_demand_hours
         self.set_floating_mean()
@@ -134,4 +150,5 @@ class NextWaterBoostModel:
         self.data.now_dt = now_dt or datetime.now()
 
     def set_floating_mean(self) -> None:
-        self.data.floating_mean = mean([v for k, v in self.data.price_dict.items() if k >= self.now_dt]) * 0.9
\ No newline at end of file
+        future = [v for k, v in self.data.price_dict.items() if k >= self.now_dt]
+        self.data.floating_mean = mean(future) * 0.9 if future else None
\ No newline at end of file
@@ -0,0 +1,78 @@
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+COLD = 1
+DEMAND = 2
+NON = 4
+
+
+@dataclass(slots=True)
+class PriceData:
+    price: float
+    price_spread: float
+    time: datetime
+    water_temp: float
+    is_cold: bool
+    is_demand: bool
+    is_non: bool
+    target_temp: int
+
+
+class PriceTable:
+    """
+    The water planner's per-slot features as columns (struct of arrays) instead of one record per slot.
+    Rows are consecutive slots from first_time, so times are derived from the row index. The columns are
+    kept between planning calls and only grow, which keeps a planning call from allocating per slot.
+    """
+    __slots__ = ("price", "spread", "water_temp", "target", "flags", "suffix_mean", "size", "first_time", "slot_length")
+
+    def __init__(self):
+        self.price = array("d")
+        self.spread = array("d")
+        self.water_temp = array("d")
+        self.target = array("i")
+        self.flags = bytearray()
+        self.suffix_mean = array("d")
+        self.size: int = 0
+        self.first_time: datetime = datetime.min
+        self.slot_length: timedelta = timedelta(hours=1)
+
+    def reset(self, capacity: int, first_time: datetime, slot_length: timedelta) -> None:
+        grow = capacity - len(self.price)
+        if grow > 0:
+            for column in (self.price, self.spread, self.water_temp, self.suffix_mean):
+                column.extend(array("d", bytes(8 * grow)))
+            self.target.extend(array("i", bytes(self.target.itemsize * grow)))
+            self.flags.extend(bytes(grow))
+        self.size = 0
+        self.first_time = first_time
+        self.slot_length = slot_length
+
+    def append(self, price: float, spread: float, water_temp: float, flags: int, target: int) -> None:
+        row = self.size
+        self.price[row] = price
+        self.spread[row] = spread
+        self.water_temp[row] = water_temp
+        self.flags[row] = flags
+        self.target[row] = target
+        self.size = row + 1
+
+    def time(self, row: int) -> datetime:
+        return self.first_time + self.slot_length * row
+
+    def row(self, row: int) -> PriceData:
+        flags = self.flags[row]
+        return PriceData(
+            self.price[row],
+            self.spread[row],
+            self.time(row),
+            self.water_temp[row],
+            bool(flags & COLD),
+            bool(flags & DEMAND),
+            bool(flags & NON),
+            self.target[row],
+        )
+
+    def rows(self) -> list[PriceData]:
+        return [self.row(r) for r in range(self.size)]
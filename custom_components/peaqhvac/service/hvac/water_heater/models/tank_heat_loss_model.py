@@ -0,0 +1,91 @@
+from math import exp
+
+REFERENCE_TEMP = 45
+FORGETTING_FACTOR = 0.995
+INITIAL_COVARIANCE = 100
+MIN_SAMPLES = 10
+MIN_INTERVAL = 60
+MAX_INTERVAL = 6 * 3600
+MAX_COOLING_RATE = 0.5
+
+
+class TankHeatLossModel:
+    """
+    Learns how the water tank cools from consecutive temperature readings.
+    The cooling rate is modelled as rate = a + b * (T - REFERENCE_TEMP) (Newton's law of cooling) and fitted
+    with recursive least squares, so each reading is an O(1) update. Forecasts use the closed-form solution
+    T(t) = T_eq + (T0 - T_eq) * e^(b*t) with T_eq = REFERENCE_TEMP - a / b.
+    """
+    def __init__(self, forgetting_factor: float = FORGETTING_FACTOR):
+        self.forgetting_factor = forgetting_factor
+        self.a: float = 0.0
+        self.b: float = 0.0
+        self.samples: int = 0
+        self._p = [[INITIAL_COVARIANCE, 0.0], [0.0, INITIAL_COVARIANCE]]
+        self._latest: tuple[float, float] | None = None
+
+    def to_dict(self) -> dict:
+        return {"a": self.a, "b": self.b, "samples": self.samples, "p": self._p,
+                "latest": list(self._latest) if self._latest is not None else None}
+
+    def load(self, data: dict) -> None:
+        """Restores a model saved with to_dict. Invalid data leaves the model untouched."""
+        try:
+            a, b, samples = float(data["a"]), float(data["b"]), int(data["samples"])
+            p = [[float(v) for v in row] for row in data["p"]]
+            latest = tuple(float(v) for v in data["latest"]) if data.get("latest") else None
+        except (KeyError, TypeError, ValueError):
+            return
+        self.a, self.b, self.samples, self._p, self._latest = a, b, samples, p, latest
+
+    @property
+    def is_ready(self) -> bool:
+        return self.samples >= MIN_SAMPLES and self.b < 0
+
+    @property
+    def equilibrium_temp(self) -> float | None:
+        return REFERENCE_TEMP - self.a / self.b if self.b < 0 else None
+
+    def add_reading(self, val: float, t: float, heating: bool = False) -> None:
+        """Adds a temperature reading (C) taken at epoch t. Readings while heating only reset the baseline."""
+        latest, self._latest = self._latest, (t, val)
+        if latest is None or heating:
+            return
+        interval = t - latest[0]
+        if not MIN_INTERVAL <= interval <= MAX_INTERVAL:
+            return
+        rate = (val - latest[1]) / (interval / 3600)
+        if rate > MAX_COOLING_RATE:
+            return
+        self._update((latest[1] + val) / 2 - REFERENCE_TEMP, rate)
+
+    def _update(self, x: float, y: float) -> None:
+        p = self._p
+        lam = self.forgetting_factor
+        px0 = p[0][0] + p[0][1] * x
+        px1 = p[1][0] + p[1][1] * x
+        denominator = lam + px0 + x * px1
+        k0, k1 = px0 / denominator, px1 / denominator
+        error = y - (self.a + self.b * x)
+        self.a += k0 * error
+        self.b += k1 * error
+        self._p = [
+            [(p[0][0] - k0 * px0) / lam, (p[0][1] - k0 * px1) / lam],
+            [(p[1][0] - k1 * px0) / lam, (p[1][1] - k1 * px1) / lam],
+        ]
+        self.samples += 1
+
+    def rate_at(self, temp: float) -> float:
+        """Expected change of the water temperature in C/hour at the given temperature."""
+        return self.a + self.b * (temp - REFERENCE_TEMP)
+
+    def forecast(self, current_temp: float, hours: list[float]) -> list[float] | None:
+        """Temperatures after each of the given number of hours, or None until the model has learned a cooling curve."""
+        if not self.is_ready:
+            return None
+        return [self.temperature_after(current_temp, h) for h in hours]
+
+    def temperature_after(self, current_temp: float, hours: float) -> float:
+        """Temperature after the given number of hours. Only meaningful once the model is ready."""
+        equilibrium = self.equilibrium_temp
+        return equilibrium + (current_temp - equilibrium) * exp(self.b * hours)
@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+def _to_iso(dt: datetime | None) -> str | None:
+    return dt.isoformat() if dt is not None and dt != datetime.max else None
+
+
+def _from_iso(val: str | None) -> datetime | None:
+    try:
+        return datetime.fromisoformat(val) if val else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class WaterHeaterState:
+    """The water heater state that is kept across restarts."""
+    latest_boost_call: float = 0
+    boost_active: bool = False
+    boost_target: int | None = None
+    next_start: datetime | None = None
+    next_target: int | None = None
+    schedule: list[tuple[datetime, int]] = field(default_factory=list)
+    trend_samples: list[tuple[float, float]] = field(default_factory=list)
+    heat_loss: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "latest_boost_call": self.latest_boost_call,
+            "boost_active": self.boost_active,
+            "boost_target": self.boost_target,
+            "next_start": _to_iso(self.next_start),
+            "next_target": self.next_target,
+            "schedule": [[_to_iso(start), target] for start, target in self.schedule],
+            "trend_samples": [list(s) for s in self.trend_samples],
+            "heat_loss": self.heat_loss,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "WaterHeaterState":
+        schedule = [(_from_iso(start), target) for start, target in data.get("schedule", [])]
+        return WaterHeaterState(
+            latest_boost_call=float(data.get("latest_boost_call", 0)),
+            boost_active=bool(data.get("boost_active", False)),
+            boost_target=data.get("boost_target"),
+            next_start=_from_iso(data.get("next_start")),
+            next_target=data.get("next_target"),
+            schedule=[(start, target) for start, target in schedule if start is not None],
+            trend_samples=[(float(t), float(v)) for t, v in data.get("trend_samples", [])],
+            heat_loss=data.get("heat_loss", {}),
+        )
@@ -2,16 +2,25 @@ from custom_components.peaqhvac.service.hvac.const import DEFAULT_WATER_BOOST
 from peaqevcore.common.wait_timer import WaitTimer
 from datetime import datetime
 
+from custom_components.peaqhvac.service.hvac.water_heater.models.bus_event_log import BusEventLog
 from custom_components.peaqhvac.service.observer.event_property import EventProperty
 
 class BusFireOnceMixin:
-    _event_log = []
+    _event_log: BusEventLog | None = None
+
+    @property
+    def event_log(self) -> BusEventLog:
+        if self._event_log is None:
+            self._event_log = BusEventLog()
+        return self._event_log
+
+    @property
+    def suppressed_events(self) -> int:
+        return self.event_log.suppressed
 
     def bus_fire_once(self, event, data, next_start=None):
-        if next_start not in self._event_log:            
+        if next_start is None or self.event_log.should_fire(event, next_start):
             self._hass.bus.fire(event, data)
-            if next_start:
-                self._event_log.append(next_start)
 
 
 class WaterBoosterModel(BusFireOnceMixin):
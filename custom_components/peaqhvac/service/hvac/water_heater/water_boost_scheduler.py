@@ -0,0 +1,114 @@
+from datetime import timedelta
+from math import ceil, exp
+from statistics import mean
+
+from custom_components.peaqhvac.service.hvac.water_heater.water_heater_next_start import (BOOST_LEAD,
+                                                                                          MAX_TARGET_TEMP,
+                                                                                          TARGET_TEMP,
+                                                                                          NextStartExportModel,
+                                                                                          NextStartPostModel)
+from custom_components.peaqhvac.service.models.enums.hvac_presets import HvacPresets
+
+HEATING_RATE = 20
+MIN_TEMP = 10
+DEMAND_MARGIN = 2
+COLD_WEIGHT = 4
+BOOST_START_WEIGHT = 2
+RECENT_BOOST = timedelta(hours=1)
+
+
+def plan_boosts(
+        model: NextStartPostModel,
+        target_temp: int = TARGET_TEMP,
+        max_target_temp: int = MAX_TARGET_TEMP,
+        heating_rate: float = HEATING_RATE,
+) -> list[NextStartExportModel]:
+    """
+    Plans every water boost over the whole price horizon in one pass.
+    A boost heats the tank to the slot's target (max_target_temp when the price is at or below min price)
+    at heating_rate C/hour. Between boosts the tank cools along the learned heat-loss curve, or the trend.
+    Minimizes price-weighted heating, a fixed cost per boost and a penalty for every degree-hour below the
+    water limit (raised in demand hours), by dynamic programming over the slot and temperature where each
+    boost ends. Like NextWaterBoost, a boost is started BOOST_LEAD before its slot so the heater is running
+    when the slot begins. Boosts are never started in non hours or within an hour of the latest boost.
+    """
+    prices = model.prices
+    resolution = model.resolution
+    first = resolution.index_of(model.dt)
+    n = len(prices)
+    if first >= n:
+        return []
+    slot_hours = resolution.minutes / 60
+    start_of_day = model.dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    avg_price = max(mean(prices[first:]), 0.01)
+    water_limit = 30 if model.hvac_preset == HvacPresets.Away else 40
+    demand_hours = set(model.demand_hours)
+    non_hours = set(model.non_hours)
+
+    slot_times = [start_of_day + timedelta(minutes=resolution.minutes * i) for i in range(n + 1)]
+    cold_penalty = COLD_WEIGHT * avg_price * slot_hours
+    limits = [water_limit + (DEMAND_MARGIN if slot_times[i].hour in demand_hours else 0) for i in range(n)]
+    targets = [target_temp if p > model.min_price else max_target_temp for p in prices]
+    earliest = first
+    if model.latest_boost is not None and model.dt - model.latest_boost < RECENT_BOOST:
+        ready = (model.latest_boost + RECENT_BOOST + BOOST_LEAD - start_of_day).total_seconds() / 60
+        earliest = max(first, ceil(ready / resolution.minutes))
+    allowed = [
+        i >= earliest and slot_times[i].hour not in non_hours and (slot_times[i] - BOOST_LEAD).hour not in non_hours
+        for i in range(n)
+    ]
+    prefix = [0.0]
+    for p in prices:
+        prefix.append(prefix[-1] + p)
+    cool = _cooling(model, slot_hours, n - first + 1)
+    gain_per_slot = heating_rate * slot_hours
+
+    start_state = (first, round(float(model.current_temp), 1))
+    best: dict[tuple, float] = {start_state: 0.0}
+    parent: dict[tuple, tuple | None] = {start_state: None}
+    final_cost, final_state = float("inf"), start_state
+
+    by_end: list[list[tuple]] = [[] for _ in range(n + 1)]
+    by_end[first].append(start_state)
+    for end in range(first, n + 1):
+        for state in by_end[end]:
+            cost, temp_end = best[state], state[1]
+            penalty = 0.0
+            for k in range(end, n):
+                temp = cool(temp_end, k - end)
+                target = targets[k]
+                if allowed[k] and target > temp:
+                    duration = ceil((target - temp) / gain_per_slot - 1e-9)
+                    boost_end = min(k + duration, n)
+                    energy = (target - temp) * (prefix[boost_end] - prefix[k]) / (boost_end - k)
+                    candidate = cost + penalty + BOOST_START_WEIGHT * avg_price + energy
+                    key = (boost_end, float(target))
+                    if candidate < best.get(key, float("inf")):
+                        if key not in best:
+                            by_end[boost_end].append(key)
+                        best[key] = candidate
+                        parent[key] = (state, k)
+                if temp < limits[k]:
+                    penalty += (limits[k] - temp) * cold_penalty
+            total = cost + penalty
+            if total < final_cost:
+                final_cost, final_state = total, state
+
+    ret = []
+    state = final_state
+    while parent.get(state) is not None:
+        state, start = parent[state]
+        ret.append(NextStartExportModel(slot_times[start] - BOOST_LEAD, int(targets[start])))
+    ret.reverse()
+    return ret
+
+
+def _cooling(model: NextStartPostModel, slot_hours: float, slots: int):
+    """Returns f(temp, m): the expected temperature m slots after the tank held temp."""
+    heat_loss = model.heat_loss
+    if heat_loss is not None and heat_loss.is_ready:
+        equilibrium = heat_loss.equilibrium_temp
+        decay = [exp(heat_loss.b * slot_hours * m) for m in range(slots)]
+        return lambda temp, m: max(MIN_TEMP, equilibrium + (temp - equilibrium) * decay[m])
+    step = model.temp_trend * slot_hours
+    return lambda temp, m: max(MIN_TEMP, temp + step * m)
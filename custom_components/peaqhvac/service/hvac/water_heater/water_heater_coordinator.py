@@ -15,16 +15,30 @@ from custom_components.peaqhvac.service.hvac.interfaces.iheater import IHeater
 from peaqevcore.common.wait_timer import WaitTimer
 from custom_components.peaqhvac.service.hvac.water_heater.const import *
 from custom_components.peaqhvac.service.hvac.water_heater.water_heater_next_start import NextWaterBoost, \
-    NextStartPostModel
+    NextStartPostModel, NextStartExportModel, BOOST_LEAD
+from custom_components.peaqhvac.service.hvac.water_heater.water_boost_scheduler import plan_boosts
+from custom_components.peaqhvac.service.hvac.water_heater.water_heater_store import WaterHeaterStore
+from custom_components.peaqhvac.service.hvac.water_heater.cycle_waterboost import BOOST_TIMEOUT
+from custom_components.peaqhvac.service.hvac.water_heater.models.water_heater_state import WaterHeaterState
+from custom_components.peaqhvac.service.hvac.water_heater.models.next_water_boost_model import NextWaterBoostModel, \
+    DEFAULT_TEMP_TREND
+from custom_components.peaqhvac.service.hvac.water_heater.models.water_boost_data import WaterBoostData
+from custom_components.peaqhvac.service.hvac.water_heater.models.tank_heat_loss_model import TankHeatLossModel
 from custom_components.peaqhvac.service.models.enums.demand import Demand
 from custom_components.peaqhvac.service.models.enums.hvac_presets import \
     HvacPresets
-from homeassistant.helpers.event import async_track_time_interval
+from custom_components.peaqhvac.service.models.enums.water_boost_planning_mode import WaterBoostPlanningMode
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
+from homeassistant.helpers.event import async_track_point_in_time
 from custom_components.peaqhvac.service.hvac.water_heater.models.waterbooster_model import \
     WaterBoosterModel
 
 _LOGGER = logging.getLogger(__name__)
 
+TREND_MAX_AGE = 900
+SCHEDULE_TEMP_STEP = 1
+SCHEDULE_TREND_STEP = 0.5
+
 """
 we shouldnt need two booleans to tell if we are heating or trying to heat.
 make the signaling less complicated, just calculate the need and check whether heating is already happening.
@@ -40,15 +54,29 @@ class WaterHeater(IHeater):
         self._wait_timer = WaitTimer(timeout=WAITTIMER_TIMEOUT, init_now=False)
         self._wait_timer_peak = WaitTimer(timeout=WAITTIMER_TIMEOUT, init_now=False)
         self.temp_trend = Gradient(
-            max_age=900, max_samples=5, precision=2, ignore=0, outlier=20
+            max_age=TREND_MAX_AGE, max_samples=5, precision=2, ignore=0, outlier=20
         )
+        self.heat_loss = TankHeatLossModel()
         self.model = WaterBoosterModel(self.hub.state_machine)
         self.next = NextWaterBoost()
+        self.next_model = NextWaterBoostModel(WaterBoostData(
+            non_hours_raw=self._options.heating.non_hours_water_boost,
+            demand_hours_raw=self._options.heating.demand_hours_water_boost,
+        ))
+        self._next_start_plan: NextStartExportModel | None = None
+        self._plan_heat_loss_samples: int = 0
+        self.boost_schedule: list[NextStartExportModel] = []
+        self._schedule_key: tuple | None = None
+        self._schedule_resolution: SlotResolution = SlotResolution()
+        self.plan_cache_hits: int = 0
+        self.plan_cache_misses: int = 0
         self.observer.add(ObserverTypes.OffsetsChanged, self.async_update_operation)
         self.observer.add("water boost done", self.async_reset_water_boost)
-        async_track_time_interval(
-            self.hub.state_machine, self.async_update_operation, timedelta(seconds=30)
-        )
+        self._cancel_boost_timer = None
+        self._boost_timer_start: datetime | None = None
+        self._boost_target: int | None = None
+        self._boost_to_resume: tuple[float, int] | None = None
+        self.store = WaterHeaterStore(self.hub.state_machine)
 
     @property
     def is_initialized(self) -> bool:
@@ -109,6 +137,8 @@ class WaterHeater(IHeater):
             else:
                 return
         self.temp_trend.add_reading(val=val, t=time.time())
+        self.heat_loss.add_reading(val=val, t=time.time(), heating=self.water_heating)
+        self._save_state()
 
     @property
     def demand(self) -> Demand:
@@ -137,27 +167,110 @@ class WaterHeater(IHeater):
             self.model.next_water_heater_start = datetime.max
             return None
 
+        ret = self._get_next_start_plan()
+
+        if ret.next_start < datetime.now() + timedelta(days=-100):
+            ret.next_start = datetime.max
+            ret.target_temp = None
+        if self.model.next_water_heater_start != ret.next_start:
+            self.model.next_water_heater_start = ret.next_start
+            self._save_state()
+        return ret.target_temp
+
+    def _get_next_start_plan(self) -> NextStartExportModel:
+        """Returns the cached water boost plan, recalculating it only when one of its inputs has changed."""
+        now = datetime.now()
+        prices = self.hub.spotprice.model.prices
+        prices_tomorrow = self.hub.spotprice.model.prices_tomorrow
+        latest_boost = datetime.fromtimestamp(self.model.latest_boost_call)
+        if self._options.water_boost_planning_mode is WaterBoostPlanningMode.Horizon:
+            return self._get_scheduled_boost(now, latest_boost)
+        self.next_model.update(
+            temp=self.current_temperature,
+            temp_trend=self.temp_trend.gradient_raw,
+            target_temp=None,
+            prices_today=prices,
+            prices_tomorrow=prices_tomorrow,
+            preset=self._sensors.set_temp_indoors.preset,
+            now_dt=now,
+            latest_boost=latest_boost,
+            min_price=self._sensors.peaqev_facade.min_price,
+        )
+        if all([
+            self._next_start_plan is not None,
+            not self.next_model.data.should_update,
+            self._plan_heat_loss_samples == self.heat_loss.samples,
+        ]):
+            self.plan_cache_hits += 1
+            return NextStartExportModel(self._next_start_plan.next_start, self._next_start_plan.target_temp)
+        self.plan_cache_misses += 1
         model = NextStartPostModel(
-            prices=self.hub.spotprice.model.prices + self.hub.spotprice.model.prices_tomorrow,
+            prices=prices + prices_tomorrow,
             non_hours=self._options.heating.non_hours_water_boost,
             demand_hours=self._options.heating.demand_hours_water_boost,
             current_temp=self.current_temperature,
-            dt=datetime.now(),
+            dt=now,
             temp_trend=self.temp_trend.gradient_raw,
-            latest_boost=datetime.fromtimestamp(self.model.latest_boost_call),
+            latest_boost=latest_boost,
             min_price=self._sensors.peaqev_facade.min_price,
             hvac_preset=self._sensors.set_temp_indoors.preset,
+            resolution=SlotResolution.from_prices(prices),
+            heat_loss=self.heat_loss,
         )
-        ret = self.next.get_next_start(model)
+        self._plan_heat_loss_samples = self.heat_loss.samples
+        self._next_start_plan = self.next.get_next_start(model)
+        self.next_model.data.should_update = False
+        return NextStartExportModel(self._next_start_plan.next_start, self._next_start_plan.target_temp)
 
-        if ret.next_start < datetime.now() + timedelta(days=-100):
-            ret.next_start = datetime.max
-            ret.target_temp = None
-        self.model.next_water_heater_start = ret.next_start
-        return ret.target_temp
+    def _get_scheduled_boost(self, now: datetime, latest_boost: datetime) -> NextStartExportModel:
+        """
+        Returns the first boost in the horizon schedule that has not passed yet.
+        The schedule plans every boost over the known prices at once and is only recalculated when the prices,
+        the learned tank model, the latest boost or the tank temperature or trend (in steps) change.
+        """
+        prices = self.hub.spotprice.model.prices
+        prices_tomorrow = self.hub.spotprice.model.prices_tomorrow
+        min_price = self._sensors.peaqev_facade.min_price
+        preset = self._sensors.set_temp_indoors.preset
+        temp_trend = self.temp_trend.gradient_raw
+        temp_trend = DEFAULT_TEMP_TREND if DEFAULT_TEMP_TREND < temp_trend < 0.1 else temp_trend
+        key = (
+            now.date(), tuple(prices), tuple(prices_tomorrow), min_price, preset, latest_boost, self.heat_loss.samples,
+            round(self.current_temperature / SCHEDULE_TEMP_STEP), round(temp_trend / SCHEDULE_TREND_STEP),
+        )
+        if key == self._schedule_key:
+            self.plan_cache_hits += 1
+        else:
+            self.plan_cache_misses += 1
+            self._schedule_resolution = SlotResolution.from_prices(prices)
+            self.boost_schedule = plan_boosts(NextStartPostModel(
+                prices=prices + prices_tomorrow,
+                non_hours=self._options.heating.non_hours_water_boost,
+                demand_hours=self._options.heating.demand_hours_water_boost,
+                current_temp=self.current_temperature,
+                dt=now,
+                temp_trend=self.temp_trend.gradient_raw,
+                latest_boost=latest_boost,
+                min_price=min_price,
+                hvac_preset=preset,
+                resolution=self._schedule_resolution,
+                heat_loss=self.heat_loss,
+            ))
+            self._schedule_key = key
+            _LOGGER.debug(f"Water boost schedule updated: {[(b.next_start, b.target_temp) for b in self.boost_schedule]}")
+        slot = timedelta(minutes=self._schedule_resolution.minutes)
+        upcoming = next((b for b in self.boost_schedule if b.next_start + BOOST_LEAD + slot > now), None)
+        if upcoming is None:
+            self._next_start_plan = NextStartExportModel(datetime.max, None)
+        else:
+            self._next_start_plan = NextStartExportModel(upcoming.next_start, upcoming.target_temp)
+        return NextStartExportModel(self._next_start_plan.next_start, self._next_start_plan.target_temp)
 
     async def async_reset_water_boost(self):
+        self.model.water_boost.timeout = None
         self.model.water_boost.value = False
+        self._boost_target = None
+        self._save_state()
         await self.async_update_operation()
 
     def _check_and_reset_boost(self) -> None:
@@ -167,6 +280,7 @@ class WaterHeater(IHeater):
 
     async def async_update_operation(self, caller=None):
         self._check_and_reset_boost()
+        await self._async_resume_boost()
         if self.is_initialized:
             if self._sensors.set_temp_indoors.preset != HvacPresets.Away:
                 await self.async_set_water_heater_operation(HIGHTEMP_THRESHOLD)
@@ -176,6 +290,7 @@ class WaterHeater(IHeater):
     async def async_set_water_heater_operation(self, target_temp: int) -> None:
         if self.is_initialized:
             target_temp = self._get_next_start()
+            self._arm_boost_timer(self.model.next_water_heater_start)
         try:
             if target_temp:
                 await self.async_set_toggle_boost_next_start(self.model.next_water_heater_start, target_temp)
@@ -191,10 +306,95 @@ class WaterHeater(IHeater):
                         f"Water boost is needed. Target temp is {target} and current temp is {self.current_temperature}. Next start is {next_start}")
                     self.model.water_boost.value = True
                     self.model.latest_boost_call = time.time()
+                    self._boost_target = target
+                    self._save_state()
                     await self.observer.async_broadcast("water_boost_start", target)
         except Exception as e:
             _LOGGER.warning(f"Could not set water boost: {e}")
 
+    def export_state(self) -> WaterHeaterState:
+        return WaterHeaterState(
+            latest_boost_call=self.model.latest_boost_call,
+            boost_active=bool(self.model.water_boost.value),
+            boost_target=self._boost_target,
+            next_start=self.model.next_water_heater_start,
+            next_target=self._next_start_plan.target_temp if self._next_start_plan is not None else None,
+            schedule=[(b.next_start, b.target_temp) for b in self.boost_schedule],
+            trend_samples=self.temp_trend.samples_raw,
+            heat_loss=self.heat_loss.to_dict(),
+        )
+
+    def _save_state(self) -> None:
+        self.store.schedule_save(self.export_state)
+
+    async def async_save_state(self) -> None:
+        await self.store.async_save(self.export_state())
+
+    async def async_load_state(self) -> None:
+        """
+        Restores the stored state before the first plan. A boost that was running less than BOOST_TIMEOUT ago
+        is resumed once the hub is ready, and the restored latest boost keeps the planner from starting a duplicate one.
+        """
+        state = await self.store.async_load()
+        if state is None:
+            return
+        self.model.latest_boost_call = max(self.model.latest_boost_call, state.latest_boost_call)
+        self.heat_loss.load(state.heat_loss)
+        self.temp_trend.samples_raw = [s for s in state.trend_samples if time.time() - s[0] < TREND_MAX_AGE]
+        self.boost_schedule = [NextStartExportModel(start, target) for start, target in state.schedule]
+        if state.next_start is not None and state.next_start > datetime.now():
+            self.model.next_water_heater_start = state.next_start
+            self._next_start_plan = NextStartExportModel(state.next_start, state.next_target)
+            self._arm_boost_timer(state.next_start)
+        started = datetime.fromtimestamp(state.latest_boost_call)
+        if state.boost_active and state.boost_target is not None and datetime.now() - started < timedelta(seconds=BOOST_TIMEOUT):
+            self._boost_to_resume = (state.latest_boost_call, state.boost_target)
+
+    async def _async_resume_boost(self) -> None:
+        """Resumes the restored boost when the hub and the control module are ready to run it."""
+        if self._boost_to_resume is None or not all([self.hub.is_initialized, self.is_initialized, self.control_module]):
+            return
+        started, target = self._boost_to_resume
+        self._boost_to_resume = None
+        if time.time() - started >= BOOST_TIMEOUT:
+            _LOGGER.debug(f"Restored water boost to {target}C is too old to resume")
+            return
+        _LOGGER.debug(f"Resuming water boost to {target}C that started {datetime.fromtimestamp(started)}")
+        self.model.water_boost.value = True
+        self._boost_target = target
+        await self.observer.async_broadcast("water_boost_start", target)
+
+    async def async_shutdown(self) -> None:
+        """Saves the state after the boost cycle has been cancelled, so the aborted boost is not resumed."""
+        self.cancel_boost_timer()
+        self._boost_to_resume = None
+        self.model.water_boost.value = False
+        self._boost_target = None
+        await self.async_save_state()
+
+    def _arm_boost_timer(self, next_start: datetime) -> None:
+        """Arms a single callback at the planned boost start. Re-arms only when the planned start changes."""
+        if next_start == self._boost_timer_start:
+            return
+        self.cancel_boost_timer()
+        if next_start == datetime.max or next_start <= datetime.now():
+            return
+        self._boost_timer_start = next_start
+        self._cancel_boost_timer = async_track_point_in_time(
+            self.hub.state_machine, self._async_boost_timer_fired, next_start
+        )
+
+    async def _async_boost_timer_fired(self, *args) -> None:
+        self._cancel_boost_timer = None
+        self._boost_timer_start = None
+        await self.async_update_operation()
+
+    def cancel_boost_timer(self) -> None:
+        if self._cancel_boost_timer is not None:
+            self._cancel_boost_timer()
+            self._cancel_boost_timer = None
+        self._boost_timer_start = None
+
     def __is_below_start_threshold(self) -> bool:
         return all([
             datetime.now().minute >= 30,
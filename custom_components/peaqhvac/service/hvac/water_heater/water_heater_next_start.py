@@ -2,32 +2,20 @@ from datetime import datetime, timedelta
 import logging
 
 from custom_components.peaqhvac.service.models.enums.hvac_presets import HvacPresets
+from custom_components.peaqhvac.service.hvac.water_heater.models.tank_heat_loss_model import TankHeatLossModel
+from custom_components.peaqhvac.service.hvac.water_heater.models.price_table import COLD, DEMAND, NON, PriceData, \
+    PriceTable
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
 
 
 
 _LOGGER = logging.getLogger(__name__)
 
-REQUIRED_DEMAND_DELAY = 6
-
 #--------------------------------
 
-from datetime import datetime, timedelta
-from statistics import mean
 from dataclasses import dataclass
 
 
-@dataclass
-class PriceData:
-    price: float
-    price_spread: float
-    time: datetime
-    water_temp: float
-    is_cold: bool
-    is_demand: bool
-    is_non: bool
-    target_temp: int
-
-
 @dataclass
 class NextStartPostModel:
     prices: list
@@ -39,9 +27,13 @@ class NextStartPostModel:
     hvac_preset: HvacPresets = HvacPresets.Normal
     latest_boost: datetime|None = None
     dt: datetime = datetime.now()
+    resolution: SlotResolution | None = None
+    heat_loss: TankHeatLossModel | None = None
 
     def __post_init__(self):
         self.temp_trend = -0.5 if -0.5 < self.temp_trend < 0.1 else self.temp_trend
+        if self.resolution is None:
+            self.resolution = SlotResolution.from_prices(self.prices)
 
 @dataclass
 class NextStartExportModel:
@@ -51,13 +43,19 @@ class NextStartExportModel:
 
 TARGET_TEMP = 47
 MAX_TARGET_TEMP = 53
+BOOST_LEAD = timedelta(minutes=10)
+FILTER_WINDOW = timedelta(hours=2)
 
 class NextWaterBoost:
-    def __init__(self):
+    def __init__(self, target_temp: int = TARGET_TEMP, max_target_temp: int = MAX_TARGET_TEMP):
+        self.target_temp = target_temp
+        self.max_target_temp = max_target_temp
         self.water_limit: float = 40
         self.low_water_limit: float = 20
         self.min_price: float = 0
         self.dt: datetime = datetime.now()
+        self._table = PriceTable()
+        self._selected: int = -1
 
 
     def get_next_start(self, model: NextStartPostModel) -> NextStartExportModel:
@@ -67,17 +65,17 @@ class NextWaterBoost:
         self.dt = model.dt
         self.min_price = model.min_price
 
-        data = self.get_data(model)
-        selected = self.get_selected(data)
-        if selected is None:
+        self._shift_after_recent_boost(model)
+        table = self._fill_table(model, stop_after_selection=True)
+        if self._selected < 0:
             return NextStartExportModel(datetime.max, None)
-        filtered = self.get_filtered(data, selected)
-        selected = self.get_final_selected(filtered, selected)
-        return NextStartExportModel(selected.time, selected.target_temp)
+        selected = self._get_final_selected(table, self._selected)
+        return NextStartExportModel(table.time(selected), table.target[selected])
    
     @staticmethod
-    def _calculate_target_temp_for_hour(temp_at_time: float, is_demand: bool, price: float, price_spread:float, min_price:float) -> int:
-        target = TARGET_TEMP if price > min_price else MAX_TARGET_TEMP
+    def _calculate_target_temp_for_hour(temp_at_time: float, is_demand: bool, price: float, price_spread:float, min_price:float,
+                                        target_temp: int = TARGET_TEMP, max_target_temp: int = MAX_TARGET_TEMP) -> int:
+        target = target_temp if price > min_price else max_target_temp
         if int(target - temp_at_time) <= 0:
             return target
 
@@ -94,79 +92,116 @@ class NextWaterBoost:
 
         return min(int(temp_at_time+add_temp), target)
 
+    def _fill_table(self, model: NextStartPostModel, stop_after_selection: bool = False) -> PriceTable:
+        """
+        Fills the per-slot feature table in one pass and records the first candidate row in self._selected.
+        The spread of each slot is measured against the mean of the remaining prices, taken from suffix sums
+        so the table is linear in the number of slots. With stop_after_selection the table ends once the
+        selection window after the first candidate has passed.
+        """
+        resolution = model.resolution
+        minutes = resolution.minutes
+        origin = resolution.index_of(self.dt)
+        first = origin
+        prices = model.prices
+        n = len(prices)
+        demand_hours = model.demand_hours
+        non_hours = model.non_hours
+        start_of_day = self.dt.replace(hour=0, minute=0, second=0, microsecond=0)
+        reset_minute = self.dt.hour * 60
+        lead = BOOST_LEAD.seconds // 60
+        slot_length = timedelta(minutes=minutes)
+        while first < n and (first + 1) * minutes - lead < reset_minute:
+            first += 1
+        table = self._table
+        table.reset(n, start_of_day + slot_length * (first + 1) - BOOST_LEAD, slot_length)
+        self._selected = -1
+        if first >= n:
+            return table
+        self._suffix_means(prices, table.suffix_mean)
+        first_delay = (table.first_time - self.dt).total_seconds()
+        slot_seconds = slot_length.seconds
+        window = FILTER_WINDOW // slot_length
+        heat_loss = model.heat_loss if model.heat_loss is not None and model.heat_loss.is_ready else None
+        current_temp, temp_trend, min_price = model.current_temp, model.temp_trend, model.min_price
+        for idx in range(first, n):
+            row = idx - first
+            if stop_after_selection and 0 <= self._selected < row - window:
+                break
+            p = prices[idx]
+            delay = (first_delay + slot_seconds * row) / 3600
+            if heat_loss is not None:
+                temp_at_time = max(10, round(heat_loss.temperature_after(current_temp, delay), 1))
+            else:
+                temp_at_time = max(10, round(current_temp + delay * temp_trend, 1))
+            price_spread = round(p / table.suffix_mean[idx - origin], 2)
+            second_hour = (idx * minutes // 60 + 1) % 24
+            is_demand = second_hour in demand_hours
+            flags = DEMAND if is_demand else 0
+            if self._calculate_is_cold(temp_at_time, second_hour, model, p, prices[idx + 1] if idx + 1 < n else 9999,
+                                       demand_hours):
+                flags |= COLD
+            if (((idx + 1) * minutes - lead) // 60) % 24 in non_hours or second_hour in non_hours:
+                flags |= NON
+            target = self._calculate_target_temp_for_hour(temp_at_time, is_demand, p, price_spread, min_price,
+                                                          self.target_temp, self.max_target_temp)
+            table.append(p, price_spread, temp_at_time, flags, target)
+            if self._selected < 0 and self._is_candidate(table, row):
+                self._selected = row
+        return table
+
     @staticmethod
-    def _get_temperature_at_datetime(now_dt, target_dt, current_temp, temp_trend) -> float:
-        delay = (target_dt - now_dt).total_seconds() / 3600
-        return max(10,round(current_temp + (delay * temp_trend), 1))
-
-    def _add_data_list(self, model: NextStartPostModel) -> list:
-        data = []
-        for idx, p in enumerate(model.prices[self.dt.hour:], start=self.dt.hour):
-            new_hour = (self.dt + timedelta(hours=idx - self.dt.hour)).replace(minute=50, second=0, microsecond=0)
-            second_hour = (self.dt + timedelta(hours=idx - self.dt.hour + 1))
-            temp_at_time = self._get_temperature_at_datetime(self.dt, new_hour, model.current_temp, model.temp_trend)
-            if new_hour < self.reset_hour(self.dt):
-                continue
-            data.append(PriceData(
-                p,
-                round(p / mean(model.prices[idx - self.dt.hour:]), 2),
-                new_hour,
-                temp_at_time,
-                self._calculate_is_cold(temp_at_time, second_hour, model, p,
-                                        model.prices[idx + 1] if idx + 1 < len(model.prices) else 9999),
-                second_hour.hour in model.demand_hours,
-                new_hour.hour in model.non_hours or second_hour.hour in model.non_hours,
-                self._calculate_target_temp_for_hour(temp_at_time, second_hour.hour in model.demand_hours, p,
-                                                     round(p / mean(model.prices[idx - self.dt.hour:]), 2),
-                                                     model.min_price)
-            ))
-        return data
-
-    def _calculate_is_cold(self, temp_at_time: float, second_hour: datetime, model: NextStartPostModel, p: float, p2: float) -> bool:
+    def _suffix_means(prices: list, ret) -> None:
+        """Writes the mean of prices[i:] to ret[i] for every i, in linear time."""
+        total = 0.0
+        for i in range(len(prices) - 1, -1, -1):
+            total += prices[i]
+            ret[i] = total / (len(prices) - i)
+
+    def _calculate_is_cold(self, temp_at_time: float, second_hour: int, model: NextStartPostModel, p: float, p2: float, demand_hours) -> bool:
         calculated_water_limit = self.water_limit
         if p < model.min_price and p2 < self.min_price:
             return temp_at_time <= calculated_water_limit+5
-        if second_hour.hour in model.demand_hours:
+        if second_hour in demand_hours:
             return temp_at_time <= calculated_water_limit+2
         return temp_at_time <= calculated_water_limit
 
 
-    @staticmethod
-    def reset_hour(dt) -> datetime:
-        return dt.replace(minute=0,second=0,microsecond=0)
-
-    def get_data(self, model: NextStartPostModel) -> list:
+    def _shift_after_recent_boost(self, model: NextStartPostModel) -> None:
         if model.latest_boost is not None:
             if self.dt - model.latest_boost < timedelta(hours=1):
                 self.dt = self.dt+timedelta(hours=1)
-        data = self._add_data_list(model)
-        return data
-
-    def get_selected(self, data: list) -> PriceData:
-        selected: PriceData = None
-        for d in data:
-            if all([
-                d.is_cold,
-                (d.price_spread < 1 or d.price < self.min_price or (d.is_demand or d.water_temp < d.target_temp)),
-                not d.is_non,
-                d.time >= self.reset_hour(self.dt)
-                ]):
-                selected = d
-                break
-        return selected
 
-    def get_filtered(self, data: list, selected: PriceData) -> list:
-        return [d for d in data if max(d.time, selected.time) - min(d.time, selected.time) <= timedelta(hours=2) and d.time >= self.reset_hour(self.dt)]
-
-    def get_final_selected(self, filtered: list, selected: PriceData) -> PriceData:
-        for fdemand in [d for d in filtered if d.is_demand and not d.is_non]:
-            if fdemand.is_cold and fdemand.price_spread < selected.price_spread:
-                selected = fdemand
-                _LOGGER.debug("final selected chose a demandhour", selected)
-                return selected
-
-        for d in sorted(filtered, key=lambda x: (not x.is_demand, x.price_spread)):
-            if not d.is_non and d.price_spread < selected.price_spread and not selected.is_demand and not selected.water_temp < self.low_water_limit:
-                selected = d
-                break
-        return selected
+    def get_data(self, model: NextStartPostModel) -> list[PriceData]:
+        self._shift_after_recent_boost(model)
+        return self._fill_table(model).rows()
+
+    def _is_candidate(self, table: PriceTable, row: int) -> bool:
+        flags = table.flags[row]
+        return all([
+            flags & COLD,
+            (table.spread[row] < 1 or table.price[row] < self.min_price
+             or (flags & DEMAND or table.water_temp[row] < table.target[row])),
+            not flags & NON,
+        ])
+
+    def _get_final_selected(self, table: PriceTable, selected: int) -> int:
+        """Moves the selection to a cheaper row within FILTER_WINDOW of it, preferring demand hours."""
+        window = FILTER_WINDOW // table.slot_length
+        lo, hi = max(0, selected - window), min(table.size, selected + window + 1)
+        flags, spread = table.flags, table.spread
+        selected_spread = spread[selected]
+        for r in range(lo, hi):
+            if flags[r] & DEMAND and not flags[r] & NON and flags[r] & COLD and spread[r] < selected_spread:
+                _LOGGER.debug("final selected chose a demandhour %s", r)
+                return r
+
+        if flags[selected] & DEMAND or table.water_temp[selected] < self.low_water_limit:
+            return selected
+        best, best_key = selected, None
+        for r in range(lo, hi):
+            if not flags[r] & NON and spread[r] < selected_spread:
+                key = (not flags[r] & DEMAND, spread[r])
+                if best_key is None or key < best_key:
+                    best, best_key = r, key
+        return best
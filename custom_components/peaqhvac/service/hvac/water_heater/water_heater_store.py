@@ -0,0 +1,47 @@
+import logging
+from typing import Callable
+
+from homeassistant.helpers.storage import Store
+
+from custom_components.peaqhvac.const import DOMAIN
+from custom_components.peaqhvac.service.hvac.water_heater.models.water_heater_state import WaterHeaterState
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.water_heater"
+SAVE_DELAY = 30
+
+
+class WaterHeaterStore:
+    """
+    Persists the water heater state in .storage. Changes are written in batches: every change within
+    SAVE_DELAY seconds of the first ends up in one write, and Home Assistant flushes a pending write on stop.
+    """
+    def __init__(self, hass, key: str = STORAGE_KEY):
+        self._store = Store(hass, STORAGE_VERSION, key)
+        self._pending: bool = False
+
+    async def async_load(self) -> WaterHeaterState | None:
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning(f"Unable to load stored water heater state: {e}")
+            return None
+        if not data:
+            return None
+        return WaterHeaterState.from_dict(data)
+
+    def schedule_save(self, state_func: Callable[[], WaterHeaterState]) -> None:
+        if self._pending:
+            return
+        self._pending = True
+
+        def _data() -> dict:
+            self._pending = False
+            return state_func().to_dict()
+        self._store.async_delay_save(_data, SAVE_DELAY)
+
+    async def async_save(self, state: WaterHeaterState) -> None:
+        self._pending = False
+        await self._store.async_save(state.to_dict())
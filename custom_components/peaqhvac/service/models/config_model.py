@@ -8,6 +8,8 @@ from custom_components.peaqhvac.const import (HVACBRAND_IVT, HVACBRAND_NIBE,
                                               HVACBRAND_THERMIA)
 from custom_components.peaqhvac.service.models.enums.hvacbrands import \
     HvacBrand
+from custom_components.peaqhvac.service.models.enums.offset_planning_mode import OffsetPlanningMode
+from custom_components.peaqhvac.service.models.enums.water_boost_planning_mode import WaterBoostPlanningMode
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +36,9 @@ class ConfigModel:
     hvacbrand: HvacBrand = field(init=False)
     systemid: str = field(init=False)
     weather_entity: str|None = None
+    offset_planning_mode: OffsetPlanningMode = OffsetPlanningMode.Heuristic
+    water_boost_planning_mode: WaterBoostPlanningMode = WaterBoostPlanningMode.Greedy
+    concurrent_observer: bool = False
     _hvac_tolerance: int = None
     hub = None
 
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class OffsetPlanningMode(Enum):
+    Heuristic = "heuristic"
+    Optimized = "optimized"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class WaterBoostPlanningMode(Enum):
+    Greedy = "greedy"
+    Horizon = "horizon"
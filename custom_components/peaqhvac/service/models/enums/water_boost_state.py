@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class WaterBoostState(Enum):
+    Idle = "Idle"
+    Boosting = "Boosting"
+    CoolingDown = "Cooling down"
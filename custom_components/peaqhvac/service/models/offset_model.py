@@ -4,6 +4,8 @@ from datetime import timedelta, datetime
 
 from peaqevcore.common.models.observer_types import ObserverTypes
 
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -17,6 +19,7 @@ class OffsetModel:
     prognosis = None
     _tolerance_difference: int = 0
     _outdoor_temp: int|None = None
+    resolution: SlotResolution = SlotResolution()
 
     def __init__(self, hub):
         self.hub = hub
@@ -34,7 +37,7 @@ class OffsetModel:
 
     @peaks_today.setter
     def peaks_today(self, val: list):
-        self._peaks_today = [v for v in val if 0 <= v < 24]
+        self._peaks_today = [v for v in val if 0 <= v < self.resolution.slots_per_day]
 
     @property
     def peaks_tomorrow(self) -> list:
@@ -42,7 +45,15 @@ class OffsetModel:
 
     @peaks_tomorrow.setter
     def peaks_tomorrow(self, val: list):
-        self._peaks_tomorrow = [v for v in val if 0 <= v < 24]
+        self._peaks_tomorrow = [v for v in val if 0 <= v < self.resolution.slots_per_day]
+
+    def apply_plan(self, plan) -> None:
+        """Replaces peaks and offsets together so readers never see a half-updated model"""
+        self.resolution = plan.resolution
+        self.peaks_today = plan.peaks_today
+        self.peaks_tomorrow = plan.peaks_tomorrow
+        self.raw_offsets = plan.raw_offsets
+        self.calculated_offsets = plan.calculated_offsets
 
     @property
     def tolerance(self) -> int:
@@ -2,9 +2,12 @@ from typing import Tuple, List, Dict
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
+
 @dataclass
 class OffsetsExportModel:
     peaks: Tuple[List, List]
+    resolution: SlotResolution = field(default_factory=SlotResolution)
     _raw_offsets: List[int] = field(default_factory=list)
     _current_offset: List[int] = field(default_factory=list)
     _current_offset_tomorrow: List[int] = field(default_factory=list)
@@ -21,10 +24,11 @@ class OffsetsExportModel:
 
     @property
     def current_raw_offset(self) -> int:
-        """Returns the current raw offset based on the current hour."""
-        if not self._raw_offsets:
+        """Returns the current raw offset based on the current slot."""
+        idx = self.resolution.index_of(datetime.now())
+        if idx >= len(self._raw_offsets):
             return 0
-        return self._raw_offsets[datetime.now().hour]
+        return self._raw_offsets[idx]
 
     @property
     def current_offset(self) -> List[int]:
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+QUARTER_HOUR_LENGTHS = (92, 96, 100, 188, 192, 196)
+
+
+@dataclass(frozen=True)
+class SlotResolution:
+    """Length of a price slot. Offsets, peaks and exports are indexed by slot from midnight today."""
+    minutes: int = 60
+
+    @staticmethod
+    def from_prices(prices: list) -> "SlotResolution":
+        return SlotResolution(15) if len(prices) in QUARTER_HOUR_LENGTHS else SlotResolution(60)
+
+    @property
+    def slots_per_hour(self) -> int:
+        return 60 // self.minutes
+
+    @property
+    def slots_per_day(self) -> int:
+        return 24 * self.slots_per_hour
+
+    def index_of(self, dt: datetime) -> int:
+        return (dt.hour * 60 + dt.minute) // self.minutes
+
+    def slot_of_hour(self, hour: int) -> int:
+        return hour * self.slots_per_hour
+
+    def hour_of(self, idx: int) -> int:
+        return (idx // self.slots_per_hour) % 24
@@ -1,2 +1,5 @@
+from peaqevcore.common.models.observer_types import ObserverTypes
+
 COMMAND_WAIT = 3
 TIMEOUT = 10
+COALESCED_COMMANDS = {ObserverTypes.TemperatureOutdoorsChanged}
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import inspect
+import logging
+from inspect import Parameter
+from typing import Any, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+_POSITIONAL = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+_KEYWORD = (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+
+
+def compile_invoker(func: Callable) -> Callable[[Any], Any]:
+    """
+    Inspects the signature of a subscriber once and returns invoke(argument) that calls it the way it accepts:
+    without arguments, with the argument as its single positional, or with a dict argument as keyword arguments.
+    An argument the subscriber cannot take is dropped and it is called without arguments, as before.
+    """
+    try:
+        parameters = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        _LOGGER.debug(f"Unable to inspect the signature of {func}. Passing the argument positionally.")
+        parameters = [Parameter("argument", Parameter.POSITIONAL_ONLY)]
+    if not parameters:
+        return _no_arg_invoker(func)
+
+    required = [p for p in parameters if p.default is p.empty and p.kind not in (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD)]
+    takes_positional = any(p.kind in _POSITIONAL or p.kind is Parameter.VAR_POSITIONAL for p in parameters)
+    takes_one = takes_positional and len(required) <= 1 and all(p.kind in _POSITIONAL for p in required)
+    takes_any_keyword = any(p.kind is Parameter.VAR_KEYWORD for p in parameters)
+    keywords = frozenset(p.name for p in parameters if p.kind in _KEYWORD)
+    required_keywords = frozenset(p.name for p in required if p.kind in _KEYWORD)
+    takes_keywords = all(p.kind in _KEYWORD for p in required)
+
+    def _takes(argument: dict) -> bool:
+        return (takes_keywords and required_keywords <= argument.keys()
+                and (takes_any_keyword or argument.keys() <= keywords))
+
+    def invoke(argument: Any) -> Any:
+        if argument is None:
+            return func()
+        if isinstance(argument, dict):
+            return func(**argument) if _takes(argument) else func()
+        return func(argument) if takes_one else func()
+    return invoke
+
+
+def _no_arg_invoker(func: Callable) -> Callable[[Any], Any]:
+    def invoke(argument: Any) -> Any:
+        return func()
+    return invoke
@@ -9,11 +9,12 @@ from typing import Callable
 from peaqevcore.common.models.observer_types import ObserverTypes
 
 from custom_components.peaqhvac.service.observer.const import (
-    COMMAND_WAIT)
+    COMMAND_WAIT, TIMEOUT)
 from custom_components.peaqhvac.service.observer.models.command import \
     Command
 from custom_components.peaqhvac.service.observer.models.observer_model import \
     ObserverModel
+from custom_components.peaqhvac.service.observer.models.subscriber import Subscriber
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,9 +27,14 @@ class IObserver:
     Observer class handles updates throughout peaq.
     Attach to hub class and subscribe to updates (string matches) in other classes connected to the hub.
     When broadcasting, you may use one argument that the of-course needs to correspond to your receiving function.
+    Sync subscribers run inline on the event loop and must be cheap. Add blocking work with blocking=True
+    to have it run in the executor instead.
+    Commands are dispatched one at a time in order. With concurrent=True the subscribers of a command run
+    together as a task group, each within its own timeout and with its errors contained.
     """
-    def __init__(self):
+    def __init__(self, concurrent: bool = False):
         self.model = ObserverModel()
+        self.concurrent = concurrent
         self._dequeue_lock = asyncio.Lock()
         self._dispatch_lock = asyncio.Lock()
 
@@ -51,12 +57,16 @@ class IObserver:
                 #return ObserverTypes.Test
         return command
 
-    def add(self, command: ObserverTypes|str, func):
+    def add(self, command: ObserverTypes|str, func, timeout: float = TIMEOUT, blocking: bool = False):
         command = self._check_and_convert_enum_type(command)
+        subscriber = Subscriber(func, timeout, blocking)
         if command in self.model.subscribers.keys():
-            self.model.subscribers[command].append(func)
+            self.model.subscribers[command].append(subscriber)
         else:
-            self.model.subscribers[command] = [func]
+            self.model.subscribers[command] = [subscriber]
+            for q in self.model.broadcast_queue:
+                if q.command == command:
+                    self._notify(q)
 
     async def async_broadcast(self, command: ObserverTypes|str, argument=None):
         self.broadcast(command, argument)
@@ -65,81 +75,97 @@ class IObserver:
         command = self._check_and_convert_enum_type(command)
         _expiration = time.time() + COMMAND_VALIDITY
         cc = Command(command, _expiration, argument)
-        if cc not in self.model.broadcast_queue:
-            if cc not in self.model.dispatch_delay_queue.keys():
-                self.model.dispatch_delay_queue[cc] = time.time()
-                _LOGGER.debug(f"received broadcast: {command} - {argument}")
-                self.model.broadcast_queue.append(cc)
+        if command in self.model.broadcast_queue.coalesced:
+            # state-like commands skip the delay: the latest value must win even if it was seen a moment ago
+            if self.model.broadcast_queue.add(cc):
+                self._notify(cc)
+        elif cc not in self.model.dispatch_delay_queue:
+            self.model.dispatch_delay_queue[cc] = time.time()
+            _LOGGER.debug(f"received broadcast: {command} - {argument}")
+            if self.model.broadcast_queue.add(cc):
+                self._notify(cc)
         #     else:
         #         _LOGGER.debug(f"Command {command} with argument {argument} is already in dispatch_delay_queue: {self.model.dispatch_delay_queue[cc]}")
         # else:
         #     _LOGGER.debug(
         #         f"Command {command} with argument {argument} is already in broadcast_queue: {[q for q in self.model.broadcast_queue if q == cc]}")
 
+    def _notify(self, command: Command) -> None:
+        """Called when a command is queued or gets its first subscriber. Dispatchers that wake on enqueue override this."""
+        pass
+
+    def coalesce(self, command: ObserverTypes|str) -> None:
+        """Lets a newer broadcast of a state-like command replace its pending payload instead of queueing behind it."""
+        self.model.broadcast_queue.coalesced.add(self._check_and_convert_enum_type(command))
+
+    async def async_dispatch_command(self, command: Command) -> None:
+        """Dispatches one queued command. Commands without subscribers stay queued until one is added."""
+        pending = self.model.broadcast_queue.get(command)
+        if pending is not None and pending.command in self.model.subscribers.keys():
+            await self.async_dequeue_and_broadcast(pending)
+
     async def async_dispatch(self, *args):
         q: Command
         for q in self.model.broadcast_queue:
-            if q.command in self.model.subscribers.keys():
+            if self.model.broadcast_queue.get(q) is q and q.command in self.model.subscribers.keys():
                 await self.async_dequeue_and_broadcast(q)
 
     async def async_dequeue_and_broadcast(self, command: Command):
         #if await self.async_ok_to_broadcast(command):
         async with self._dequeue_lock:
             await self.async_update_dispatch_delay(command)
-            for func in self.model.subscribers.get(command.command, []):
-                _LOGGER.debug(f"broadcasting {command.command} with {command.argument}")
-                await self.async_broadcast_separator(func, command)
-            if command in self.model.broadcast_queue:
+            if self.model.broadcast_queue.get(command) is command:
                 self.model.broadcast_queue.remove(command)
+            subscribers = list(self.model.subscribers.get(command.command, []))
+            if self.concurrent:
+                async with asyncio.TaskGroup() as group:
+                    for subscriber in subscribers:
+                        group.create_task(self._async_broadcast_isolated(subscriber, command))
+                return
+            for subscriber in subscribers:
+                _LOGGER.debug(f"broadcasting {command.command} with {command.argument}")
+                await self.async_broadcast_separator(subscriber, command)
+
+    async def _async_broadcast_isolated(self, subscriber: Subscriber, command: Command) -> None:
+        """Runs one subscriber within its timeout. Never raises, so one subscriber cannot cancel the others."""
+        try:
+            async with asyncio.timeout(subscriber.timeout):
+                await self.async_broadcast_separator(subscriber, command)
+        except TimeoutError:
+            _LOGGER.warning(f"{subscriber.func} did not handle {command.command} within {subscriber.timeout}s")
+        except Exception as e:
+            _LOGGER.error(f"{subscriber.func} failed to handle {command.command}: {e}")
 
     async def async_update_dispatch_delay(self, command: Command):
         async with self._dispatch_lock:
-            q: Command
-            old_items = [k for k, v in self.model.dispatch_delay_queue.items() if time.time() - v > DISPATCH_DELAY_TIMEOUT]
-            for old in old_items:
-                self.model.dispatch_delay_queue.pop(old)
-                #_LOGGER.debug(f"removed {old} from dispatch_delay_queue")
+            delays = self.model.dispatch_delay_queue
+            now = time.time()
+            # entries are inserted in time order, so the expired ones are at the front
+            while delays:
+                oldest = next(iter(delays))
+                if now - delays[oldest] <= DISPATCH_DELAY_TIMEOUT:
+                    break
+                delays.pop(oldest)
             # if command not in self.model.dispatch_delay_queue.keys():
             #     self.model.dispatch_delay_queue[command] = time.time()
 
     @abstractmethod
-    async def async_broadcast_separator(self, func, command):
+    async def async_broadcast_separator(self, subscriber: Subscriber, command: Command):
         pass
 
     @staticmethod
-    def _call_func(func: Callable, command: Command) -> None:
-        if command.argument is not None:
-            if isinstance(command.argument, dict):
-                try:
-                    func(**command.argument)
-                except TypeError:
-                    func()
-            else:
-                try:
-                    func(command.argument)
-                except TypeError:
-                    func()
-        else:
-            func()
+    def _call_func(subscriber: Subscriber, command: Command) -> None:
+        try:
+            subscriber.invoke(command.argument)
+        except Exception as e:
+            _LOGGER.error(f"_call_func for {subscriber.func} with command {command}: {e}")
 
     @staticmethod
-    async def async_call_func(func: Callable, command: Command) -> None:
+    async def async_call_func(subscriber: Subscriber, command: Command) -> None:
         try:
-            if command.argument is not None:
-                if isinstance(command.argument, dict):
-                    try:
-                        await func(**command.argument)
-                    except TypeError:
-                        await func()
-                else:
-                    try:
-                        await func(command.argument)
-                    except TypeError:
-                        await func()
-            else:
-                await func()
+            await subscriber.invoke(command.argument)
         except Exception as e:
-            _LOGGER.error(f"async_call_func for {func} with command {command}: {e}")
+            _LOGGER.error(f"async_call_func for {subscriber.func} with command {command}: {e}")
 
     # async def async_ok_to_broadcast(self, command: Command) -> bool:
     #     if command not in self.model.wait_queue.keys():
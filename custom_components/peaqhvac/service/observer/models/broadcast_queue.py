@@ -0,0 +1,46 @@
+from custom_components.peaqhvac.service.observer.models.command import Command
+
+COALESCED = object()
+
+
+class BroadcastQueue:
+    """
+    Pending commands keyed by (command, argument fingerprint) in insertion order, so enqueue, lookup and
+    removal are O(1). Commands registered as coalesced are keyed by command only: a newer payload replaces
+    the pending one in its place in the queue. Iteration walks a snapshot, so the queue may change meanwhile.
+    """
+    def __init__(self, coalesced=()):
+        self._items: dict[tuple, Command] = {}
+        self.coalesced: set = set(coalesced)
+
+    def key(self, command: Command) -> tuple:
+        if command.command in self.coalesced:
+            return command.command, COALESCED
+        return command.command, command.fingerprint
+
+    def add(self, command: Command) -> bool:
+        """Queues the command. Returns False for a duplicate; a coalesced command replaces the pending payload."""
+        key = self.key(command)
+        pending = self._items.get(key)
+        if pending is None:
+            self._items[key] = command
+            return True
+        if key[1] is COALESCED and pending != command:
+            self._items[key] = command
+        return False
+
+    def get(self, command: Command) -> Command | None:
+        """The pending command under the same key, which for a coalesced command carries the latest payload."""
+        return self._items.get(self.key(command))
+
+    def remove(self, command: Command) -> None:
+        self._items.pop(self.key(command), None)
+
+    def __contains__(self, command: Command) -> bool:
+        return self.key(command) in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(tuple(self._items.values()))
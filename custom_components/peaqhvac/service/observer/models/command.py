@@ -1,28 +1,41 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from peaqevcore.common.models.observer_types import ObserverTypes
 
 
+def make_hashable(obj):
+    if isinstance(obj, (tuple, list)):
+        return tuple(make_hashable(e) for e in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted((k, make_hashable(v)) for k, v in obj.items()))
+    if isinstance(obj, set):
+        return tuple(sorted(make_hashable(e) for e in obj))
+    return obj
+
+
+def fingerprint(argument):
+    """A hashable stand-in for an argument. Hashable arguments are used as they are."""
+    try:
+        hash(argument)
+        return argument
+    except TypeError:
+        return make_hashable(argument)
+
+
 @dataclass
 class Command:
     command: ObserverTypes
     expiration: float = None
     argument: any = None
+    fingerprint: any = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.fingerprint = fingerprint(self.argument)
 
     def __eq__(self, other):
-        if all([self.command == other.command, self.argument == other.argument]):
+        if all([self.command == other.command, self.fingerprint == other.fingerprint]):
             return True
         return False
 
     def __hash__(self):
-        def make_hashable(obj):
-            if isinstance(obj, (tuple, list)):
-                return tuple(make_hashable(e) for e in obj)
-            if isinstance(obj, dict):
-                return tuple(sorted((k, make_hashable(v)) for k, v in obj.items()))
-            if isinstance(obj, set):
-                return tuple(sorted(make_hashable(e) for e in obj))
-            return obj
-
-        return hash((self.command, make_hashable(self.argument)))
-
+        return hash((self.command, self.fingerprint))
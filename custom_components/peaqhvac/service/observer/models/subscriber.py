@@ -0,0 +1,19 @@
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from custom_components.peaqhvac.service.observer.const import TIMEOUT
+from custom_components.peaqhvac.service.observer.invoker import compile_invoker
+
+
+@dataclass
+class Subscriber:
+    func: Callable
+    timeout: float = TIMEOUT
+    blocking: bool = False
+    is_async: bool = field(init=False, compare=False)
+    invoke: Callable[[Any], Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.is_async = inspect.iscoroutinefunction(self.func)
+        self.invoke = compile_invoker(self.func)
@@ -1,28 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
 
-from homeassistant.helpers.event import async_track_time_interval
 from custom_components.peaqhvac.service.observer.iobserver_coordinator import IObserver
 from custom_components.peaqhvac.service.observer.models.command import Command
-from custom_components.peaqhvac.extensionmethods import async_iscoroutine
+from custom_components.peaqhvac.service.observer.models.subscriber import Subscriber
+from custom_components.peaqhvac.service.observer.queue_dispatcher import QueueDispatcher
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class Observer(IObserver):
-    def __init__(self, hass):
-        super().__init__()
+    def __init__(self, hass, concurrent: bool = False):
+        super().__init__(concurrent)
         self.hass = hass
-        async_track_time_interval(
-            self.hass, self.async_dispatch, timedelta(seconds=1)
-        )
+        self.dispatcher = QueueDispatcher(hass, self.async_dispatch_command)
 
-    async def async_broadcast_separator(self, func, command: Command):
-        if await async_iscoroutine(func):
-            await self.async_call_func(func=func, command=command),
-        else:
+    def broadcast(self, command, argument=None):
+        """Broadcasts on the event loop. Calls from executor threads are handed to the loop as a whole."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.hass.loop.call_soon_threadsafe(super().broadcast, command, argument)
+            return
+        super().broadcast(command, argument)
+
+    def _notify(self, command: Command) -> None:
+        self.dispatcher.put(command)
+
+    async def async_shutdown(self) -> None:
+        await self.dispatcher.async_shutdown()
+
+    async def async_broadcast_separator(self, subscriber: Subscriber, command: Command):
+        if subscriber.is_async:
+            await self.async_call_func(subscriber=subscriber, command=command)
+        elif subscriber.blocking:
             await self.hass.async_add_executor_job(
-                self._call_func, func, command
+                self._call_func, subscriber, command
             )
+        else:
+            self._call_func(subscriber, command)
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from custom_components.peaqhvac.service.observer.models.command import Command
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class QueueDispatcher:
+    """
+    Runs queued commands through a dispatch coroutine in FIFO order. The worker sleeps on an asyncio.Queue
+    and wakes as soon as a command is put, so nothing runs while there is nothing to dispatch.
+    Commands put while one is being dispatched are handled after it, in the order they were put.
+    """
+    def __init__(self, hass, dispatch: Callable[[Command], Awaitable[None]]):
+        self._hass = hass
+        self._dispatch = dispatch
+        self._queue: asyncio.Queue[Command] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, command: Command) -> None:
+        """Queues a command. Safe to call from executor threads, where the put is handed to the event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._hass.loop.call_soon_threadsafe(self.put, command)
+            return
+        self._queue.put_nowait(command)
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_background_task(self._async_run(), "peaqhvac observer dispatcher")
+
+    async def _async_run(self) -> None:
+        while True:
+            command = await self._queue.get()
+            try:
+                await self._dispatch(command)
+            except Exception as e:
+                _LOGGER.exception(f"Could not dispatch {command.command}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def async_join(self) -> None:
+        """Waits until every command put so far, and every command they caused, has been dispatched."""
+        await self._queue.join()
+
+    async def async_shutdown(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from .helpers import BENCH_ENV, BenchmarkRecorder
+
+# timing benchmarks are opt-in: PEAQHVAC_BENCH=1 python -m pytest custom_components/peaqhvac/test/benchmarks
+if os.environ.get(BENCH_ENV, "0") != "1":
+    collect_ignore_glob = ["test_bench_*.py"]
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder():
+    recorder = BenchmarkRecorder()
+    yield recorder
+    recorder.save()
+
+
+@pytest.fixture
+def benchmark(benchmark_recorder):
+    """Measures a callable under a name and fails if it regressed against the saved baseline."""
+    def _run(name: str, func, number: int = 20, repeat: int = 5) -> float:
+        ret = benchmark_recorder.measure(name, func, number=number, repeat=repeat)
+        benchmark_recorder.check(name)
+        return ret
+    return _run
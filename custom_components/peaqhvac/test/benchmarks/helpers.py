@@ -0,0 +1,140 @@
+import gc
+import json
+import os
+import time
+from pathlib import Path
+from statistics import median, quantiles
+from typing import Callable
+
+from ..test_offsets import P231213, P231214, P231215, P231216, P231217, P231218, P231219
+
+HOURLY_DAYS = [P231213, P231214, P231215, P231216, P231217, P231218, P231219]
+SLOT_COUNTS = [24, 48, 96, 192]
+
+
+def to_quarter_hours(prices: list[float]) -> list[float]:
+    """Expands an hourly price list to 15-minute slots by interpolating towards the next hour."""
+    ret = []
+    for idx, p in enumerate(prices):
+        _next = prices[idx + 1] if idx + 1 < len(prices) else p
+        ret.extend(round(p + (_next - p) * q / 4, 4) for q in range(4))
+    return ret
+
+
+def price_input(slots: int, start_day: int = 0) -> list[float]:
+    """Builds a price list with the given number of slots from the hourly fixture days."""
+    days = 2 if slots in (48, 192) else 1
+    hourly = []
+    for d in range(days):
+        hourly.extend(HOURLY_DAYS[(start_day + d) % len(HOURLY_DAYS)])
+    return hourly if slots in (24, 48) else to_quarter_hours(hourly)
+
+
+def best_of(func: Callable, number: int = 20, repeat: int = 5) -> float:
+    """Returns the fastest mean time per call in seconds over a number of repeats."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+BENCH_ENV = "PEAQHVAC_BENCH"
+BASELINE_ENV = "PEAQHVAC_BENCH_BASELINE"
+BASELINE_FILE = Path(os.environ.get(BASELINE_ENV, Path.home() / ".cache" / "peaqhvac" / "bench_baseline.json"))
+THRESHOLD_ENV = "PEAQHVAC_BENCH_THRESHOLD"
+SAVE_ENV = "PEAQHVAC_BENCH_SAVE"
+DEFAULT_THRESHOLD = 0.5
+MIN_BATCH_SECONDS = 0.005
+MIN_REPEAT = 7
+NOISE_FACTOR = 3
+
+
+def _calibration_workload() -> None:
+    values = [(i * 7919) % 1000 / 10 for i in range(2000)]
+    sorted({round(v * v, 1): v for v in values}.items())
+
+
+def _timed(func: Callable, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+class BenchmarkRecorder:
+    """
+    Measures named benchmarks relative to a fixed pure-Python calibration workload, timed interleaved with the
+    benchmark so results can be compared between machines and runs, and compares them to the saved baseline.
+    Fast functions are repeated until a timed batch lasts at least MIN_BATCH_SECONDS, so timer noise does not dominate.
+    After a warm-up batch, the result is the median of at least MIN_REPEAT batches and the noise is their interquartile
+    range relative to that median.
+    The baseline is kept per machine outside the source tree (PEAQHVAC_BENCH_BASELINE, default ~/.cache/peaqhvac)
+    and is written when it is missing, when new benchmarks appear or when PEAQHVAC_BENCH_SAVE=1.
+    A benchmark fails when it is slower than its baseline by more than PEAQHVAC_BENCH_THRESHOLD (default 0.5 = 50%),
+    or by more than NOISE_FACTOR times the noise measured in the run when that is larger.
+    """
+    def __init__(self, baseline_file: Path = BASELINE_FILE):
+        self.baseline_file = baseline_file
+        self.threshold = float(os.environ.get(THRESHOLD_ENV, DEFAULT_THRESHOLD))
+        self.force_save = os.environ.get(SAVE_ENV, "0") == "1"
+        self.baseline: dict[str, float] = self._load()
+        self.results: dict[str, float] = {}
+        self.noise: dict[str, float] = {}
+
+    def _load(self) -> dict[str, float]:
+        if self.force_save or not self.baseline_file.exists():
+            return {}
+        try:
+            return json.loads(self.baseline_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def measure(self, name: str, func: Callable, number: int = 20, repeat: int = 5) -> float:
+        _calibration_workload()
+        number = max(number, int(MIN_BATCH_SECONDS / max(_timed(func, 1), 1e-7)) + 1)
+        ratios = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            _timed(_calibration_workload, 5)
+            _timed(func, number)
+            for _ in range(max(repeat, MIN_REPEAT)):
+                calibration = _timed(_calibration_workload, 5)
+                ratios.append(_timed(func, number) / calibration)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        relative = median(ratios)
+        lower, _, upper = quantiles(ratios, n=4)
+        self.results[name] = relative
+        self.noise[name] = (upper - lower) / relative if relative > 0 else 0.0
+        print(f"{name}: {relative:.3f} calibration units (noise {self.noise[name]:.0%})")
+        return relative
+
+    def tolerance(self, name: str) -> float:
+        return max(self.threshold, NOISE_FACTOR * self.noise.get(name, 0.0))
+
+    def regression(self, name: str) -> float | None:
+        """Returns how much slower (as a fraction) the result is than its baseline, or None if there is no baseline."""
+        if name not in self.baseline or name not in self.results:
+            return None
+        return self.results[name] / self.baseline[name] - 1
+
+    def check(self, name: str) -> None:
+        regression = self.regression(name)
+        tolerance = self.tolerance(name)
+        if regression is not None and regression > tolerance:
+            raise AssertionError(
+                f"{name} regressed {regression:.0%} against baseline (tolerance {tolerance:.0%})"
+            )
+
+    def save(self) -> None:
+        new = {k: v for k, v in self.results.items() if k not in self.baseline}
+        if not self.force_save and not new:
+            return
+        merged = {**self.baseline, **(self.results if self.force_save else new)}
+        self.baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        self.baseline_file.write_text(json.dumps(merged, indent=2, sort_keys=True))
@@ -0,0 +1,71 @@
+import pytest
+
+from ...service.observer.models.broadcast_queue import BroadcastQueue
+from ...service.observer.models.command import Command, make_hashable
+from .helpers import best_of
+
+PENDING = [10, 1000]
+
+
+class LegacyCommand(Command):
+    """The command as it was: every hash walks the argument and equality compares arguments."""
+    def __eq__(self, other):
+        return self.command == other.command and self.argument == other.argument
+
+    def __hash__(self):
+        return hash((self.command, make_hashable(self.argument)))
+
+
+def _legacy_enqueue(queue: list, dispatch_delay: dict, cc: Command) -> None:
+    if cc not in queue:
+        if cc not in dispatch_delay:
+            dispatch_delay[cc] = 0
+            queue.append(cc)
+
+
+def _indexed_enqueue(queue: BroadcastQueue, dispatch_delay: dict, cc: Command) -> None:
+    if cc not in dispatch_delay:
+        dispatch_delay[cc] = 0
+        queue.add(cc)
+
+
+def _fill(pending: int, legacy: bool):
+    cls = LegacyCommand if legacy else Command
+    queue = [] if legacy else BroadcastQueue()
+    for i in range(pending):
+        cc = cls(f"command {i}", argument={"value": i})
+        if legacy:
+            queue.append(cc)
+        else:
+            queue.add(cc)
+    return queue, cls
+
+
+def _enqueue_and_remove(pending: int, legacy: bool):
+    queue, cls = _fill(pending, legacy)
+
+    def _run():
+        delays = {}
+        for i in range(20):
+            cc = cls("broadcast", argument={"value": i})
+            if legacy:
+                _legacy_enqueue(queue, delays, cc)
+                queue.remove(cc)
+            else:
+                _indexed_enqueue(queue, delays, cc)
+                queue.remove(cc)
+    return _run
+
+
+@pytest.mark.parametrize("pending", PENDING)
+def test_bench_broadcast_queue(benchmark, pending):
+    benchmark(f"broadcast_queue[{pending}]", _enqueue_and_remove(pending, legacy=False), number=20, repeat=5)
+
+
+def test_indexed_queue_does_not_grow_with_pending_commands():
+    small = best_of(_enqueue_and_remove(PENDING[0], legacy=False), number=20, repeat=5)
+    large = best_of(_enqueue_and_remove(PENDING[-1], legacy=False), number=20, repeat=5)
+    legacy = best_of(_enqueue_and_remove(PENDING[-1], legacy=True), number=5, repeat=3)
+    print(f"20 broadcasts with {PENDING[-1]} pending: indexed {large * 1000:.3f} ms, list {legacy * 1000:.3f} ms")
+    assert large < small * 2
+    assert large * 10 < legacy
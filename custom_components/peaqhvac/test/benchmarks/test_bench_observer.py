@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+
+from ...service.observer.iobserver_coordinator import IObserver
+from ...service.observer.observer_coordinator import Observer
+from ..test_observer import FakeHass
+
+POLL_INTERVAL = 1
+CASCADE = ["PricesChanged", "OffsetRecalculation", "OffsetsChanged", "UpdateOperation"]
+
+
+class PollingObserver(Observer):
+    """The observer as it was: commands wait in the queue until a dispatch every POLL_INTERVAL seconds."""
+    def __init__(self, hass):
+        super().__init__(hass)
+        self._poller: asyncio.Task | None = None
+
+    def _notify(self, command) -> None:
+        if self._poller is None:
+            self._poller = asyncio.get_running_loop().create_task(self._async_poll())
+
+    async def _async_poll(self) -> None:
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            await self.async_dispatch()
+
+    async def async_shutdown(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+
+
+async def _cascade_latency(observer: IObserver) -> float:
+    """Seconds from the first broadcast of the cascade until the last subscriber ran."""
+    done = asyncio.Event()
+    for current, following in zip(CASCADE, CASCADE[1:]):
+        async def _forward(following=following):
+            await observer.async_broadcast(following)
+        observer.add(current, _forward)
+
+    async def _last():
+        done.set()
+    observer.add(CASCADE[-1], _last)
+    start = time.perf_counter()
+    observer.broadcast(CASCADE[0])
+    await asyncio.wait_for(done.wait(), timeout=POLL_INTERVAL * (len(CASCADE) + 2))
+    ret = time.perf_counter() - start
+    await observer.async_shutdown()
+    return ret
+
+
+@pytest.mark.asyncio
+async def test_event_driven_cascade_latency():
+    event_driven = min([await _cascade_latency(Observer(FakeHass())) for _ in range(5)])
+    polling = await _cascade_latency(PollingObserver(FakeHass()))
+    print(f"{len(CASCADE)}-step cascade: event driven {event_driven * 1000:.2f} ms, polling {polling * 1000:.0f} ms")
+    assert event_driven < 0.01
+    assert polling > POLL_INTERVAL * 0.5
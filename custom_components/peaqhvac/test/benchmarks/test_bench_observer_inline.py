@@ -0,0 +1,67 @@
+import asyncio
+from statistics import median
+
+from ...service.observer.models.command import Command
+from ...service.observer.models.subscriber import Subscriber
+from ...service.observer.observer_coordinator import Observer
+from ..test_observer import FakeHass
+
+BROADCASTS = 100
+
+
+class ExecutorObserver(Observer):
+    """The observer as it was: every sync subscriber is sent to the executor."""
+    async def async_broadcast_separator(self, subscriber: Subscriber, command: Command):
+        if subscriber.is_async:
+            await self.async_call_func(subscriber=subscriber, command=command)
+        else:
+            await self.hass.async_add_executor_job(self._call_func, subscriber, command)
+
+
+class Model:
+    """Stands in for OffsetModel: two cheap sync subscribers on the outdoor temperature."""
+    def __init__(self, observer: Observer):
+        self.outdoor_temp = None
+        self.tolerance = 0
+        observer.add("outdoor temp", self.set_outdoor_temp)
+        observer.add("outdoor temp", self.recalculate_tolerance)
+
+    def set_outdoor_temp(self, val):
+        self.outdoor_temp = val
+
+    def recalculate_tolerance(self):
+        self.tolerance = 3 if (self.outdoor_temp or 0) < 0 else 2
+
+
+def _broadcasts(cls) -> tuple:
+    """Returns (seconds, executor jobs) per broadcast."""
+    async def _run():
+        hass = FakeHass()
+        observer = cls(hass)
+        Model(observer)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i in range(BROADCASTS):
+            await observer.async_broadcast("outdoor temp", i - 50)
+            await observer.dispatcher.async_join()
+        elapsed = loop.time() - start
+        await observer.async_shutdown()
+        return elapsed / BROADCASTS, hass.executor_jobs / BROADCASTS
+    return asyncio.run(_run())
+
+
+def test_bench_observer_inline(benchmark):
+    benchmark("observer_inline", lambda: _broadcasts(Observer), number=1, repeat=5)
+
+
+def test_inline_subscribers_leave_the_thread_pool_idle():
+    _broadcasts(Observer), _broadcasts(ExecutorObserver)
+    inline_runs = [_broadcasts(Observer) for _ in range(5)]
+    executor_runs = [_broadcasts(ExecutorObserver) for _ in range(5)]
+    inline, inline_jobs = median(r[0] for r in inline_runs), inline_runs[0][1]
+    executor, executor_jobs = median(r[0] for r in executor_runs), executor_runs[0][1]
+    print(f"per broadcast to 2 sync subscribers: inline {inline * 1e6:.0f} us and {inline_jobs:.0f} executor jobs, "
+          f"executor {executor * 1e6:.0f} us and {executor_jobs:.0f} executor jobs")
+    assert inline_jobs == 0
+    assert executor_jobs == 2
+    assert inline < executor
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+import pytest
+
+from ...service.hvac.offset.offset_optimizer import LATENCY_BUDGET, optimize_offsets
+from .helpers import SLOT_COUNTS, best_of, price_input
+
+NOW_DT = datetime(2023, 12, 13, 20, 43, 0)
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_optimizer_fits_latency_budget(slots):
+    prices = price_input(slots)
+    elapsed = best_of(lambda: optimize_offsets(prices, NOW_DT, tolerance=3, budget=1), number=5, repeat=3)
+    assert elapsed < LATENCY_BUDGET, f"{slots} slots took {elapsed * 1000:.1f} ms"
+
+
+def test_optimizer_quarter_hour_plan_has_all_slots():
+    assert len(optimize_offsets(price_input(192), NOW_DT, tolerance=3)) == 192
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+import pytest
+
+from ...service.hvac.offset.offset_utils import _deviation_from_mean
+from ..legacy import legacy_deviation_from_mean
+from .helpers import SLOT_COUNTS, best_of, price_input
+
+NOW_DT = datetime(2023, 12, 13, 20, 43, 0)
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_deviation_from_mean_benchmark(slots):
+    prices = price_input(slots)
+    new = best_of(lambda: _deviation_from_mean(prices, 0, NOW_DT))
+    legacy = best_of(lambda: legacy_deviation_from_mean(prices, 0, NOW_DT), number=1, repeat=3)
+    print(f"_deviation_from_mean {slots} slots: {new * 1000:.3f} ms (legacy {legacy * 1000:.3f} ms, {legacy / new:.0f}x)")
+    assert new < legacy
@@ -0,0 +1,56 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from ...service.hvac.offset.peakfinder import extract_price_features, smooth_transitions
+from ..legacy import legacy_find_single_valleys, legacy_identify_peaks, legacy_identify_valleys
+from .helpers import SLOT_COUNTS, best_of, price_input
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_price_features_benchmark(slots):
+    prices = price_input(slots)
+    new = best_of(lambda: extract_price_features(prices))
+    legacy = best_of(lambda: (
+        legacy_identify_peaks(prices), legacy_identify_valleys(prices), legacy_find_single_valleys(prices)
+    ), number=2, repeat=3)
+    print(f"extract_price_features {slots} slots: {new * 1000:.3f} ms (legacy {legacy * 1000:.3f} ms, {legacy / new:.0f}x)")
+    assert new < legacy
+
+
+def _year_of_plans(slots: int) -> list[dict]:
+    """A year of random-walk offset plans at the resolution given by the number of slots."""
+    rnd = random.Random(1337)
+    minutes = 60 if slots in (24, 48) else 15
+    ret = []
+    for day in range(365):
+        start = datetime(2024, 1, 1) + timedelta(days=day)
+        value = 0
+        plan = {}
+        for i in range(slots):
+            value = max(-3, min(3, value + rnd.choice([-2, -1, 0, 0, 1, 2])))
+            plan[start + timedelta(minutes=minutes * i)] = value
+        ret.append(plan)
+    return ret
+
+
+def _smooth_year(plans: list[dict]) -> None:
+    for plan in plans:
+        smooth_transitions(plan, tolerance=3)
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_smooth_transitions_year_benchmark(slots):
+    plans = _year_of_plans(slots)
+    elapsed = best_of(lambda: _smooth_year(plans), number=1, repeat=3)
+    print(f"smooth_transitions, a year of {slots}-slot plans: {elapsed * 1000:.1f} ms")
+    assert elapsed < 2
+
+
+def test_smooth_transitions_scales_linearly():
+    short = _year_of_plans(24)
+    long = _year_of_plans(192)
+    t_short = best_of(lambda: _smooth_year(short), number=1, repeat=3)
+    t_long = best_of(lambda: _smooth_year(long), number=1, repeat=3)
+    assert t_long / t_short < 8 * 2
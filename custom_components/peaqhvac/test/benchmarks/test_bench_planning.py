@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ...service.hub.weather_prognosis import WeatherPrognosis
+from ...service.hvac.offset.offset_utils import offset_per_day, set_offset_dict
+from ...service.hvac.offset.peakfinder import identify_peaks, smooth_transitions
+from ...service.hvac.water_heater.water_heater_next_start import NextStartPostModel, NextWaterBoost
+from ...service.models.enums.hvac_presets import HvacPresets
+from ...service.models.weather_object import WeatherObject
+from .helpers import SLOT_COUNTS, BenchmarkRecorder, price_input
+
+NOW_DT = datetime(2023, 12, 13, 20, 43, 0)
+
+
+def _offsets(prices: list[float]) -> dict:
+    return offset_per_day(
+        day_values=asyncio.run(set_offset_dict(prices, NOW_DT, 0, {})),
+        all_prices=prices,
+        tolerance=3,
+        indoors_preset=HvacPresets.Normal,
+    )
+
+
+def _water_model(prices: list[float]) -> NextStartPostModel:
+    return NextStartPostModel(
+        prices=prices,
+        demand_hours=[7, 8, 20, 21],
+        non_hours=[11, 12, 16, 17],
+        current_temp=42,
+        temp_trend=-1.5,
+        latest_boost=NOW_DT.replace(hour=0) - timedelta(hours=12),
+        dt=NOW_DT.replace(hour=0, minute=10),
+    )
+
+
+def _weather(slots: int) -> WeatherPrognosis:
+    """A prognosis with one forecast per slot, temperatures following the fixture prices."""
+    prognosis = WeatherPrognosis(hass=None, average_temp_outdoors=None, observer=None, weather_entity=None)
+    minutes = 60 if slots in (24, 48) else 15
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    prognosis.prognosis_list = [
+        WeatherObject(
+            _DTstr=(start + timedelta(minutes=minutes * i)).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+            WeatherCondition="cloudy",
+            Temperature=round(-5 + p * 5, 1),
+            Wind_Speed=3.5,
+            Wind_Bearing=180,
+            Precipitation_Probability=0,
+            Precipitation=0,
+        )
+        for i, p in enumerate(price_input(slots))
+    ]
+    return prognosis
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_bench_set_offset_dict(benchmark, slots):
+    prices = price_input(slots)
+    loop = asyncio.new_event_loop()
+    try:
+        benchmark(f"set_offset_dict[{slots}]", lambda: loop.run_until_complete(set_offset_dict(prices, NOW_DT, 0, {})))
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_bench_offset_per_day(benchmark, slots):
+    prices = price_input(slots)
+    day_values = asyncio.run(set_offset_dict(prices, NOW_DT, 0, {}))
+    benchmark(f"offset_per_day[{slots}]", lambda: offset_per_day(
+        day_values=day_values, all_prices=prices, tolerance=3, indoors_preset=HvacPresets.Normal))
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_bench_identify_peaks(benchmark, slots):
+    prices = price_input(slots)
+    benchmark(f"identify_peaks[{slots}]", lambda: identify_peaks(prices))
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_bench_smooth_transitions(benchmark, slots):
+    offsets = _offsets(price_input(slots))
+    benchmark(f"smooth_transitions[{slots}]", lambda: smooth_transitions(vals=offsets, tolerance=3))
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_bench_next_water_start(benchmark, slots):
+    model = _water_model(price_input(slots))
+    benchmark(f"get_next_start[{slots}]", lambda: NextWaterBoost().get_next_start(model), number=5, repeat=3)
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_bench_hvac_prognosis(benchmark, slots):
+    prognosis = _weather(slots)
+    assert len(prognosis.get_hvac_prognosis(-2)) > 0
+    benchmark(f"get_hvac_prognosis[{slots}]", lambda: prognosis.get_hvac_prognosis(-2))
+
+
+def test_recorder_fails_on_regression(tmp_path, monkeypatch):
+    monkeypatch.setenv("PEAQHVAC_BENCH_THRESHOLD", "0.25")
+    monkeypatch.delenv("PEAQHVAC_BENCH_SAVE", raising=False)
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text('{"fast": 1.0, "slow": 1.0}')
+    recorder = BenchmarkRecorder(baseline)
+    recorder.results.update({"fast": 1.2, "slow": 1.3, "new": 2.0})
+    recorder.check("fast")
+    recorder.check("new")
+    with pytest.raises(AssertionError):
+        recorder.check("slow")
+    recorder.save()
+    assert baseline.read_text().count('"new"') == 1
+    assert BenchmarkRecorder(baseline).baseline["slow"] == 1.0
+
+
+def test_recorder_tolerates_measured_noise(tmp_path, monkeypatch):
+    monkeypatch.setenv("PEAQHVAC_BENCH_THRESHOLD", "0.25")
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text('{"noisy": 1.0}')
+    recorder = BenchmarkRecorder(baseline)
+    recorder.results["noisy"] = 1.4
+    recorder.noise["noisy"] = 0.2
+    recorder.check("noisy")
+    recorder.results["noisy"] = 1.7
+    with pytest.raises(AssertionError):
+        recorder.check("noisy")
+
+
+def test_recorder_saves_missing_baseline(tmp_path, monkeypatch):
+    monkeypatch.delenv("PEAQHVAC_BENCH_SAVE", raising=False)
+    baseline = tmp_path / "baseline.json"
+    recorder = BenchmarkRecorder(baseline)
+    recorder.measure("noop", lambda: None, number=1, repeat=1)
+    assert "noop" in recorder.noise
+    recorder.save()
+    assert "noop" in BenchmarkRecorder(baseline).baseline
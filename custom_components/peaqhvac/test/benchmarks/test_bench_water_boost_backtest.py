@@ -0,0 +1,25 @@
+import time
+
+from tools.water_boost_backtest import run_backtest
+
+from ..test_water_boost_backtest import WATER_DAYS
+from .helpers import to_quarter_hours
+
+YEAR = [WATER_DAYS[i % len(WATER_DAYS)] for i in range(365)]
+
+
+def test_hourly_year_replays_in_seconds():
+    start = time.perf_counter()
+    result = run_backtest(YEAR)
+    elapsed = time.perf_counter() - start
+    print(f"hourly year: {result} in {elapsed:.2f} s")
+    assert len(result.days) == 365
+    assert elapsed < 10
+
+
+def test_quarter_hour_month_replays_in_seconds():
+    start = time.perf_counter()
+    result = run_backtest([to_quarter_hours(d) for d in YEAR[:31]])
+    elapsed = time.perf_counter() - start
+    print(f"quarter-hour month: {result} in {elapsed:.2f} s")
+    assert elapsed < 5
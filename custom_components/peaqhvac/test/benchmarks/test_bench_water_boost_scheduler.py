@@ -0,0 +1,27 @@
+from datetime import datetime
+
+import pytest
+
+from ...service.hvac.water_heater.water_boost_scheduler import plan_boosts
+from ...service.hvac.water_heater.water_heater_next_start import NextStartPostModel
+from .helpers import SLOT_COUNTS, best_of, price_input
+
+NOW_DT = datetime(2023, 12, 13, 0, 5)
+HORIZON_BUDGET = 0.1
+
+
+def _model(slots: int) -> NextStartPostModel:
+    return NextStartPostModel(prices=price_input(slots), demand_hours=[7, 20, 21], non_hours=[11, 12, 16, 17],
+                              current_temp=44, temp_trend=-0.8, dt=NOW_DT)
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+def test_bench_plan_boosts(benchmark, slots):
+    model = _model(slots)
+    benchmark(f"plan_boosts[{slots}]", lambda: plan_boosts(model), number=3, repeat=3)
+
+
+def test_full_horizon_fits_budget():
+    model = _model(192)
+    elapsed = best_of(lambda: plan_boosts(model), number=2, repeat=3)
+    assert elapsed < HORIZON_BUDGET, f"192 slots took {elapsed * 1000:.1f} ms"
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from ...service.hvac.water_heater.water_heater_next_start import NextStartPostModel, NextWaterBoost
+from ..legacy import LegacyNextWaterBoost
+from ..test_water_heater_next_start_new import P240130, P240131
+from .helpers import best_of, to_quarter_hours
+
+
+def _model(prices: list, hour: int, current_temp: float, temp_trend: float, min_price: float = 0) -> NextStartPostModel:
+    return NextStartPostModel(
+        prices=prices,
+        demand_hours=[7, 20, 21],
+        non_hours=[11, 12, 16, 17],
+        current_temp=current_temp,
+        temp_trend=temp_trend,
+        min_price=min_price,
+        latest_boost=datetime(2024, 1, 25, 6, 52),
+        dt=datetime(2024, 1, 26, hour, 7),
+    )
+
+
+def test_quarter_hour_costs_no_more_than_legacy_hourly():
+    hourly = _model(P240130 + P240131, 0, 37, -1.5)
+    quarter = _model(to_quarter_hours(P240130 + P240131), 0, 37, -1.5)
+    assert quarter.resolution.minutes == 15
+    new = best_of(lambda: NextWaterBoost().get_next_start(quarter), number=5, repeat=3)
+    legacy = best_of(lambda: LegacyNextWaterBoost().get_next_start(hourly), number=5, repeat=3)
+    print(f"get_next_start 192 slots: {new * 1000:.3f} ms (legacy 48 hourly slots {legacy * 1000:.3f} ms)")
+    assert new < legacy
+
+
+@pytest.mark.parametrize("slots", [24, 48, 96, 192])
+def test_next_start_scales_linearly(slots):
+    prices = to_quarter_hours(P240130 + P240131) if slots > 48 else (P240130 + P240131)[:slots]
+    small = best_of(lambda: NextWaterBoost().get_next_start(_model(prices[:slots // 2], 0, 37, -1.5)), 5, 3)
+    large = best_of(lambda: NextWaterBoost().get_next_start(_model(prices[:slots], 0, 37, -1.5)), 5, 3)
+    assert large < small * 4
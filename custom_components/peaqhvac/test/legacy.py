@@ -0,0 +1,170 @@
+"""
+Implementations that optimized code replaced, kept as references for the equivalence tests and benchmarks.
+"""
+import statistics
+from datetime import datetime, timedelta
+from statistics import mean, stdev
+
+from ..service.hvac.offset.peakfinder import _check_deviation_peaks, _check_deviation_valleys
+from ..service.hvac.water_heater.water_heater_next_start import (NextStartExportModel, NextStartPostModel,
+                                                                 NextWaterBoost, PriceData)
+from ..service.models.enums.hvac_presets import HvacPresets
+from ..service.models.slot_resolution import SlotResolution
+
+
+def legacy_identify_peaks(prices: list) -> list[int]:
+    ret = []
+    for idx, p in enumerate(prices):
+        if p < statistics.mean(prices):
+            continue
+        if idx == 0 or idx == len(prices) - 1:
+            if p == max(prices):
+                ret.append(idx)
+        elif all([_check_deviation_peaks(p, prices[idx - 1]), _check_deviation_peaks(p, prices[idx + 1])]):
+            ret.append(idx)
+    return ret
+
+
+def legacy_identify_valleys(prices: list) -> list[int]:
+    ret = []
+    for idx, p in enumerate(prices):
+        if p > statistics.mean(prices):
+            continue
+        if idx == 0 or idx == len(prices) - 1:
+            if p == min(prices):
+                ret.append(idx)
+        elif all([_check_deviation_valleys(p, prices[idx - 1]), _check_deviation_valleys(p, prices[idx + 1])]):
+            ret.append(idx)
+    return ret
+
+
+def legacy_find_single_valleys(prices: list) -> list[int]:
+    ret = []
+    for idx, p in enumerate(prices):
+        if 1 < idx < len(prices) - 2 and all([
+            prices[idx] < prices[idx - 1],
+            prices[idx] < prices[idx + 1],
+            min(prices[idx - 1], prices[idx + 1]) / max(prices[idx - 1], prices[idx + 1]) > 0.8,
+        ]):
+            ret.append(idx)
+    return ret
+
+
+def legacy_deviation_from_mean(prices: list[float], min_price: float, dt: datetime) -> dict[datetime, float]:
+    """The per-element mean/stdev implementation the vectorized engine replaced."""
+    resolution = SlotResolution.from_prices(prices)
+    delta = resolution.minutes
+    split = resolution.slot_of_hour(13)
+    dt_lister = dt.replace(hour=0)
+    min_list_price = min(min(prices), 0)
+    shifted_prices = [p - min_list_price for p in prices]
+    standardized_prices = [(p - mean(shifted_prices)) / stdev(shifted_prices) for p in shifted_prices]
+    avg = mean(standardized_prices)
+    devi = stdev(standardized_prices)
+    avg2 = avg
+    devi2 = devi
+    if dt.hour >= 13:
+        avg2 = mean(standardized_prices[split:])
+        devi2 = stdev(standardized_prices[split:])
+    deviation_dict = {}
+    for i, num in enumerate(standardized_prices):
+        _devi = devi if i < split else devi2
+        _avg = avg if i < split else avg2
+        deviation = (num - _avg) / _devi
+        if _devi < 1:
+            deviation *= 0.5
+        if num <= min_price:
+            setval = min(round(deviation, 2), 0)
+        elif num <= min_price * 2:
+            setval = deviation - 1 if deviation > 1 else deviation
+            setval = round(setval, 2)
+        else:
+            setval = round(deviation, 2)
+        deviation_dict[dt_lister + timedelta(minutes=delta * i)] = setval
+    return deviation_dict
+
+
+def legacy_temperature_at_datetime(now_dt, target_dt, current_temp, temp_trend) -> float:
+    delay = (target_dt - now_dt).total_seconds() / 3600
+    return max(10, round(current_temp + (delay * temp_trend), 1))
+
+
+class LegacyNextWaterBoost(NextWaterBoost):
+    """
+    The planner with the quadratic suffix-mean loop the feature table replaced, building a list of records
+    and selecting from filtered and sorted copies of the complete list.
+    """
+    def get_next_start(self, model: NextStartPostModel) -> NextStartExportModel:
+        self.water_limit = 30 if model.hvac_preset == HvacPresets.Away else 40
+        self.low_water_limit = self.water_limit - 20
+        self.dt = model.dt
+        self.min_price = model.min_price
+        data = self.get_data(model)
+        selected = self.get_selected(data)
+        if selected is None:
+            return NextStartExportModel(datetime.max, None)
+        filtered = self.get_filtered(data, selected)
+        selected = self.get_final_selected(filtered, selected)
+        return NextStartExportModel(selected.time, selected.target_temp)
+
+    def get_data(self, model: NextStartPostModel) -> list:
+        self._shift_after_recent_boost(model)
+        return self._legacy_data_list(model)
+
+    def _legacy_is_candidate(self, d: PriceData) -> bool:
+        return all([
+            d.is_cold,
+            (d.price_spread < 1 or d.price < self.min_price or (d.is_demand or d.water_temp < d.target_temp)),
+            not d.is_non,
+            d.time >= self.reset_hour(self.dt)
+            ])
+
+    def get_selected(self, data: list) -> PriceData:
+        selected: PriceData = None
+        for d in data:
+            if self._legacy_is_candidate(d):
+                selected = d
+                break
+        return selected
+
+    def get_filtered(self, data: list, selected: PriceData) -> list:
+        return [d for d in data if max(d.time, selected.time) - min(d.time, selected.time) <= timedelta(hours=2) and d.time >= self.reset_hour(self.dt)]
+
+    def get_final_selected(self, filtered: list, selected: PriceData) -> PriceData:
+        for fdemand in [d for d in filtered if d.is_demand and not d.is_non]:
+            if fdemand.is_cold and fdemand.price_spread < selected.price_spread:
+                return fdemand
+
+        for d in sorted(filtered, key=lambda x: (not x.is_demand, x.price_spread)):
+            if not d.is_non and d.price_spread < selected.price_spread and not selected.is_demand and not selected.water_temp < self.low_water_limit:
+                selected = d
+                break
+        return selected
+
+    def _legacy_data_list(self, model: NextStartPostModel) -> list:
+        data = []
+        for idx, p in enumerate(model.prices[self.dt.hour:], start=self.dt.hour):
+            new_hour = (self.dt + timedelta(hours=idx - self.dt.hour)).replace(minute=50, second=0, microsecond=0)
+            second_hour = (self.dt + timedelta(hours=idx - self.dt.hour + 1))
+            temp_at_time = legacy_temperature_at_datetime(self.dt, new_hour, model.current_temp, model.temp_trend)
+            if new_hour < self.reset_hour(self.dt):
+                continue
+            data.append(PriceData(
+                p,
+                round(p / mean(model.prices[idx - self.dt.hour:]), 2),
+                new_hour,
+                temp_at_time,
+                self._calculate_is_cold(temp_at_time, second_hour.hour, model, p,
+                                        model.prices[idx + 1] if idx + 1 < len(model.prices) else 9999,
+                                        model.demand_hours),
+                second_hour.hour in model.demand_hours,
+                new_hour.hour in model.non_hours or second_hour.hour in model.non_hours,
+                self._calculate_target_temp_for_hour(temp_at_time, second_hour.hour in model.demand_hours, p,
+                                                     round(p / mean(model.prices[idx - self.dt.hour:]), 2),
+                                                     model.min_price)
+            ))
+        return data
+
+    @staticmethod
+    def reset_hour(dt) -> datetime:
+        return dt.replace(minute=0,second=0,microsecond=0)
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from peaqevcore.common.models.observer_types import ObserverTypes
+
+from ..service.observer.iobserver_coordinator import IObserver
+from ..service.observer.models.broadcast_queue import BroadcastQueue
+from ..service.observer.models.command import Command
+from ..service.observer.observer_coordinator import Observer
+from .test_observer import FakeHass, Recorder
+
+OUTDOORS = ObserverTypes.TemperatureOutdoorsChanged
+
+
+def test_queue_dedups_and_keeps_insertion_order():
+    queue = BroadcastQueue()
+    assert queue.add(Command("b", argument=1))
+    assert queue.add(Command("a", argument=1))
+    assert not queue.add(Command("b", argument=1))
+    assert queue.add(Command("b", argument=2))
+    assert [(c.command, c.argument) for c in queue] == [("b", 1), ("a", 1), ("b", 2)]
+    queue.remove(Command("a", argument=1))
+    assert Command("a", argument=1) not in queue
+    assert len(queue) == 2
+
+
+def test_unhashable_arguments_are_fingerprinted():
+    queue = BroadcastQueue()
+    assert queue.add(Command("a", argument={"x": [1, 2], "y": {3}}))
+    assert not queue.add(Command("a", argument={"y": {3}, "x": [1, 2]}))
+    assert queue.add(Command("a", argument={"x": [1, 3]}))
+    assert Command("a", argument=("x", 1)) == Command("a", argument=("x", 1))
+
+
+def test_coalesced_command_replaces_pending_payload_in_place():
+    queue = BroadcastQueue(coalesced={OUTDOORS})
+    assert queue.add(Command(OUTDOORS, argument=1.5))
+    queue.add(Command("other"))
+    assert not queue.add(Command(OUTDOORS, argument=2.0))
+    assert [c.argument for c in queue] == [2.0, None]
+    assert queue.get(Command(OUTDOORS, argument=1.5)).argument == 2.0
+
+
+def test_iteration_is_safe_against_mutation():
+    queue = BroadcastQueue()
+    for i in range(5):
+        queue.add(Command("a", argument=i))
+    for c in queue:
+        queue.remove(c)
+        queue.add(Command("b", argument=c.argument))
+    assert [c.command for c in queue] == ["b"] * 5
+
+
+@pytest.mark.asyncio
+async def test_state_like_broadcasts_deliver_latest_value_once():
+    observer = Observer(FakeHass())
+    recorder = Recorder()
+    observer.add(OUTDOORS, recorder.async_handler)
+    for val in (1.0, 2.0, 1.0):
+        observer.broadcast(OUTDOORS, val)
+    await observer.dispatcher.async_join()
+    assert recorder.calls == [1.0]
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_can_be_enabled_per_command():
+    observer = IObserver()
+    observer.coalesce("setpoint")
+    for val in range(3):
+        observer.broadcast("setpoint", val)
+    assert [c.argument for c in observer.model.broadcast_queue] == [2]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_delay_drops_only_expired_entries():
+    observer = IObserver()
+    observer.broadcast("a", 1)
+    observer.broadcast("b", 1)
+    first = next(iter(observer.model.dispatch_delay_queue))
+    observer.model.dispatch_delay_queue[first] = time.time() - 60
+    await observer.async_update_dispatch_delay(first)
+    assert [c.command for c in observer.model.dispatch_delay_queue] == ["b"]
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from ..service.hvac.water_heater.models.bus_event_log import BusEventLog
+from ..service.hvac.water_heater.models.waterbooster_model import WaterBoosterModel
+
+NOW_DT = datetime(2024, 1, 30, 13, 2)
+WARNING = "peaqhvac.water_heater_warning"
+
+
+def test_duplicates_are_suppressed_and_counted():
+    log = BusEventLog()
+    start = NOW_DT + timedelta(minutes=5)
+    assert log.should_fire(WARNING, start, NOW_DT)
+    assert not log.should_fire(WARNING, start, NOW_DT)
+    assert not log.should_fire(WARNING, start, NOW_DT + timedelta(hours=1))
+    assert log.should_fire("other", start, NOW_DT)
+    assert log.suppressed == 2
+
+
+def test_past_start_times_expire():
+    log = BusEventLog(ttl=timedelta(hours=1))
+    start = NOW_DT
+    assert log.should_fire(WARNING, start, NOW_DT)
+    assert not log.should_fire(WARNING, start, NOW_DT + timedelta(minutes=59))
+    assert log.should_fire(WARNING, start, NOW_DT + timedelta(hours=1))
+
+
+def test_non_datetime_keys_expire_after_firing():
+    log = BusEventLog(ttl=timedelta(minutes=10))
+    assert log.should_fire(WARNING, "key", NOW_DT)
+    assert not log.should_fire(WARNING, "key", NOW_DT + timedelta(minutes=9))
+    assert log.should_fire(WARNING, "key", NOW_DT + timedelta(minutes=10))
+
+
+def test_log_is_bounded():
+    log = BusEventLog(maxsize=4)
+    for i in range(100):
+        log.should_fire(WARNING, NOW_DT + timedelta(hours=i), NOW_DT)
+    assert len(log) == 4
+    assert not log.should_fire(WARNING, NOW_DT + timedelta(hours=99), NOW_DT)
+    assert log.should_fire(WARNING, NOW_DT, NOW_DT)
+
+
+def test_full_log_drops_expired_entries_first():
+    log = BusEventLog(maxsize=3, ttl=timedelta(hours=1))
+    log.should_fire(WARNING, NOW_DT + timedelta(hours=5), NOW_DT)
+    log.should_fire(WARNING, NOW_DT, NOW_DT)
+    log.should_fire(WARNING, NOW_DT + timedelta(hours=6), NOW_DT)
+    log.should_fire(WARNING, NOW_DT + timedelta(hours=7), NOW_DT + timedelta(hours=2))
+    assert len(log) == 3
+    assert not log.should_fire(WARNING, NOW_DT + timedelta(hours=5), NOW_DT + timedelta(hours=2))
+
+
+def test_datetime_max_does_not_overflow():
+    assert BusEventLog().should_fire(WARNING, datetime.max, NOW_DT)
+
+
+def test_models_do_not_share_their_log():
+    first, second = WaterBoosterModel(MagicMock()), WaterBoosterModel(MagicMock())
+    start = datetime.now() + timedelta(minutes=5)
+    first.bus_fire_once(WARNING, {"new": True}, start)
+    first.bus_fire_once(WARNING, {"new": True}, start)
+    second.bus_fire_once(WARNING, {"new": True}, start)
+    assert first._hass.bus.fire.call_count == 1
+    assert second._hass.bus.fire.call_count == 1
+    assert (first.suppressed_events, second.suppressed_events) == (1, 0)
+
+
+def test_events_without_key_always_fire():
+    model = WaterBoosterModel(MagicMock())
+    model.bus_fire_once(WARNING, {"new": False})
+    model.bus_fire_once(WARNING, {"new": False})
+    assert model._hass.bus.fire.call_count == 2
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+from ..service.hvac.offset.offset_utils import _deviation_from_mean
+from ..service.hvac.offset.peakfinder import extract_price_features
+from ..service.hvac.water_heater.water_heater_next_start import NextStartPostModel, NextWaterBoost
+from .benchmarks.helpers import HOURLY_DAYS, SLOT_COUNTS, price_input
+from .legacy import (LegacyNextWaterBoost, legacy_deviation_from_mean, legacy_find_single_valleys,
+                     legacy_identify_peaks, legacy_identify_valleys)
+from .test_water_boost_backtest import WATER_DAYS
+
+NOW_DT = datetime(2023, 12, 13, 20, 43, 0)
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+@pytest.mark.parametrize("start_day", range(len(HOURLY_DAYS)))
+def test_price_features_match_legacy(slots, start_day):
+    prices = price_input(slots, start_day)
+    features = extract_price_features(prices)
+    assert features.peaks == legacy_identify_peaks(prices)
+    assert features.valleys == legacy_identify_valleys(prices)
+    assert features.single_valleys == legacy_find_single_valleys(prices)
+
+
+@pytest.mark.parametrize("slots", SLOT_COUNTS)
+@pytest.mark.parametrize("dt", [NOW_DT, NOW_DT.replace(hour=8)])
+def test_deviation_from_mean_matches_legacy(slots, dt):
+    prices = price_input(slots)
+    new = _deviation_from_mean(prices, 0, dt)
+    legacy = legacy_deviation_from_mean(prices, 0, dt)
+    assert new.keys() == legacy.keys()
+    assert all(abs(new[k] - legacy[k]) <= 0.01 for k in new)
+
+
+def _water_model(prices: list, hour: int, current_temp: float, temp_trend: float) -> NextStartPostModel:
+    return NextStartPostModel(
+        prices=prices,
+        demand_hours=[7, 20, 21],
+        non_hours=[11, 12, 16, 17],
+        current_temp=current_temp,
+        temp_trend=temp_trend,
+        min_price=0.1,
+        latest_boost=datetime(2024, 1, 25, 6, 52),
+        dt=datetime(2024, 1, 26, hour, 7),
+    )
+
+
+@pytest.mark.parametrize("day", range(len(WATER_DAYS) - 1))
+@pytest.mark.parametrize("current_temp,temp_trend", [(41.2, 0), (37, -1.5), (25, -4), (12, -40)])
+def test_next_start_matches_legacy(day, current_temp, temp_trend):
+    prices = WATER_DAYS[day] + WATER_DAYS[day + 1]
+    for hour in range(24):
+        model = _water_model(prices, hour, current_temp, temp_trend)
+        new = NextWaterBoost()
+        legacy = LegacyNextWaterBoost()
+        assert new.get_data(model) == legacy.get_data(_water_model(prices, hour, current_temp, temp_trend))
+        assert new.get_next_start(model) == legacy.get_next_start(model)
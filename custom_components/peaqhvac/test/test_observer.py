@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+from functools import partial
+
+import pytest
+
+from ..service.observer.observer_coordinator import Observer
+
+
+class FakeHass:
+    def __init__(self):
+        self.executor_jobs = 0
+        self.tasks = 0
+        self.loop = None
+
+    def async_create_background_task(self, target, name):
+        self.tasks += 1
+        self.loop = asyncio.get_running_loop()
+        return self.loop.create_task(target)
+
+    async def async_add_executor_job(self, func, *args):
+        self.executor_jobs += 1
+        return await asyncio.get_running_loop().run_in_executor(None, partial(func, *args))
+
+
+class Recorder:
+    def __init__(self):
+        self.calls: list = []
+
+    async def async_handler(self, val=None):
+        self.calls.append(val)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_dispatched_without_polling():
+    observer = Observer(FakeHass())
+    recorder = Recorder()
+    observer.add("prices changed", recorder.async_handler)
+    start = time.perf_counter()
+    observer.broadcast("prices changed", 1)
+    await observer.dispatcher.async_join()
+    assert recorder.calls == [1]
+    assert time.perf_counter() - start < 0.1
+    assert len(observer.model.broadcast_queue) == 0
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_commands_are_dispatched_in_fifo_order():
+    observer = Observer(FakeHass())
+    recorder = Recorder()
+    for name in ("a", "b", "c"):
+        observer.add(name, partial(recorder.async_handler, name))
+    for name in ("c", "a", "b"):
+        observer.broadcast(name)
+    await observer.dispatcher.async_join()
+    assert recorder.calls == ["c", "a", "b"]
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cascade_is_drained_in_one_join():
+    observer = Observer(FakeHass())
+    recorder = Recorder()
+
+    async def _first():
+        await observer.async_broadcast("second", 2)
+    observer.add("first", _first)
+    observer.add("second", recorder.async_handler)
+    observer.broadcast("first")
+    await observer.dispatcher.async_join()
+    assert recorder.calls == [2]
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_command_waits_for_its_first_subscriber():
+    observer = Observer(FakeHass())
+    recorder = Recorder()
+    observer.broadcast("late", 5)
+    await observer.dispatcher.async_join()
+    assert len(observer.model.broadcast_queue) == 1
+    observer.add("late", recorder.async_handler)
+    await observer.dispatcher.async_join()
+    assert recorder.calls == [5]
+    assert len(observer.model.broadcast_queue) == 0
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sync_subscriber_and_thread_broadcast():
+    hass = FakeHass()
+    observer = Observer(hass)
+    recorder = Recorder()
+    observer.add("from thread", recorder.async_handler)
+    calls = []
+    observer.add("sync", lambda val: calls.append(val))
+    observer.broadcast("sync", 3)
+    await observer.dispatcher.async_join()
+    assert calls == [3]
+    assert hass.executor_jobs == 0
+    thread = threading.Thread(target=observer.broadcast, args=("from thread", 4))
+    thread.start()
+    thread.join()
+    assert len(observer.model.broadcast_queue) == 0
+    assert len(observer.model.dispatch_delay_queue) == 1
+    await asyncio.sleep(0)
+    assert len(observer.model.dispatch_delay_queue) == 2
+    await observer.dispatcher.async_join()
+    assert recorder.calls == [4]
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failing_subscriber_does_not_stop_dispatching():
+    observer = Observer(FakeHass())
+    recorder = Recorder()
+
+    def _fail():
+        raise ValueError("boom")
+    observer.add("fails", _fail)
+    observer.add("works", recorder.async_handler)
+    observer.broadcast("fails")
+    observer.broadcast("works", 1)
+    await observer.dispatcher.async_join()
+    assert recorder.calls == [1]
+    assert len(observer.model.broadcast_queue) == 0
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_worker_starts_on_first_broadcast_and_stops_on_shutdown():
+    hass = FakeHass()
+    observer = Observer(hass)
+    assert hass.tasks == 0
+    observer.add("x", Recorder().async_handler)
+    observer.broadcast("x")
+    observer.broadcast("y")
+    assert hass.tasks == 1
+    await observer.async_shutdown()
+    assert observer.dispatcher._task is None
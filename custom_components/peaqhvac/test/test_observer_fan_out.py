@@ -0,0 +1,103 @@
+import asyncio
+import time
+from functools import partial
+
+import pytest
+
+from ..service.observer.observer_coordinator import Observer
+from .test_observer import FakeHass
+
+
+@pytest.mark.asyncio
+async def test_subscribers_of_one_command_run_concurrently():
+    observer = Observer(FakeHass(), concurrent=True)
+    done = []
+
+    async def _slow(name):
+        await asyncio.sleep(0.2)
+        done.append(name)
+    observer.add("prices changed", partial(_slow, "a"))
+    observer.add("prices changed", partial(_slow, "b"))
+    observer.add("prices changed", partial(_slow, "c"))
+    start = time.perf_counter()
+    observer.broadcast("prices changed")
+    await observer.dispatcher.async_join()
+    assert sorted(done) == ["a", "b", "c"]
+    assert time.perf_counter() - start < 0.5
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_only_cancels_the_slow_subscriber():
+    observer = Observer(FakeHass(), concurrent=True)
+    done = []
+
+    async def _hang():
+        await asyncio.sleep(10)
+        done.append("hang")
+
+    async def _fast():
+        done.append("fast")
+    observer.add("prices changed", _hang, timeout=0.05)
+    observer.add("prices changed", _fast)
+    start = time.perf_counter()
+    observer.broadcast("prices changed")
+    await observer.dispatcher.async_join()
+    assert done == ["fast"]
+    assert time.perf_counter() - start < 1
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failing_subscriber_does_not_affect_siblings():
+    observer = Observer(FakeHass(), concurrent=True)
+    done = []
+
+    async def _fail():
+        raise ValueError("boom")
+
+    async def _ok():
+        await asyncio.sleep(0.01)
+        done.append("ok")
+    observer.add("prices changed", _fail)
+    observer.add("prices changed", _ok)
+    observer.broadcast("prices changed")
+    await observer.dispatcher.async_join()
+    assert done == ["ok"]
+    assert len(observer.model.broadcast_queue) == 0
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_commands_keep_their_order_in_concurrent_mode():
+    observer = Observer(FakeHass(), concurrent=True)
+    events = []
+
+    async def _handler(name, delay):
+        events.append(f"{name} start")
+        await asyncio.sleep(delay)
+        events.append(f"{name} end")
+    observer.add("first", partial(_handler, "first", 0.05))
+    observer.add("second", partial(_handler, "second", 0))
+    observer.broadcast("first")
+    observer.broadcast("second")
+    await observer.dispatcher.async_join()
+    assert events == ["first start", "first end", "second start", "second end"]
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sequential_mode_is_default():
+    observer = Observer(FakeHass())
+    events = []
+
+    async def _handler(name):
+        events.append(f"{name} start")
+        await asyncio.sleep(0.01)
+        events.append(f"{name} end")
+    observer.add("prices changed", partial(_handler, "a"))
+    observer.add("prices changed", partial(_handler, "b"))
+    observer.broadcast("prices changed")
+    await observer.dispatcher.async_join()
+    assert events == ["a start", "a end", "b start", "b end"]
+    await observer.async_shutdown()
@@ -0,0 +1,59 @@
+import threading
+from functools import partial
+
+import pytest
+
+from ..service.observer.models.subscriber import Subscriber
+from ..service.observer.observer_coordinator import Observer
+from .test_observer import FakeHass, Recorder
+
+
+def test_subscribers_are_classified_when_added():
+    recorder = Recorder()
+    assert Subscriber(recorder.async_handler).is_async
+    assert Subscriber(partial(recorder.async_handler, 1)).is_async
+    assert not Subscriber(print).is_async
+    assert not Subscriber(print).blocking
+
+
+@pytest.mark.asyncio
+async def test_sync_subscriber_runs_inline_on_the_loop():
+    hass = FakeHass()
+    observer = Observer(hass)
+    threads = []
+    observer.add("outdoor temp", lambda val: threads.append((threading.get_ident(), val)))
+    observer.broadcast("outdoor temp", 4)
+    await observer.dispatcher.async_join()
+    assert threads == [(threading.get_ident(), 4)]
+    assert hass.executor_jobs == 0
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_blocking_subscriber_runs_in_the_executor():
+    hass = FakeHass()
+    observer = Observer(hass)
+    threads = []
+    observer.add("write file", lambda: threads.append(threading.get_ident()), blocking=True)
+    observer.broadcast("write file")
+    await observer.dispatcher.async_join()
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+    assert hass.executor_jobs == 1
+    await observer.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failing_inline_subscriber_does_not_stop_siblings():
+    observer = Observer(FakeHass())
+    calls = []
+
+    def _fail(val):
+        raise ValueError("boom")
+    observer.add("outdoor temp", _fail)
+    observer.add("outdoor temp", calls.append)
+    observer.broadcast("outdoor temp", 2)
+    await observer.dispatcher.async_join()
+    assert calls == [2]
+    assert len(observer.model.broadcast_queue) == 0
+    await observer.async_shutdown()
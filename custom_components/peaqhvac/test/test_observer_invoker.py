@@ -0,0 +1,121 @@
+from functools import partial
+
+import pytest
+
+from ..service.observer.invoker import compile_invoker
+from ..service.observer.models.command import Command
+from ..service.observer.models.subscriber import Subscriber
+from ..service.observer.observer_coordinator import Observer
+from .test_observer import FakeHass
+
+
+class Handlers:
+    def __init__(self):
+        self.calls: list = []
+
+    def no_arg(self):
+        self.calls.append(())
+
+    def positional(self, val):
+        self.calls.append((val,))
+
+    def optional(self, val=None):
+        self.calls.append((val,))
+
+    def keywords(self, a, b=2):
+        self.calls.append((a, b))
+
+    def var_keywords(self, **kwargs):
+        self.calls.append(kwargs)
+
+    def two_positional(self, a, b):
+        self.calls.append((a, b))
+
+
+def test_no_arg_subscriber_ignores_the_argument():
+    h = Handlers()
+    invoke = compile_invoker(h.no_arg)
+    invoke(None)
+    invoke(5)
+    invoke({"a": 1})
+    assert h.calls == [(), (), ()]
+
+
+def test_positional_subscriber_gets_the_argument():
+    h = Handlers()
+    invoke = compile_invoker(h.positional)
+    invoke(5)
+    invoke([1, 2])
+    assert h.calls == [(5,), ([1, 2],)]
+
+
+def test_optional_argument_is_passed_when_present():
+    h = Handlers()
+    invoke = compile_invoker(h.optional)
+    invoke(None)
+    invoke("x")
+    assert h.calls == [(None,), ("x",)]
+
+
+def test_dict_argument_is_passed_as_keywords():
+    h = Handlers()
+    invoke = compile_invoker(h.keywords)
+    invoke({"a": 1})
+    invoke({"a": 1, "b": 3})
+    assert h.calls == [(1, 2), (1, 3)]
+
+
+def test_dict_argument_that_does_not_match_is_dropped():
+    h = Handlers()
+    compile_invoker(h.optional)({"other": 1})
+    compile_invoker(h.var_keywords)({"other": 1})
+    assert h.calls == [(None,), {"other": 1}]
+
+
+def test_argument_the_subscriber_cannot_take_is_dropped():
+    h = Handlers()
+    compile_invoker(h.optional)({"val": 3})
+    compile_invoker(partial(h.keywords, 1))(None)
+    assert h.calls == [(3,), (1, 2)]
+
+
+def test_two_required_arguments_are_not_filled_from_one():
+    h = Handlers()
+    with pytest.raises(TypeError):
+        compile_invoker(h.two_positional)(1)
+    assert h.calls == []
+
+
+def test_type_error_inside_subscriber_is_not_retried():
+    calls = []
+
+    def _handler(val):
+        calls.append(val)
+        raise TypeError("inside handler")
+    subscriber = Subscriber(_handler)
+    Observer._call_func(subscriber, Command("test", argument=1))
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_async_subscribers_are_dispatched_by_signature():
+    observer = Observer(FakeHass())
+    calls = []
+
+    async def _no_arg():
+        calls.append("no arg")
+
+    async def _positional(val):
+        calls.append(val)
+
+    async def _keywords(a, b):
+        calls.append(a + b)
+    observer.add("a", _no_arg)
+    observer.add("a", _positional)
+    observer.add("b", _keywords)
+    observer.add("b", _no_arg)
+    observer.broadcast("a", 7)
+    observer.broadcast("b", {"a": 1, "b": 2})
+    await observer.dispatcher.async_join()
+    assert calls == ["no arg", 7, 3, "no arg"]
+    await observer.async_shutdown()
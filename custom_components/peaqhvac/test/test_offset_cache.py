@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from ..service.hvac.offset.offset_cache import OffsetCache
+from ..service.models.enums.hvac_presets import HvacPresets
+from .test_offsets import P231213, P231214
+
+NOW = datetime(2023, 12, 13, 20, 43)
+
+
+def _key(prices=None, tolerance=3, preset=HvacPresets.Normal, weather=None, dt=NOW) -> tuple:
+    return OffsetCache.fingerprint(prices or P231213 + P231214, 0, tolerance, preset, weather, dt)
+
+
+def test_fingerprint_equal_for_equal_inputs():
+    assert _key() == _key(prices=list(P231213 + P231214))
+
+
+def test_fingerprint_changes_with_inputs():
+    base = _key()
+    assert _key(prices=P231213) != base
+    assert _key(tolerance=2) != base
+    assert _key(preset=HvacPresets.Away) != base
+    assert _key(weather={NOW: 1}) != base
+    assert _key(dt=NOW.replace(hour=10)) != base
+    assert _key(dt=NOW.replace(minute=1)) == base
+
+
+def test_hit_and_miss_counters():
+    cache = OffsetCache()
+    assert cache.get(_key()) is None
+    cache.put(_key(), {NOW: 1})
+    assert cache.get(_key()) == {NOW: 1}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cached_plan_is_a_copy():
+    cache = OffsetCache()
+    cache.put(_key(), {NOW: 1})
+    cache.get(_key())[NOW] = 5
+    assert cache.get(_key()) == {NOW: 1}
+
+
+def test_least_recently_used_is_evicted():
+    cache = OffsetCache(maxsize=2)
+    cache.put(_key(tolerance=1), {})
+    cache.put(_key(tolerance=2), {})
+    cache.get(_key(tolerance=1))
+    cache.put(_key(tolerance=3), {})
+    assert len(cache) == 2
+    assert cache.get(_key(tolerance=2)) is None
+    assert cache.get(_key(tolerance=1)) == {}
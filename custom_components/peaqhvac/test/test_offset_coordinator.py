@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from datetime import timedelta, timezone
+from functools import partial
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ..service.hvac.offset import offset_pipeline
+from ..service.hvac.offset.offset_coordinator import OffsetCoordinator
+from ..service.models.enums.hvac_presets import HvacPresets
+from ..service.models.prognosis_export_model import PrognosisExportModel
+from ..service.observer.iobserver_coordinator import IObserver
+from .test_offsets import P231213, P231214
+
+
+class FakeHass:
+    def __init__(self):
+        self.executor_jobs = 0
+
+    def async_create_task(self, target, eager_start=False):
+        return asyncio.get_running_loop().create_task(target)
+
+    async def async_add_executor_job(self, func, *args):
+        self.executor_jobs += 1
+        return await asyncio.get_running_loop().run_in_executor(None, partial(func, *args))
+
+
+class StaticOffsetCoordinator(OffsetCoordinator):
+    prices = P231213
+    prices_tomorrow = P231214
+    min_price = 0
+
+
+def _coordinator() -> StaticOffsetCoordinator:
+    hub = MagicMock()
+    hub.state_machine = FakeHass()
+    hub.options.hvac_tolerance = 3
+    hub.sensors.set_temp_indoors.preset = HvacPresets.Normal
+    hub.prognosis.prognosis = []
+    return StaticOffsetCoordinator(hub, IObserver())
+
+
+@pytest.fixture(autouse=True)
+def no_wakeups():
+    with patch("custom_components.peaqhvac.service.hvac.offset.offset_coordinator.async_track_point_in_time"):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_set_offset_calculates_in_executor():
+    coordinator = _coordinator()
+    await coordinator.async_set_offset()
+    await coordinator._plan_task
+    assert coordinator._hub.state_machine.executor_jobs == 1
+    assert len(coordinator.model.raw_offsets) == 48
+
+
+@pytest.mark.asyncio
+async def test_burst_of_requests_costs_one_calculation():
+    coordinator = _coordinator()
+    for _ in range(10):
+        await coordinator.async_set_offset()
+    await coordinator._plan_task
+    assert coordinator._hub.state_machine.executor_jobs == 1
+
+
+@pytest.mark.asyncio
+async def test_request_during_calculation_supersedes_it():
+    coordinator = _coordinator()
+    applied = []
+    original = coordinator.model.apply_plan
+    coordinator.model.apply_plan = lambda plan: (applied.append(plan), original(plan))
+    build = offset_pipeline.build_offset_plan
+    loop = asyncio.get_running_loop()
+    started = asyncio.Event()
+    release = threading.Event()
+
+    def signalling_build(**kwargs):
+        loop.call_soon_threadsafe(started.set)
+        release.wait(timeout=5)
+        return build(**kwargs)
+
+    with patch("custom_components.peaqhvac.service.hvac.offset.offset_coordinator.build_offset_plan", signalling_build):
+        await coordinator.async_set_offset()
+        await started.wait()
+        coordinator._hub.sensors.set_temp_indoors.preset = HvacPresets.Away
+        await coordinator.async_set_offset()
+        release.set()
+        await coordinator._plan_task
+    assert coordinator._hub.state_machine.executor_jobs == 2
+    assert len(applied) == 1
+    assert coordinator.model.raw_offsets == build(**{**coordinator._plan_arguments(), "cache": None}).raw_offsets
+
+
+@pytest.mark.asyncio
+async def test_cancel_plan_stops_pending_calculation():
+    coordinator = _coordinator()
+    await coordinator.async_set_offset()
+    coordinator.cancel_plan()
+    await asyncio.sleep(0)
+    assert coordinator._hub.state_machine.executor_jobs == 0
+    assert coordinator.model.raw_offsets == {}
+
+
+def test_weather_adjustment_uses_a_snapshot_of_the_prognosis():
+    coordinator = _coordinator()
+    prognosis = [MagicMock()]
+    coordinator._hub.prognosis.prognosis = prognosis
+    with patch("custom_components.peaqhvac.service.hvac.offset.offset_coordinator.weatherprognosis_adjustment") as adjust:
+        adjust.side_effect = lambda prog, raw, now: {"prognosis": list(prog)}
+        weather_adjustment = coordinator._plan_arguments()["weather_adjustment"]
+        coordinator._hub.prognosis.prognosis = []
+        prognosis.clear()
+        assert len(weather_adjustment({})["prognosis"]) == 1
+    coordinator._hub.prognosis.get_weatherprognosis_adjustment.assert_not_called()
+
+
+def test_cold_prognosis_raises_todays_offsets():
+    coordinator = _coordinator()
+    cold = PrognosisExportModel(
+        prognosis_temp=-15,
+        corrected_temp=-15,
+        windchill_temp=-15,
+        DT=None,
+        TimeDelta=1,
+        _base_temp=5,
+    )
+    coordinator._hub.prognosis.prognosis = [cold]
+    args = coordinator._plan_arguments()
+    thishour = args["dt"].replace(minute=0, second=0, microsecond=0)
+    tomorrow = thishour + timedelta(days=1)
+    cold.DT = thishour.astimezone(timezone.utc) + timedelta(hours=3)
+    adjusted = args["weather_adjustment"]({thishour: 0, tomorrow: 0})
+    assert adjusted[thishour] == 10
+    assert adjusted[tomorrow] == 0
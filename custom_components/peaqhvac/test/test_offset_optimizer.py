@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pytest
+
+from ..service.hvac.offset.offset_cache import OffsetCache
+from ..service.hvac.offset.offset_optimizer import OptimizerTimeout, optimize_offsets
+from ..service.hvac.offset.peakfinder import identify_peaks
+from ..service.models.enums.hvac_presets import HvacPresets
+from ..service.models.enums.offset_planning_mode import OffsetPlanningMode
+from .test_offset_pipeline import _plan
+from .test_offsets import P231213, P231214
+from .benchmarks.helpers import to_quarter_hours
+
+NOW_DT = datetime(2023, 12, 13, 20, 43, 0)
+PRICES = P231213 + P231214
+
+
+def test_optimizer_covers_every_slot_within_tolerance():
+    ret = optimize_offsets(PRICES, NOW_DT, tolerance=3)
+    assert len(ret) == 48
+    assert list(ret.keys())[0] == datetime(2023, 12, 13, 0, 0)
+    assert all(-3 <= v <= 3 for v in ret.values())
+
+
+def test_optimizer_respects_ramp_limit():
+    ret = list(optimize_offsets(PRICES, NOW_DT, tolerance=3, ramp_limit=1).values())
+    assert all(abs(a - b) <= 1 for a, b in zip(ret, ret[1:]))
+
+
+@pytest.mark.parametrize("ramp_limit", [1, 2])
+def test_optimizer_respects_ramp_limit_per_hour_for_quarter_hours(ramp_limit):
+    ret = list(optimize_offsets(to_quarter_hours(PRICES), NOW_DT, tolerance=3, ramp_limit=ramp_limit).values())
+    assert len(ret) == 192
+    for i in range(len(ret) - 4):
+        window = ret[i:i + 5]
+        assert sum(abs(a - b) for a, b in zip(window, window[1:])) <= ramp_limit
+
+
+def test_optimizer_heats_cheap_and_lowers_expensive_slots():
+    ret = list(optimize_offsets(PRICES, NOW_DT, tolerance=3).values())
+    assert ret[PRICES.index(min(PRICES))] > ret[PRICES.index(max(PRICES))]
+
+
+def test_optimizer_extended_away_never_raises():
+    ret = optimize_offsets(PRICES, NOW_DT, tolerance=3, preset=HvacPresets.ExtendedAway)
+    assert max(ret.values()) <= 0
+
+
+def test_optimizer_peaks_are_not_raised_above_neighbours():
+    peaks = identify_peaks(P231213)
+    with_peaks = optimize_offsets(PRICES, NOW_DT, tolerance=3, peaks=peaks)
+    without = optimize_offsets(PRICES, NOW_DT, tolerance=3)
+    assert sum(list(with_peaks.values())[p] for p in peaks) <= sum(list(without.values())[p] for p in peaks)
+
+
+def test_optimizer_flat_and_empty_prices():
+    assert optimize_offsets([], NOW_DT, tolerance=3) == {}
+    ret = optimize_offsets(PRICES, NOW_DT, tolerance=0)
+    assert len(ret) == 48 and set(ret.values()) == {0}
+    assert set(optimize_offsets([1.0] * 24, NOW_DT, tolerance=3).values()) == {0}
+
+
+def test_optimizer_raises_when_over_budget():
+    with pytest.raises(OptimizerTimeout):
+        optimize_offsets(PRICES, NOW_DT, tolerance=3, budget=-1)
+
+
+def test_plan_uses_optimizer_in_optimized_mode():
+    plan = _plan(mode=OffsetPlanningMode.Optimized)
+    assert plan.raw_offsets == optimize_offsets(
+        PRICES, NOW_DT, tolerance=3, peaks=plan.peaks_today + [p + 24 for p in plan.peaks_tomorrow])
+
+
+def test_plan_modes_are_cached_separately():
+    cache = OffsetCache()
+    heuristic = _plan(cache=cache)
+    optimized = _plan(cache=cache, mode=OffsetPlanningMode.Optimized)
+    assert cache.misses == 2
+    assert _plan(cache=cache).raw_offsets == heuristic.raw_offsets
+    assert _plan(cache=cache, mode=OffsetPlanningMode.Optimized).raw_offsets == optimized.raw_offsets
+    assert cache.hits == 2
+
+
+def test_timeout_fallback_is_not_cached_as_optimized(monkeypatch):
+    from ..service.hvac.offset import offset_pipeline
+
+    def _timeout(**kwargs):
+        raise OptimizerTimeout("over budget")
+    cache = OffsetCache()
+    monkeypatch.setattr(offset_pipeline, "optimize_offsets", _timeout)
+    fallback = _plan(cache=cache, mode=OffsetPlanningMode.Optimized)
+    assert fallback.raw_offsets == _plan().raw_offsets
+    monkeypatch.setattr(offset_pipeline, "optimize_offsets", optimize_offsets)
+    optimized = _plan(cache=cache, mode=OffsetPlanningMode.Optimized)
+    assert optimized.raw_offsets == _plan(mode=OffsetPlanningMode.Optimized).raw_offsets
+    assert _plan(cache=cache).raw_offsets == fallback.raw_offsets
+    assert cache.hits == 1
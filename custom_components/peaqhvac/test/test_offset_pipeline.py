@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from ..service.hvac.offset.offset_cache import OffsetCache
+from ..service.hvac.offset.offset_pipeline import build_offset_plan
+from ..service.hvac.offset.offset_utils import offset_per_day, set_offset_dict
+from ..service.hvac.offset.peakfinder import identify_peaks, smooth_transitions
+from ..service.models.enums.hvac_presets import HvacPresets
+from .test_offsets import P231213, P231214
+
+NOW_DT = datetime(2023, 12, 13, 20, 43, 0)
+
+
+def _plan(**kwargs):
+    args = dict(prices=P231213, prices_tomorrow=P231214, min_price=0, tolerance=3,
+                preset=HvacPresets.Normal, dt=NOW_DT)
+    args.update(kwargs)
+    return build_offset_plan(**args)
+
+
+@pytest.mark.asyncio
+async def test_plan_matches_staged_calculation():
+    prices = P231213 + P231214
+    offsets = offset_per_day(
+        day_values=await set_offset_dict(prices, NOW_DT, 0, {}),
+        all_prices=prices,
+        tolerance=3,
+        indoors_preset=HvacPresets.Normal,
+    )
+    plan = _plan()
+    assert plan.raw_offsets == smooth_transitions(vals=offsets, tolerance=3)
+    assert plan.calculated_offsets == plan.raw_offsets
+    assert plan.peaks_today == identify_peaks(P231213)
+    assert plan.peaks_tomorrow == identify_peaks(P231214)
+
+
+def test_plan_weather_adjustment_is_clamped():
+    plan = _plan(weather_adjustment=lambda raw: {k: v + 5 for k, v in raw.items()})
+    assert plan.calculated_offsets != plan.raw_offsets
+    assert all(abs(v) <= 3 for v in plan.calculated_offsets.values())
+
+
+def test_plan_without_weather_result_keeps_raw():
+    plan = _plan(weather_adjustment=lambda raw: {})
+    assert plan.calculated_offsets == plan.raw_offsets
+
+
+def test_plan_reuses_cached_stages():
+    cache = OffsetCache()
+    first = _plan(cache=cache)
+    second = _plan(cache=cache)
+    assert first.raw_offsets == second.raw_offsets
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from ..service.hvac.offset.models.offset_timeline import OffsetTimeline
+
+START = datetime(2024, 9, 11)
+
+
+def _plan(values: list[int], minutes: int = 60) -> dict:
+    return {START + timedelta(minutes=minutes * i): v for i, v in enumerate(values)}
+
+
+def test_value_at_finds_current_slot():
+    timeline = OffsetTimeline(_plan([1, 2, 3]))
+    assert timeline.value_at(START + timedelta(minutes=59)) == 1
+    assert timeline.value_at(START + timedelta(hours=1)) == 2
+    assert timeline.value_at(START + timedelta(hours=5)) == 3
+
+
+def test_value_at_before_first_slot():
+    timeline = OffsetTimeline(_plan([1, 2, 3]))
+    assert timeline.value_at(START - timedelta(minutes=1)) is None
+
+
+def test_next_change_skips_equal_slots():
+    timeline = OffsetTimeline(_plan([1, 1, 1, 2, 2, 0]))
+    assert timeline.next_change(START + timedelta(minutes=20)) == START + timedelta(hours=3)
+    assert timeline.next_change(START + timedelta(hours=3)) == START + timedelta(hours=5)
+
+
+def test_next_change_none_when_plan_is_flat_ahead():
+    timeline = OffsetTimeline(_plan([1, 2, 2, 2]))
+    assert timeline.next_change(START + timedelta(hours=1, minutes=5)) is None
+
+
+def test_next_change_before_first_slot_is_first_slot():
+    timeline = OffsetTimeline(_plan([1, 2]))
+    assert timeline.next_change(START - timedelta(hours=1)) == START
+
+
+def test_unordered_quarter_hour_plan():
+    plan = _plan([0, 0, -1, -1, 2], minutes=15)
+    timeline = OffsetTimeline(dict(reversed(plan.items())))
+    assert timeline.value_at(START + timedelta(minutes=31)) == -1
+    assert timeline.next_change(START) == START + timedelta(minutes=30)
+
+
+def test_empty_timeline():
+    timeline = OffsetTimeline()
+    assert len(timeline) == 0
+    assert timeline.value_at(START) is None
+    assert timeline.next_change(START) is None
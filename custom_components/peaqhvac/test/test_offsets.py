@@ -1,10 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import random
 import pytest
 from ..service.hvac.house_heater.models.calculated_offset import CalculatedOffsetModel
-from ..service.hvac.offset.offset_utils import (offset_per_day, set_offset_dict, adjust_to_threshold)
+from ..service.hvac.offset.offset_utils import (offset_per_day, set_offset_dict, adjust_to_threshold,
+                                                max_price_lower_internal)
 from ..service.hvac.offset.peakfinder import smooth_transitions
 from ..service.models.enums.hvac_presets import HvacPresets
+from ..service.models.offsets_exportmodel import OffsetsExportModel
+from ..service.models.slot_resolution import SlotResolution
 
 P231213 = [1.17, 1.14, 1.14, 1.11, 1.11, 1.14, 1.25, 1.59, 2.09, 2.09, 2.13, 2.14,2.14, 1.61, 1.59, 1.62, 1.61, 1.68, 1.61, 1.52, 1.44, 1.36, 1.38, 1.27]
 P231214 = [1.17, 1.15, 1.16, 1.16, 1.19, 1.24, 1.47, 1.81, 1.97, 2.19, 2.19, 1.92,1.81, 1.99, 2.19, 2.73, 2.73, 2.63, 2.11, 1.81, 1.62, 1.43, 1.41, 1.28]
@@ -97,4 +100,45 @@ async def test_adjust_to_treshold_no_exceeding_values():
     for k,v in smooth.items():
         model = CalculatedOffsetModel(current_offset=v, current_tempdiff=random.uniform(-1, 1), current_temp_trend_offset=random.uniform(-1, 1))
         adj = adjust_to_threshold(model, 0, _tolerance)
-        assert abs(adj) <= _tolerance
\ No newline at end of file
+        assert abs(adj) <= _tolerance
+
+@pytest.mark.asyncio
+async def test_quarter_hour_offsets_match_hourly():
+    prices = P231213 + P231214
+    quarters = [p for p in prices for _ in range(4)]
+    now_dt = datetime(2023, 12, 13, 20, 43, 0)
+    hourly = await set_offset_dict(prices, now_dt, 0, {})
+    quarterly = await set_offset_dict(quarters, now_dt, 0, {})
+    assert len(quarterly) == 4 * len(hourly)
+    for k, v in hourly.items():
+        assert quarterly[k] == pytest.approx(v, abs=0.05)
+        assert quarterly[k + timedelta(minutes=45)] == pytest.approx(v, abs=0.05)
+
+
+def test_slot_resolution_from_prices():
+    assert SlotResolution.from_prices(P231213).minutes == 60
+    assert SlotResolution.from_prices(P231213 * 8).minutes == 15
+    assert SlotResolution(15).index_of(datetime(2023, 12, 13, 10, 31)) == 42
+    assert SlotResolution(15).hour_of(42) == 10
+
+
+def test_max_price_lower_quarter_hour_slots():
+    resolution = SlotResolution(15)
+    assert max_price_lower_internal(1, [42], resolution, datetime(2023, 12, 13, 10, 31))
+    assert max_price_lower_internal(1, [42], resolution, datetime(2023, 12, 13, 10, 26))
+    assert not max_price_lower_internal(1, [42], resolution, datetime(2023, 12, 13, 10, 20))
+    assert not max_price_lower_internal(0.2, [42], resolution, datetime(2023, 12, 13, 10, 31))
+
+
+def test_max_price_lower_hourly_looks_ahead_last_minutes():
+    assert max_price_lower_internal(1, [11], now=datetime(2023, 12, 13, 10, 51))
+    assert not max_price_lower_internal(1, [11], now=datetime(2023, 12, 13, 10, 50))
+    assert not max_price_lower_internal(1, [0], now=datetime(2023, 12, 13, 23, 55))
+
+
+def test_export_model_current_raw_offset_by_slot():
+    model = OffsetsExportModel(([], []), SlotResolution(15))
+    now = datetime.now()
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    model.raw_offsets = {start + timedelta(minutes=15 * i): i for i in range(96)}
+    assert model.current_raw_offset == SlotResolution(15).index_of(now)
@@ -1,5 +1,10 @@
+from datetime import datetime, timedelta
+
 import pytest
-from ..service.hvac.offset.peakfinder import identify_peaks
+from ..service.hvac.offset.peakfinder import (extract_price_features, find_single_valleys, identify_peaks,
+                                              identify_valleys, smooth_transitions)
+from .legacy import legacy_find_single_valleys, legacy_identify_peaks, legacy_identify_valleys
+from .test_offsets import P231213, P231214
 
 P240910 = [0.07,0.07,0.06,0.06,0.07,0.07,0.08,0.11,0.11,0.11,0.11,0.1,0.08,0.08,0.08,0.08,0.08,0.12,0.12,0.12,0.11,0.1,0.08,0.08]
 P240911 = [0.08,0.08,0.08,0.08,0.09,0.11,0.13,0.21,0.6,0.6,0.6,0.59,0.4,0.37,0.32,0.15,0.22,0.35,0.3,0.21,0.14,0.12,0.12,0.11]
@@ -15,3 +20,76 @@ def test_single_peak():
 
 
 
+
+
+def test_features_find_fixed_peaks_and_valleys():
+    features = extract_price_features(P240911 + P240910)
+    assert features.peaks == [17]
+    assert features.valleys == []
+    assert features.single_valleys == []
+    assert len(features.prominence) == 48
+    features = extract_price_features(P231213 + P231214)
+    assert features.peaks == []
+    assert features.valleys == [14, 16, 21, 25]
+    assert features.single_valleys == [14, 16, 21, 25, 36]
+
+
+def test_single_functions_match_legacy():
+    prices = P231213 + P231214
+    assert identify_peaks(prices) == legacy_identify_peaks(prices)
+    assert identify_valleys(prices) == legacy_identify_valleys(prices)
+    assert find_single_valleys(prices) == legacy_find_single_valleys(prices)
+
+
+def test_features_prominence_positive_on_peak():
+    features = extract_price_features(P240911)
+    assert all(features.prominence[p] > 0 for p in features.peaks)
+
+
+def test_features_prominence_flat_prices():
+    features = extract_price_features([0.5] * 24)
+    assert features.prominence == [0] * 24
+
+
+def test_features_empty_prices():
+    features = extract_price_features([])
+    assert features.peaks == []
+    assert features.valleys == []
+    assert features.prominence == []
+
+
+def _plan(values: list[int], minutes: int = 60) -> dict:
+    start = datetime(2024, 9, 11)
+    return {start + timedelta(minutes=minutes * i): v for i, v in enumerate(values)}
+
+
+def test_smooth_single_anomaly_pulled_towards_neighbors():
+    ret = smooth_transitions(_plan([2, 2, -2, 2, 2]), tolerance=3, ramp_limit=10)
+    assert list(ret.values()) == [2, 2, 0, 2, 2]
+
+
+def test_smooth_small_single_anomaly_is_kept():
+    ret = smooth_transitions(_plan([1, 1, 0, 1, 1]), tolerance=3, ramp_limit=10)
+    assert list(ret.values()) == [1, 1, 0, 1, 1]
+
+
+def test_smooth_upwards_transition_is_ramped():
+    ret = smooth_transitions(_plan([-3, -3, -3, 3, 3]), tolerance=3, ramp_limit=2)
+    assert list(ret.values()) == [-3, -1, 1, 3, 3]
+
+
+def test_smooth_downwards_transition_is_untouched():
+    ret = smooth_transitions(_plan([3, 3, -3, -3]), tolerance=3)
+    assert list(ret.values()) == [3, 3, -3, -3]
+
+
+def test_smooth_quarter_hours_ramps_per_hour():
+    values = [-3] * 8 + [3] * 4
+    ret = smooth_transitions(_plan(values, minutes=15), tolerance=3, ramp_limit=2)
+    assert list(ret.values()) == [-1] * 4 + [1] * 4 + [3] * 4
+
+
+def test_smooth_returns_keys_in_order():
+    plan = _plan([0, 1, 2, 3])
+    ret = smooth_transitions(dict(reversed(plan.items())), tolerance=3)
+    assert list(ret.keys()) == sorted(plan.keys())
@@ -0,0 +1,77 @@
+from datetime import datetime
+from math import exp
+
+import pytest
+
+from ..service.hvac.water_heater.models.tank_heat_loss_model import TankHeatLossModel
+from ..service.hvac.water_heater.water_heater_next_start import NextStartPostModel, NextWaterBoost
+from .test_water_heater_next_start_new import P240130, P240131
+
+K = 0.02
+AMBIENT = 20
+
+
+def _cooling(start_temp: float, hours: float) -> float:
+    return AMBIENT + (start_temp - AMBIENT) * exp(-K * hours)
+
+
+def _trained(samples: int = 60, interval: float = 600, start_temp: float = 50) -> TankHeatLossModel:
+    model = TankHeatLossModel()
+    for i in range(samples):
+        t = i * interval
+        model.add_reading(_cooling(start_temp, t / 3600), t)
+    return model
+
+
+def test_model_learns_cooling_curve():
+    model = _trained()
+    assert model.is_ready
+    assert model.b == pytest.approx(-K, rel=0.05)
+    assert model.equilibrium_temp == pytest.approx(AMBIENT, abs=1.5)
+
+
+def test_forecast_matches_closed_form():
+    model = _trained()
+    hours = [h / 2 for h in range(48)]
+    forecast = model.forecast(45, hours)
+    assert len(forecast) == 48
+    assert all(f == pytest.approx(_cooling(45, h), abs=0.2) for f, h in zip(forecast, hours))
+
+
+def test_model_needs_samples_before_forecasting():
+    model = _trained(samples=5)
+    assert not model.is_ready
+    assert model.forecast(45, [1, 2]) is None
+
+
+def test_heating_and_outlier_readings_are_ignored():
+    model = _trained()
+    a, b, samples = model.a, model.b, model.samples
+    t = 60 * 600
+    model.add_reading(40, t)
+    model.add_reading(50, t + 600, heating=True)
+    model.add_reading(55, t + 1200)
+    model.add_reading(54.9, t + 1210)
+    assert (model.a, model.b) != (a, b)
+    assert model.samples == samples + 1
+
+
+def test_planner_uses_learned_heat_loss():
+    heat_loss = _trained()
+    args = dict(prices=P240130 + P240131, demand_hours=[20, 21], non_hours=[11, 12], current_temp=45,
+                temp_trend=-0.5, dt=datetime(2024, 1, 30, 13, 2), latest_boost=datetime(2024, 1, 30, 2))
+    learned = _planner(args["dt"]).get_data(NextStartPostModel(heat_loss=heat_loss, **args))
+    linear = _planner(args["dt"]).get_data(NextStartPostModel(**args))
+    hours = [(d.time - args["dt"]).total_seconds() / 3600 for d in learned]
+    assert [d.water_temp for d in learned] == [max(10, round(_cooling_from(heat_loss, 45, h), 1)) for h in hours]
+    assert learned[-1].water_temp != linear[-1].water_temp
+
+
+def _planner(dt: datetime) -> NextWaterBoost:
+    ret = NextWaterBoost()
+    ret.dt = dt
+    return ret
+
+
+def _cooling_from(model: TankHeatLossModel, temp: float, hours: float) -> float:
+    return model.forecast(temp, [hours])[0]
@@ -0,0 +1,50 @@
+from tools.water_boost_backtest import BacktestConfig, TankState, run_backtest, run_backtests, simulate_day
+
+from .benchmarks.helpers import to_quarter_hours
+from .test_water_heater_next_start_new import (P240126, P240129, P240130, P240131, P240201, P240202, P240203,
+                                               P240314, P240315)
+
+WATER_DAYS = [P240126, P240129, P240130, P240131, P240201, P240202, P240203, P240314, P240315]
+TWO_WEEKS = [WATER_DAYS[i % len(WATER_DAYS)] for i in range(14)]
+
+
+def test_day_reports_boosts_cost_and_min_temp():
+    day, _ = simulate_day(0, P240130, P240131, BacktestConfig())
+    assert day.boosts > 0
+    assert day.cost > 0
+    assert 10 < day.min_temp < BacktestConfig().start_temp
+
+
+def test_result_sums_days():
+    result = run_backtest(TWO_WEEKS)
+    assert len(result.days) == 14
+    assert result.boosts == sum(d.boosts for d in result.days)
+    assert result.min_temp == min(d.min_temp for d in result.days)
+    assert "14 days" in str(result)
+
+
+def test_tank_is_carried_into_the_next_day():
+    first, state = simulate_day(0, P240130, P240131, BacktestConfig())
+    assert state.temp == first.end_temp
+    second, _ = simulate_day(1, P240131, [], BacktestConfig(), state)
+    result = run_backtest([P240130, P240131])
+    assert result.days == [first, second]
+    cold, _ = simulate_day(1, P240131, [], BacktestConfig(), TankState(temp=20, latest_boost=state.latest_boost))
+    assert cold.min_temp < second.min_temp
+
+
+def test_process_pool_matches_sequential_runs():
+    runs = [(TWO_WEEKS[:4], BacktestConfig()), (TWO_WEEKS[:4], BacktestConfig(target_temp=52, max_target_temp=58))]
+    assert run_backtests(runs, workers=2) == run_backtests(runs, workers=1)
+
+
+def test_higher_target_uses_more_energy():
+    low = run_backtest(TWO_WEEKS, BacktestConfig(target_temp=45, max_target_temp=50))
+    high = run_backtest(TWO_WEEKS, BacktestConfig(target_temp=52, max_target_temp=58))
+    assert high.energy_kwh > low.energy_kwh
+
+
+def test_quarter_hour_prices_are_replayed():
+    result = run_backtest([to_quarter_hours(d) for d in TWO_WEEKS[:3]])
+    assert result.boosts > 0
+    assert result.min_temp > 10
@@ -0,0 +1,170 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ..service.hvac.water_heater import cycle_waterboost
+from ..service.hvac.water_heater.cycle_waterboost import WaterBoostCycle
+from ..service.models.enums.hvacoperations import HvacOperations
+from ..service.models.enums.water_boost_state import WaterBoostState
+
+
+class FakeHass:
+    def __init__(self):
+        self.bus = MagicMock()
+
+    def async_create_task(self, target, eager_start=False):
+        return asyncio.get_running_loop().create_task(target)
+
+
+class Trackers:
+    """Captures the state change and point in time callbacks the cycle registers."""
+    def __init__(self):
+        self.state_listeners: dict[str, object] = {}
+        self.point_in_time: list = []
+        self.unsubscribed = 0
+
+    def track_state(self, hass, entities, action):
+        for e in entities:
+            self.state_listeners[e] = action
+        return self._unsub
+
+    def track_point(self, hass, action, point):
+        self.point_in_time.append((action, point))
+        return self._unsub
+
+    def _unsub(self):
+        self.unsubscribed += 1
+
+    def fire(self, entity: str, state: str):
+        self.state_listeners[entity](MagicMock(data={"new_state": MagicMock(state=state)}))
+
+
+@pytest.fixture
+def trackers(monkeypatch):
+    ret = Trackers()
+    monkeypatch.setattr(cycle_waterboost, "async_track_state_change_event", ret.track_state)
+    monkeypatch.setattr(cycle_waterboost, "async_track_point_in_time", ret.track_point)
+    monkeypatch.setattr(cycle_waterboost, "COOLDOWN", 0)
+    return ret
+
+
+def _cycle(current_temp: float = 40, peaqev: bool = False, above_stop: bool = False):
+    hub = MagicMock()
+    hub.hvac.water_heater.current_temperature = current_temp
+    hub.hvac.get_sensor.return_value = "sensor.water"
+    hub.sensors.peaqev_installed = peaqev
+    hub.sensors.peaqev_facade.above_stop_threshold = above_stop
+    hub.observer.async_broadcast = AsyncMock()
+    update_system = AsyncMock(return_value=True)
+    return WaterBoostCycle(FakeHass(), hub, update_system), update_system, hub
+
+
+def _set_vals(update_system: AsyncMock) -> list:
+    assert all(c.kwargs["operation"] == HvacOperations.WaterBoost for c in update_system.call_args_list)
+    return [c.kwargs["set_val"] for c in update_system.call_args_list]
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_boost_stops_on_first_event_reaching_target(trackers):
+    cycle, update_system, hub = _cycle()
+    assert cycle.start(50)
+    await _settle()
+    assert cycle.state is WaterBoostState.Boosting
+    trackers.fire("sensor.water", "45")
+    await _settle()
+    assert cycle.state is WaterBoostState.Boosting
+    trackers.fire("sensor.water", "50.5")
+    await cycle._task
+    assert _set_vals(update_system) == [1, 0, 0]
+    assert cycle.state is WaterBoostState.Idle
+    assert trackers.unsubscribed == 1
+    hub.observer.async_broadcast.assert_awaited_once_with("water boost done")
+    cycle._hass.bus.fire.assert_called_once_with("peaqhvac.water_heater_warning", {"new": False})
+
+
+@pytest.mark.asyncio
+async def test_boost_is_single_flight(trackers):
+    cycle, update_system, _ = _cycle()
+    assert cycle.start(50)
+    assert not cycle.start(55)
+    await _settle()
+    assert not cycle.start(55)
+    assert cycle.target_temp == 50
+    trackers.fire("sensor.water", "51")
+    await cycle._task
+    assert _set_vals(update_system) == [1, 0, 0]
+    assert cycle.start(55)
+    await cycle.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_boost_already_at_target_stops_immediately(trackers):
+    cycle, update_system, _ = _cycle(current_temp=52)
+    cycle.start(50)
+    await cycle._task
+    assert _set_vals(update_system) == [1, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_boost_times_out(trackers, monkeypatch):
+    monkeypatch.setattr(cycle_waterboost, "BOOST_TIMEOUT", 0.01)
+    cycle, update_system, _ = _cycle()
+    cycle.start(50)
+    await cycle._task
+    assert _set_vals(update_system) == [1, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_boost_stops_on_threshold_inside_peak_window(trackers, monkeypatch):
+    monkeypatch.setattr(cycle_waterboost, "datetime", _frozen(datetime(2024, 1, 30, 13, 30)))
+    cycle, update_system, hub = _cycle(peaqev=True)
+    cycle.start(50)
+    await _settle()
+    hub.sensors.peaqev_facade.above_stop_threshold = True
+    trackers.fire(cycle_waterboost.PEAQEV_THRESHOLD_ENTITY, "110")
+    await cycle._task
+    assert _set_vals(update_system) == [1, 0, 0]
+    assert trackers.unsubscribed == 2
+
+
+@pytest.mark.asyncio
+async def test_boost_waits_for_peak_window(trackers, monkeypatch):
+    monkeypatch.setattr(cycle_waterboost, "datetime", _frozen(datetime(2024, 1, 30, 13, 5)))
+    cycle, update_system, _ = _cycle(peaqev=True, above_stop=True)
+    cycle.start(50)
+    await _settle()
+    assert cycle.state is WaterBoostState.Boosting
+    action, point = trackers.point_in_time[0]
+    assert point == datetime(2024, 1, 30, 13, 20)
+    monkeypatch.setattr(cycle_waterboost, "datetime", _frozen(point))
+    action(point)
+    await cycle._task
+    assert _set_vals(update_system) == [1, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_and_turns_off(trackers):
+    cycle, update_system, hub = _cycle()
+    cycle.start(50)
+    await _settle()
+    await cycle.async_shutdown()
+    assert _set_vals(update_system) == [1, 0]
+    assert cycle.state is WaterBoostState.Idle
+    assert not cycle.is_running
+    assert trackers.unsubscribed == 1
+    hub.observer.async_broadcast.assert_not_awaited()
+
+
+def _frozen(dt: datetime):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return dt
+    return FrozenDatetime
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ..service.hvac.water_heater import water_heater_coordinator
+from ..service.hvac.water_heater.models.next_water_boost_model import NextWaterBoostModel
+from ..service.hvac.water_heater.models.water_boost_data import WaterBoostData
+from ..service.hvac.water_heater.water_heater_coordinator import WaterHeater
+from ..service.models.enums.hvac_presets import HvacPresets
+from ..service.observer.iobserver_coordinator import IObserver
+from .test_water_heater_next_start_new import P240130, P240131
+
+NOW_DT = datetime(2024, 1, 30, 13, 2)
+LATEST_BOOST = datetime(2024, 1, 30, 2, 0)
+
+
+def _update(model: NextWaterBoostModel, **kwargs) -> bool:
+    args = dict(temp=41, temp_trend=-1, target_temp=None, prices_today=P240130, prices_tomorrow=P240131,
+                preset=HvacPresets.Normal, now_dt=NOW_DT, latest_boost=LATEST_BOOST, min_price=0.1)
+    args.update(kwargs)
+    model.update(**args)
+    ret = model.data.should_update
+    model.data.should_update = False
+    return ret
+
+
+def _model() -> NextWaterBoostModel:
+    model = NextWaterBoostModel(WaterBoostData(non_hours_raw=[11, 12], demand_hours_raw=[20, 21]))
+    _update(model)
+    return model
+
+
+def test_unchanged_inputs_are_clean():
+    model = _model()
+    assert not _update(model)
+    assert not _update(model, now_dt=NOW_DT + timedelta(minutes=30))
+
+
+@pytest.mark.parametrize("change", [
+    {"temp": 40.5},
+    {"temp_trend": -2},
+    {"temp_trend": 3},
+    {"preset": HvacPresets.Eco},
+    {"min_price": 0.2},
+    {"latest_boost": NOW_DT},
+    {"prices_tomorrow": []},
+    {"now_dt": NOW_DT + timedelta(hours=1)},
+])
+def test_changed_inputs_are_dirty(change):
+    model = _model()
+    assert _update(model, **change)
+
+
+def test_quarter_hour_slot_change_is_dirty():
+    quarter = [p for p in P240130 for _ in range(4)]
+    model = _model()
+    _update(model, prices_today=quarter, prices_tomorrow=[])
+    assert not _update(model, prices_today=quarter, prices_tomorrow=[], now_dt=NOW_DT + timedelta(minutes=5))
+    assert _update(model, prices_today=quarter, prices_tomorrow=[], now_dt=NOW_DT + timedelta(minutes=15))
+
+
+def test_recent_boost_window_ending_is_dirty():
+    model = _model()
+    _update(model, latest_boost=NOW_DT - timedelta(minutes=50))
+    assert _update(model, latest_boost=NOW_DT - timedelta(minutes=50), now_dt=NOW_DT + timedelta(minutes=12))
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW_DT
+
+
+def _water_heater() -> WaterHeater:
+    hub = MagicMock()
+    hub.spotprice.model.prices = P240130
+    hub.spotprice.model.prices_tomorrow = P240131
+    options = MagicMock()
+    options.heating.non_hours_water_boost = [11, 12]
+    options.heating.demand_hours_water_boost = [20, 21]
+    sensors = MagicMock()
+    sensors.peaqev_facade.min_price = 0.1
+    sensors.set_temp_indoors.preset = HvacPresets.Normal
+    heater = WaterHeater(hub, IObserver(), options, sensors)
+    heater._current_temp = 41
+    heater.model.latest_boost_call = LATEST_BOOST.timestamp()
+    heater.temp_trend = MagicMock(gradient_raw=-1)
+    return heater
+
+
+@patch.object(water_heater_coordinator, "datetime", FrozenDatetime)
+def test_water_heater_reuses_plan_until_inputs_change():
+    heater = _water_heater()
+    heater.next.get_next_start = MagicMock(wraps=heater.next.get_next_start)
+    first = heater._get_next_start_plan()
+    second = heater._get_next_start_plan()
+    assert first == second
+    assert first is not second
+    assert heater.next.get_next_start.call_count == 1
+    assert (heater.plan_cache_hits, heater.plan_cache_misses) == (1, 1)
+    heater._current_temp = 39
+    heater._get_next_start_plan()
+    assert heater.next.get_next_start.call_count == 2
+    assert (heater.plan_cache_hits, heater.plan_cache_misses) == (1, 2)
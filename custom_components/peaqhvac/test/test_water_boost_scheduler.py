@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from ..service.hvac.water_heater import water_heater_coordinator
+from ..service.hvac.water_heater.water_boost_scheduler import plan_boosts
+from ..service.hvac.water_heater.water_heater_next_start import (BOOST_LEAD, MAX_TARGET_TEMP, TARGET_TEMP,
+                                                                   NextStartPostModel, NextWaterBoost)
+from ..service.models.enums.hvac_presets import HvacPresets
+from ..service.models.enums.water_boost_planning_mode import WaterBoostPlanningMode
+from .test_tank_heat_loss_model import _trained
+from .test_water_boost_plan_cache import FrozenDatetime, NOW_DT, _water_heater
+from .test_water_heater_next_start_new import P240130, P240131
+
+DT = datetime(2024, 1, 30, 0, 5)
+
+
+def _model(**kwargs) -> NextStartPostModel:
+    args = dict(prices=P240130 + P240131, demand_hours=[7, 20, 21], non_hours=[11, 12, 16, 17],
+                current_temp=44, temp_trend=-0.8, dt=DT, latest_boost=DT - timedelta(days=1))
+    args.update(kwargs)
+    return NextStartPostModel(**args)
+
+
+def test_plans_multiple_boosts_over_the_horizon():
+    plan = plan_boosts(_model())
+    assert len(plan) >= 2
+    assert [b.next_start for b in plan] == sorted(b.next_start for b in plan)
+    assert plan[-1].next_start.date() > DT.date()
+    assert all(b.target_temp in (TARGET_TEMP, MAX_TARGET_TEMP) for b in plan)
+
+
+def test_boosts_are_never_planned_in_non_hours():
+    plan = plan_boosts(_model())
+    assert all(b.next_start.hour not in [11, 12, 16, 17] for b in plan)
+    assert all((b.next_start + BOOST_LEAD).hour not in [11, 12, 16, 17] for b in plan)
+
+
+def test_water_is_warm_for_demand_hours():
+    plan = plan_boosts(_model(current_temp=41, temp_trend=-1))
+    assert plan[0].next_start < DT.replace(hour=7)
+
+
+def test_warm_tank_that_barely_cools_is_not_boosted():
+    assert plan_boosts(_model(current_temp=52, temp_trend=0.1, prices=P240130)) == []
+
+
+def test_no_boost_within_an_hour_of_the_latest_boost():
+    plan = plan_boosts(_model(current_temp=35, latest_boost=DT - timedelta(minutes=20)))
+    assert plan[0].next_start >= DT - timedelta(minutes=20) + timedelta(hours=1)
+
+
+def test_min_price_boosts_to_max_target():
+    plan = plan_boosts(_model(min_price=10))
+    assert plan and all(b.target_temp == MAX_TARGET_TEMP for b in plan)
+
+
+def test_boost_is_moved_to_cheaper_slot():
+    prices = [1.0] * 24
+    prices[3] = 0.2
+    plan = plan_boosts(_model(prices=prices, current_temp=43, temp_trend=-0.5, demand_hours=[], non_hours=[]))
+    assert plan[0].next_start + BOOST_LEAD == DT.replace(hour=3, minute=0)
+
+
+def test_scheduled_boost_leads_its_slot_like_the_greedy_planner():
+    model = _model(current_temp=41, temp_trend=-1)
+    greedy = NextWaterBoost().get_next_start(model)
+    plan = plan_boosts(model)
+    assert greedy.next_start.minute == 60 - BOOST_LEAD.seconds // 60
+    assert all(b.next_start.minute == greedy.next_start.minute for b in plan)
+
+
+def test_quarter_hour_plan_starts_on_slots():
+    quarter = [p for p in P240130 for _ in range(4)]
+    plan = plan_boosts(_model(prices=quarter))
+    assert plan and all((b.next_start + BOOST_LEAD).minute % 15 == 0 for b in plan)
+
+
+def test_learned_cooling_curve_is_used():
+    slow = plan_boosts(_model(prices=P240130, temp_trend=-3))
+    learned = plan_boosts(_model(prices=P240130, temp_trend=-3, heat_loss=_trained()))
+    assert len(learned) < len(slow)
+
+
+def test_away_preset_lowers_the_water_limit():
+    normal = plan_boosts(_model(prices=P240130, current_temp=38))
+    away = plan_boosts(_model(prices=P240130, current_temp=38, hvac_preset=HvacPresets.Away))
+    assert away[0].next_start > normal[0].next_start
+
+
+@patch.object(water_heater_coordinator, "datetime", FrozenDatetime)
+def test_water_heater_schedule_is_recalculated_on_price_or_tank_change():
+    heater = _water_heater()
+    heater._options.water_boost_planning_mode = WaterBoostPlanningMode.Horizon
+    with patch.object(water_heater_coordinator, "plan_boosts", MagicMock(wraps=plan_boosts)) as planner:
+        first = heater._get_next_start_plan()
+        heater._current_temp = 41.3
+        assert heater._get_next_start_plan() == first
+        assert planner.call_count == 1
+        assert heater._next_start_plan == first
+        heater.heat_loss.samples += 1
+        heater._get_next_start_plan()
+        assert planner.call_count == 2
+        heater.hub.spotprice.model.prices_tomorrow = []
+        upcoming = heater._get_next_start_plan()
+        assert planner.call_count == 3
+    assert (heater.plan_cache_hits, heater.plan_cache_misses) == (1, 3)
+    assert upcoming == heater.boost_schedule[0]
+    assert upcoming.next_start + BOOST_LEAD + timedelta(hours=1) > NOW_DT
+    assert heater.export_state().next_target == upcoming.target_temp
+
+
+@patch.object(water_heater_coordinator, "datetime", FrozenDatetime)
+def test_water_heater_schedule_follows_a_large_draw():
+    heater = _water_heater()
+    heater._options.water_boost_planning_mode = WaterBoostPlanningMode.Horizon
+    with patch.object(water_heater_coordinator, "plan_boosts", MagicMock(wraps=plan_boosts)) as planner:
+        heater._get_next_start_plan()
+        heater._current_temp = 30
+        heater._get_next_start_plan()
+        assert planner.call_count == 2
+        heater.temp_trend.gradient_raw = -4
+        heater._get_next_start_plan()
+        assert planner.call_count == 3
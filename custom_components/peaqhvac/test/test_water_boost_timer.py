@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ..service.hvac.water_heater import water_heater_coordinator
+from .test_water_boost_plan_cache import _water_heater
+
+
+class Tracker:
+    def __init__(self):
+        self.armed: list[tuple] = []
+        self.cancelled: int = 0
+
+    def track_point(self, hass, action, point):
+        self.armed.append((action, point))
+
+        def _unsub():
+            self.cancelled += 1
+        return _unsub
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    ret = Tracker()
+    monkeypatch.setattr(water_heater_coordinator, "async_track_point_in_time", ret.track_point)
+    return ret
+
+
+def test_timer_is_armed_at_planned_start(tracker):
+    heater = _water_heater()
+    start = datetime.now() + timedelta(hours=2)
+    heater._arm_boost_timer(start)
+    heater._arm_boost_timer(start)
+    assert [p for _, p in tracker.armed] == [start]
+    assert tracker.cancelled == 0
+
+
+def test_changed_plan_rearms(tracker):
+    heater = _water_heater()
+    first = datetime.now() + timedelta(hours=2)
+    heater._arm_boost_timer(first)
+    heater._arm_boost_timer(first + timedelta(minutes=15))
+    assert [p for _, p in tracker.armed] == [first, first + timedelta(minutes=15)]
+    assert tracker.cancelled == 1
+
+
+@pytest.mark.parametrize("start", [datetime.max, datetime.now() - timedelta(minutes=1)])
+def test_no_timer_without_future_start(tracker, start):
+    heater = _water_heater()
+    heater._arm_boost_timer(datetime.now() + timedelta(hours=2))
+    heater._arm_boost_timer(start)
+    assert len(tracker.armed) == 1
+    assert tracker.cancelled == 1
+    assert heater._cancel_boost_timer is None
+
+
+@pytest.mark.asyncio
+async def test_fired_timer_runs_the_boost_check(tracker):
+    heater = _water_heater()
+    heater.async_update_operation = AsyncMock()
+    start = datetime.now() + timedelta(hours=2)
+    heater._arm_boost_timer(start)
+    action, _ = tracker.armed[0]
+    await action(start)
+    heater.async_update_operation.assert_awaited_once()
+    assert heater._cancel_boost_timer is None
+    heater._arm_boost_timer(start)
+    assert len(tracker.armed) == 2
+
+
+@pytest.mark.asyncio
+async def test_operation_arms_timer_from_plan(tracker):
+    heater = _water_heater()
+    heater.is_initialized = True
+    start = datetime.now() + timedelta(hours=3)
+
+    def _plan():
+        heater.model.next_water_heater_start = start
+        return None
+    heater._get_next_start = MagicMock(side_effect=_plan)
+    await heater.async_set_water_heater_operation(47)
+    await heater.async_set_water_heater_operation(47)
+    assert [p for _, p in tracker.armed] == [start]
+
+
+def test_cancel_unsubscribes(tracker):
+    heater = _water_heater()
+    heater._arm_boost_timer(datetime.now() + timedelta(hours=2))
+    heater.cancel_boost_timer()
+    heater.cancel_boost_timer()
+    assert tracker.cancelled == 1
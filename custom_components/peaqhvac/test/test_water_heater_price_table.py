@@ -0,0 +1,58 @@
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+
+from ..service.hvac.water_heater.models.price_table import COLD, NON, PriceData, PriceTable
+from ..service.hvac.water_heater.water_heater_next_start import NextStartPostModel, NextWaterBoost
+from .benchmarks.helpers import to_quarter_hours
+from .test_water_heater_next_start_new import P240130, P240131
+
+FIRST = datetime(2024, 1, 30, 0, 50)
+MAX_PLANNING_BYTES = 1024
+
+
+def _model(prices: list, current_temp: float) -> NextStartPostModel:
+    return NextStartPostModel(prices=prices, demand_hours=[7, 20, 21], non_hours=[11, 12, 16, 17],
+                              current_temp=current_temp, temp_trend=-1.5, dt=datetime(2024, 1, 30, 0, 7),
+                              latest_boost=datetime(2024, 1, 25))
+
+
+def test_rows_are_read_back_from_columns():
+    table = PriceTable()
+    table.reset(4, FIRST, timedelta(minutes=15))
+    table.append(0.5, 0.8, 41.2, COLD | NON, 47)
+    table.append(0.7, 1.1, 40.9, 0, 45)
+    assert table.size == 2
+    assert table.rows() == [
+        PriceData(0.5, 0.8, FIRST, 41.2, True, False, True, 47),
+        PriceData(0.7, 1.1, FIRST + timedelta(minutes=15), 40.9, False, False, False, 45),
+    ]
+
+
+def test_columns_only_grow():
+    table = PriceTable()
+    table.reset(192, FIRST, timedelta(minutes=15))
+    table.reset(24, FIRST, timedelta(hours=1))
+    assert len(table.price) == len(table.flags) == len(table.target) == 192
+    assert table.size == 0
+
+
+def test_price_data_has_no_instance_dict():
+    assert not hasattr(PriceData(0, 0, FIRST, 0, False, False, False, 0), "__dict__")
+
+
+@pytest.mark.parametrize("prices", [P240130 + P240131, to_quarter_hours(P240130 + P240131)])
+@pytest.mark.parametrize("current_temp", [60, 37])
+def test_planning_call_allocates_almost_nothing(prices, current_temp):
+    planner = NextWaterBoost()
+    model = _model(prices, current_temp)
+    expected = planner.get_next_start(model)
+    tracemalloc.start()
+    try:
+        ret = planner.get_next_start(model)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert ret == expected
+    assert peak < MAX_PLANNING_BYTES, f"planning {len(prices)} slots allocated {peak} bytes"
@@ -0,0 +1,181 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from ..service.hvac.water_heater import water_heater_store
+from ..service.hvac.water_heater.models.tank_heat_loss_model import TankHeatLossModel
+from ..service.hvac.water_heater.models.water_heater_state import WaterHeaterState
+from ..service.hvac.water_heater.water_heater_next_start import NextStartExportModel
+from ..service.hvac.water_heater.water_heater_store import WaterHeaterStore
+from .test_tank_heat_loss_model import _trained
+from .test_water_boost_plan_cache import LATEST_BOOST, _water_heater
+
+START = datetime(2024, 1, 30, 13, 50)
+
+
+class FakeStore:
+    data: dict | None = None
+
+    def __init__(self, hass, version, key):
+        self.delayed = []
+        self.saved = []
+
+    async def async_load(self):
+        return FakeStore.data
+
+    def async_delay_save(self, data_func, delay):
+        self.delayed.append(data_func)
+
+    async def async_save(self, data):
+        self.saved.append(data)
+
+    def flush(self) -> dict:
+        return self.delayed.pop(0)()
+
+
+@pytest.fixture(autouse=True)
+def fake_store(monkeypatch):
+    FakeStore.data = None
+    monkeypatch.setattr(water_heater_store, "Store", FakeStore)
+
+
+def test_state_round_trip():
+    state = WaterHeaterState(
+        latest_boost_call=1706618000.0, boost_active=True, boost_target=50, next_start=START, next_target=47,
+        schedule=[(START, 47), (START + timedelta(hours=10), 53)], trend_samples=[(1706618000.0, 41.5)],
+        heat_loss=_trained().to_dict(),
+    )
+    assert WaterHeaterState.from_dict(state.to_dict()) == state
+
+
+def test_unplanned_start_is_not_stored():
+    assert WaterHeaterState(next_start=datetime.max).to_dict()["next_start"] is None
+
+
+def test_corrupt_values_are_dropped():
+    state = WaterHeaterState.from_dict({"next_start": "not a date", "schedule": [["bad", 47]]})
+    assert state.next_start is None
+    assert state.schedule == []
+
+
+def test_heat_loss_model_round_trip():
+    model = _trained()
+    restored = TankHeatLossModel()
+    restored.load(model.to_dict())
+    assert restored.forecast(45, [1, 6]) == model.forecast(45, [1, 6])
+    restored.add_reading(40, 36000)
+    model.add_reading(40, 36000)
+    assert (restored.a, restored.b) == (model.a, model.b)
+
+
+def test_invalid_heat_loss_is_ignored():
+    model = TankHeatLossModel()
+    model.load({"a": "x"})
+    assert model.samples == 0
+
+
+def test_changes_are_saved_in_batches():
+    store = WaterHeaterStore(None)
+    latest = {"boost": 1.0}
+    for i in range(5):
+        latest["boost"] = float(i)
+        store.schedule_save(lambda: WaterHeaterState(latest_boost_call=latest["boost"]))
+    assert len(store._store.delayed) == 1
+    assert store._store.flush()["latest_boost_call"] == 4
+    store.schedule_save(lambda: WaterHeaterState())
+    assert len(store._store.delayed) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_restores_state_before_planning():
+    next_start = datetime.now() + timedelta(hours=3)
+    FakeStore.data = WaterHeaterState(
+        latest_boost_call=time.time() - 7200, next_start=next_start, next_target=47, schedule=[(next_start, 47)],
+        trend_samples=[(time.time() - 60, 41.0), (time.time() - 7200, 45.0)], heat_loss=_trained().to_dict(),
+    ).to_dict()
+    heater = _water_heater()
+    heater._arm_boost_timer = lambda start: setattr(heater, "armed", start)
+    await heater.async_load_state()
+    assert heater.model.latest_boost_call == pytest.approx(FakeStore.data["latest_boost_call"])
+    assert heater.heat_loss.is_ready
+    assert heater.model.next_water_heater_start == next_start
+    assert heater.boost_schedule == [NextStartExportModel(next_start, 47)]
+    assert heater.armed == next_start
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("started_ago,resumed", [(600, True), (3600, False)])
+async def test_recent_active_boost_is_resumed(started_ago, resumed):
+    FakeStore.data = WaterHeaterState(
+        latest_boost_call=time.time() - started_ago, boost_active=True, boost_target=50
+    ).to_dict()
+    heater = _water_heater()
+    await heater.async_load_state()
+    assert not heater.observer.model.broadcast_queue
+    assert not heater.model.water_boost.value
+    heater.is_initialized = True
+    heater.control_module = True
+    await heater._async_resume_boost()
+    queued = [c.command for c in heater.observer.model.broadcast_queue]
+    assert ("water_boost_start" in queued) is resumed
+    assert bool(heater.model.water_boost.value) is resumed
+    assert heater.model.water_boost.timeout is None
+
+
+@pytest.mark.asyncio
+async def test_boost_is_not_resumed_before_the_control_module_is_ready():
+    FakeStore.data = WaterHeaterState(
+        latest_boost_call=time.time() - 600, boost_active=True, boost_target=50
+    ).to_dict()
+    heater = _water_heater()
+    await heater.async_load_state()
+    heater.is_initialized = True
+    await heater._async_resume_boost()
+    assert "water_boost_start" not in [c.command for c in heater.observer.model.broadcast_queue]
+    heater.control_module = True
+    await heater._async_resume_boost()
+    assert "water_boost_start" in [c.command for c in heater.observer.model.broadcast_queue]
+
+
+@pytest.mark.asyncio
+async def test_boost_can_be_set_again_after_it_was_reset():
+    heater = _water_heater()
+    heater.model.water_boost.timeout = datetime.now() - timedelta(minutes=1)
+    heater.async_update_operation = _noop
+    await heater.async_reset_water_boost()
+    heater.model.water_boost.value = True
+    assert heater.model.water_boost.value
+
+
+@pytest.mark.asyncio
+async def test_shutdown_stores_the_boost_as_aborted():
+    heater = _water_heater()
+    heater.model.latest_boost_call = 0
+    await heater.async_set_toggle_boost_next_start(datetime.now() - timedelta(minutes=1), 50)
+    await heater.async_shutdown()
+    state = heater.store._store.saved[-1]
+    assert not state["boost_active"]
+    assert state["boost_target"] is None
+
+
+async def _noop(*args):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_missing_store_leaves_defaults():
+    heater = _water_heater()
+    await heater.async_load_state()
+    assert heater.model.latest_boost_call == LATEST_BOOST.timestamp()
+    assert heater.boost_schedule == []
+
+
+@pytest.mark.asyncio
+async def test_boost_start_is_saved():
+    heater = _water_heater()
+    heater.model.latest_boost_call = 0
+    await heater.async_set_toggle_boost_next_start(datetime.now() - timedelta(minutes=1), 50)
+    state = heater.store._store.flush()
+    assert state["boost_active"] and state["boost_target"] == 50
+    assert state["latest_boost_call"] > 0
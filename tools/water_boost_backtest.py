@@ -0,0 +1,189 @@
+"""
+Offline backtest of the water boost planner.
+
+Replays consecutive days of spot prices through NextWaterBoost against a simulated tank and reports how many
+boosts were made, what they cost and how cold the water got. The tank temperature and boost history are carried
+from one day into the next. Runs with different configs are independent and run in a process pool.
+
+    days = [prices_day1, prices_day2, ...]
+    result = run_backtest(days, BacktestConfig(target_temp=50))
+    low, high = run_backtests([(days, BacktestConfig(target_temp=45)), (days, BacktestConfig(target_temp=55))])
+
+Run from the repository root; this is an offline tool and not part of the integration.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from math import exp
+
+from custom_components.peaqhvac.service.hvac.water_heater.water_heater_next_start import (MAX_TARGET_TEMP,
+                                                                                          TARGET_TEMP,
+                                                                                          NextStartPostModel,
+                                                                                          NextWaterBoost)
+from custom_components.peaqhvac.service.models.enums.hvac_presets import HvacPresets
+from custom_components.peaqhvac.service.models.slot_resolution import SlotResolution
+
+STEP_MINUTES = 5
+MAX_BOOST_MINUTES = 30
+TOMORROW_PRICES_HOUR = 13
+REPLAN_TEMP_CHANGE = 0.5
+START_DATE = datetime(2024, 1, 1)
+
+
+@dataclass
+class BacktestConfig:
+    target_temp: int = TARGET_TEMP
+    max_target_temp: int = MAX_TARGET_TEMP
+    non_hours: list[int] = field(default_factory=lambda: [11, 12, 16, 17])
+    demand_hours: list[int] = field(default_factory=lambda: [7, 20, 21])
+    min_price: float = 0
+    preset: HvacPresets = HvacPresets.Normal
+    start_temp: float = 45
+    ambient_temp: float = 20
+    heat_loss_per_hour: float = 0.02
+    heating_rate: float = 15
+    boost_power_kw: float = 2.5
+    draws: dict[int, float] = field(default_factory=lambda: {7: 6, 8: 3, 20: 5, 21: 4})
+
+
+@dataclass
+class TankState:
+    """The simulated tank as it is carried from one day into the next."""
+    temp: float
+    latest_boost: datetime
+    boost_started: datetime | None = None
+    boost_target: float = 0
+
+
+@dataclass
+class DayResult:
+    day: int
+    boosts: int = 0
+    cost: float = 0
+    energy_kwh: float = 0
+    min_temp: float = float("inf")
+    end_temp: float = 0
+
+
+@dataclass
+class BacktestResult:
+    days: list[DayResult]
+
+    @property
+    def boosts(self) -> int:
+        return sum(d.boosts for d in self.days)
+
+    @property
+    def cost(self) -> float:
+        return sum(d.cost for d in self.days)
+
+    @property
+    def energy_kwh(self) -> float:
+        return sum(d.energy_kwh for d in self.days)
+
+    @property
+    def min_temp(self) -> float:
+        return min((d.min_temp for d in self.days), default=float("inf"))
+
+    def __str__(self) -> str:
+        return (f"{len(self.days)} days: {self.boosts} boosts, {self.energy_kwh:.1f} kWh, "
+                f"cost {self.cost:.2f}, min temp {self.min_temp:.1f}C")
+
+
+def _cool(temp: float, ambient: float, heat_loss: float, hours: float) -> float:
+    return ambient + (temp - ambient) * exp(-heat_loss * hours)
+
+
+def initial_state(config: BacktestConfig) -> TankState:
+    return TankState(temp=config.start_temp, latest_boost=START_DATE - timedelta(days=1))
+
+
+def simulate_day(
+        day: int,
+        prices: list[float],
+        prices_tomorrow: list[float],
+        config: BacktestConfig,
+        state: TankState | None = None,
+) -> tuple[DayResult, TankState]:
+    """
+    Simulates one day of the tank in STEP_MINUTES steps from the state it had at midnight
+    (the config's start temperature if None) and returns the day's result and the state at the end of the day.
+    """
+    state = state or initial_state(config)
+    result = DayResult(day=day)
+    planner = NextWaterBoost(config.target_temp, config.max_target_temp)
+    resolution = SlotResolution.from_prices(prices)
+    start = START_DATE + timedelta(days=day)
+    step_hours = STEP_MINUTES / 60
+    temp = state.temp
+    latest_boost = state.latest_boost
+    boost_started = state.boost_started
+    boost_target = state.boost_target
+    plan = None
+    planned_slot, planned_temp = -1, temp
+
+    for step in range(24 * 60 // STEP_MINUTES):
+        now = start + timedelta(minutes=STEP_MINUTES * step)
+        slot = resolution.index_of(now)
+        price = prices[slot] if slot < len(prices) else prices[-1]
+
+        if boost_started is not None:
+            temp += config.heating_rate * step_hours
+            result.energy_kwh += config.boost_power_kw * step_hours
+            result.cost += config.boost_power_kw * step_hours * price
+            if temp >= boost_target or now - boost_started >= timedelta(minutes=MAX_BOOST_MINUTES):
+                boost_started = None
+                latest_boost = now
+                plan = None
+        else:
+            if plan is None or slot != planned_slot or abs(temp - planned_temp) >= REPLAN_TEMP_CHANGE:
+                trend = -config.heat_loss_per_hour * (temp - config.ambient_temp) - config.draws.get(now.hour, 0)
+                plan = planner.get_next_start(NextStartPostModel(
+                    prices=prices + (prices_tomorrow if now.hour >= TOMORROW_PRICES_HOUR else []),
+                    demand_hours=config.demand_hours,
+                    non_hours=config.non_hours,
+                    current_temp=round(temp, 1),
+                    temp_trend=trend,
+                    min_price=config.min_price,
+                    hvac_preset=config.preset,
+                    latest_boost=latest_boost,
+                    dt=now,
+                    resolution=resolution,
+                ))
+                planned_slot, planned_temp = slot, temp
+            if plan.target_temp is not None and plan.next_start <= now and plan.target_temp > temp:
+                boost_started, boost_target = now, plan.target_temp
+                result.boosts += 1
+
+        temp = _cool(temp, config.ambient_temp, config.heat_loss_per_hour, step_hours)
+        temp -= config.draws.get(now.hour, 0) * step_hours
+        result.min_temp = min(result.min_temp, temp)
+
+    result.end_temp = temp
+    return result, TankState(temp, latest_boost, boost_started, boost_target)
+
+
+def run_backtest(days: list[list[float]], config: BacktestConfig | None = None) -> BacktestResult:
+    """
+    Replays consecutive days of prices (hourly or quarter-hourly) through the planner, carrying the tank from
+    each day into the next. The next day's prices are visible from 13:00 as in production.
+    """
+    config = config or BacktestConfig()
+    state = initial_state(config)
+    ret = []
+    for idx, prices in enumerate(days):
+        day, state = simulate_day(idx, prices, days[idx + 1] if idx + 1 < len(days) else [], config, state)
+        ret.append(day)
+    return BacktestResult(ret)
+
+
+def _run(args: tuple) -> BacktestResult:
+    return run_backtest(*args)
+
+
+def run_backtests(runs: list[tuple[list[list[float]], BacktestConfig]], workers: int | None = None) -> list[BacktestResult]:
+    """Replays independent runs of (days, config), one run per process. workers=1 runs in this process."""
+    if workers == 1:
+        return [_run(run) for run in runs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_run, runs))